@@ -1,17 +1,42 @@
+import sys
+from startup_profile import StartupProfile
+
+# Created before the other imports so --profile-startup can time them too
+startup_profile = StartupProfile(enabled=__name__ == "__main__" and "--profile-startup" in sys.argv)
+startup_profile.install_import_timer()
+
+import argparse
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
 from tkinter import Toplevel
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import ttkbootstrap as tb
+import perf
 from theme_manager import ThemeManager
 from indicator_card import IndicatorCard
-import indicators
+from log_sink import LEVELS, LogPane, LogSink
+from monitor_tab import LiveMonitorTab
+from perf_panel import PerfPanel
+
+# matplotlib (by far the slowest import), numpy and the modules built on them are imported
+# where they are first used, so the window is on screen before they have loaded
 
 class BacktesterApp(tb.Window):
-    def __init__(self):
+    def __init__(self, profile=None, perf_dump=None):
+        # Phase timings for --profile-startup (a no-op unless enabled)
+        self.profile = profile or StartupProfile()
+        self.profile.mark("module imports")
+
         # Initialize ttkbootstrap Window
         super().__init__(themename="cosmo", title="Backtester")
+        self.profile.mark("create window")
+
+        # Import the chart backend in the background while the rest of the window is built
+        self.fig = self.ax = self.canvas = None
+        self.chart_poll_ms = 20
+        self.chart_import = threading.Thread(target=self.import_chart_backend, name="chart-import", daemon=True)
+        self.chart_import.start()
         
         # Initialize theme manager and load the default (light) theme
         self.theme_manager = ThemeManager()
@@ -26,115 +51,86 @@ class BacktesterApp(tb.Window):
         self.config_expanded_width = 300
         self.config_arrow_button_width = 3
 
+        # Log lines are buffered here and flushed to the Logs section once per frame
+        self.log_max_lines = 10000
+        self.log_sink = LogSink(max_lines=self.log_max_lines)
+
+        # Catalogue of addable indicators, created and indexed the first time it is searched
+        self.indicator_registry = None
+
+        # Computed indicator series, reused across card edits and sessions (created on first use)
+        self.indicator_cache = None
+        self.indicator_results = {}  # card -> {output name: array} on self.candles
+        self.compute_after_id = None  # pending compute_indicators() after a card edit
+        self.indicator_run = 0        # results of older compute passes are ignored
+        self.indicator_shared = {}    # run -> [SharedCandles, pending job count]
+
+        # Backtest worker pool, created on first use
+        self.jobs = None
+        self.job_callbacks = {}
+        self.job_poll_ms = 50
+
+        # Trade ledger of the last backtest, drawn over the price chart, and its Monte Carlo batches
+        self.ledger = None
+        self.ledger_plot = None
+        self.backtest_candles = None
+        self.monte_carlo_run = 0
+        self.monte_carlo_parts = []
+        self.monte_carlo_pending = 0
+
+        # Where to write the perf numbers on close (--perf-dump)
+        self.perf_dump = perf_dump
+
         # Create UI components first
-        self.create_button_styles()  # Define the button styles for hover, pressed, etc.
         self.configure_ui()          # Create the UI components
+        self.profile.mark("build widgets")
         self.apply_theme()           # Apply the theme after creating the UI
+        self.profile.mark("apply theme")
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def create_button_styles(self):
-        """Create custom styles for buttons with hover and active state colors."""
-        style = ttk.Style()
-
-        # Define a custom style for the theme switch button
-        style.configure("Switch.TButton",
-                        background=self.theme['button_bg'],  # Default background
-                        foreground=self.theme['button_fg'],  # Default foreground
-                        relief="flat",
-                        padding=10)
-        # Change the hover color and active color for the Switch button
-        style.map("Switch.TButton",
-                background=[("active", self.theme['button_active_bg']),  # Active color from JSON
-                            ("!disabled", self.theme['button_hover_bg'])],  # Hover color from JSON
-                foreground=[("active", "#ffffff"),  # Foreground when pressed
-                            ("!disabled", "#ffffff")])  # Foreground on hover
-
-        # Define a custom style for the config collapse button
-        style.configure("Collapse.TButton",
-                        background=self.theme['arrow_button_bg'],  # Default background from JSON
-                        foreground=self.theme['arrow_button_fg'],  # Default foreground from JSON
-                        relief="flat",
-                        padding=5)
-        # Change the hover color and active color for the Collapse button
-        style.map("Collapse.TButton",
-                background=[("active", self.theme['collapse_active_bg']),  # Active color from JSON
-                            ("!disabled", self.theme['collapse_hover_bg'])],  # Hover color from JSON
-                foreground=[("active", "#ffffff"),
-                            ("!disabled", "#ffffff")])
+        # Paint the window now; the chart replaces its placeholder once matplotlib has loaded
+        self.update()
+        self.profile.mark("first frame")
+        self.after(self.chart_poll_ms, self.poll_chart_import)
 
     def configure_ui(self):
+        # Backtest and Live Monitoring tabs, above the shared Logs section
+        self.notebook = ttk.Notebook(self)
+        self.notebook.grid(row=0, column=0, sticky="nsew")
+        self.backtest_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.backtest_tab, text="Backtest")
+
         # Create the layout with collapsible config section
         self.create_config_section()
         self.create_chart_section()
+        self.create_monitor_tab()
         self.create_logs_section()
 
         # Set up grid configuration to ensure proper resizing
+        self.backtest_tab.grid_columnconfigure(0, weight=1)
+        self.backtest_tab.grid_columnconfigure(1, weight=0)
+        self.backtest_tab.grid_columnconfigure(2, weight=3)
+        self.backtest_tab.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
-        self.grid_columnconfigure(1, weight=0)
-        self.grid_columnconfigure(2, weight=3)
         self.grid_rowconfigure(0, weight=3)
         self.grid_rowconfigure(1, weight=1)
 
+    @perf.timer("theme.apply")
     def apply_theme(self):
-        """Apply the current theme to the UI elements dynamically."""
-        # Config section
-        self.config_frame.config(bg=self.theme['frame_bg'])
-        self.top_frame.config(bg=self.theme['frame_bg'])
-        self.bottom_frame.config(bg=self.theme['frame_bg'])
-
-        # Logs section
-        self.logs_frame.config(bg=self.theme['frame_bg'])
-        self.log_text.config(bg=self.theme['log_bg'], fg=self.theme['log_fg'])
-
-        # Settings window
-        if hasattr(self, 'settings_window'):
-            self.settings_window.config(bg=self.theme['frame_bg'])
-        
-        # Find Indicator window
-        if hasattr(self, 'indicator_window'):
-            self.indicator_window.config(bg=self.theme['frame_bg'])
-        
-        # Indicator cards in config section
-        for widget in self.bottom_frame.winfo_children():
-            if isinstance(widget, IndicatorCard):
-                widget.config(bg=self.theme['card_bg'])  # Apply card background color
-                widget.indicator_label.config(fg=self.theme['fg_color'])  # Card label text color
-
-                # Set dropdown frame color
-                widget.dropdown_frame.config(bg=self.theme['dropdown_bg'])
-                
-                # Apply colors to entries and buttons inside the card
-                for child in widget.winfo_children():
-                    if isinstance(child, ttk.Entry):
-                        child.config(style="Custom.TEntry")
-                    elif isinstance(child, ttk.Button):
-                        child.config(style="CardButton.TButton")
-
-        # Update styles for ttk widgets
-        style = ttk.Style()
-
-        # Update global label style
-        style.configure("TLabel", foreground=self.theme['fg_color'], background=self.theme['frame_bg'])
-
-        # Update entry style
-        style.configure("Custom.TEntry",
-                        fieldbackground=self.theme['entry_bg'],  # Background for text entries
-                        foreground=self.theme['entry_fg'])  # Foreground (text) color
-
-        # Card buttons (e.g., "+" button and delete "X" button)
-        style.configure("CardButton.TButton",
-                        background=self.theme['button_bg'],
-                        foreground=self.theme['button_fg'])
-
-        # Other button styles (like the switch theme button)
-        self.create_button_styles()  # Reapply button colors dynamically
-        
-        # Reapply button styles explicitly (like Collapse button)
-        self.arrow_button.config(style="Collapse.TButton")
+        """Apply the current theme to the UI elements dynamically.
+
+        Themed widgets use the named ttk styles compiled by ThemeManager, so
+        this costs the same however many cards and rows exist. Only the few
+        classic Tk widgets registered with the theme manager are touched directly.
+        """
+        self.theme_manager.apply()
 
     def create_config_section(self):
         # Create the main config frame
-        self.config_frame = tk.Frame(self, width=self.config_expanded_width, height=400, padx=10, pady=10)
+        self.config_frame = tk.Frame(self.backtest_tab, width=self.config_expanded_width, height=400, padx=10, pady=10)
         self.config_frame.grid(row=0, column=0, sticky="nsew")
+        self.theme_manager.register(self.config_frame, bg='frame_bg')
 
         # Configure grid rows to allocate space for top and bottom sections
         self.config_frame.grid_rowconfigure(0, weight=0)  # Top section (fixed height)
@@ -144,6 +140,7 @@ class BacktesterApp(tb.Window):
         # --- Top Portion ---
         self.top_frame = tk.Frame(self.config_frame, padx=10, pady=5)
         self.top_frame.grid(row=0, column=0, sticky="ew")
+        self.theme_manager.register(self.top_frame, bg='frame_bg')
 
         # Label for "Config Settings" on the left
         self.config_label = ttk.Label(self.top_frame, text="Config Settings", font=("Helvetica", 16, "bold"))
@@ -156,24 +153,42 @@ class BacktesterApp(tb.Window):
         # --- Bottom Portion ---
         self.bottom_frame = tk.Frame(self.config_frame, padx=10, pady=5)
         self.bottom_frame.grid(row=1, column=0, sticky="nsew")
+        self.theme_manager.register(self.bottom_frame, bg='frame_bg')
 
         # --- Collapse Button (Separate from Top/Bottom Portions) ---
-        self.arrow_button = ttk.Button(self, text="◀", style="Collapse.TButton", command=self.toggle_config_section, width=self.config_arrow_button_width)
+        self.arrow_button = ttk.Button(self.backtest_tab, text="◀", style="Collapse.TButton", command=self.toggle_config_section, width=self.config_arrow_button_width)
         self.arrow_button.grid(row=0, column=1, sticky="nsew")
 
     def open_settings_window(self):
         """Open a pop-up window for settings."""
         settings_window = tk.Toplevel(self)
         settings_window.title("Settings")
-        settings_window.geometry("300x200")
+        settings_window.geometry("300x380")
+        self.theme_manager.register(settings_window, bg='frame_bg')
 
         # Add the switch theme button inside the settings window
         switch_button = ttk.Button(settings_window, text="Switch Theme", style="Switch.TButton", command=self.switch_theme)
         switch_button.pack(pady=20)
 
+        # Open a CandleStore directory and chart it
+        store_button = ttk.Button(settings_window, text="Open Candle Store...", command=self.open_candle_store)
+        store_button.pack(pady=10)
+
         # Add the Find Indicator button to open a new window
         find_indicator_button = ttk.Button(settings_window, text="Find Indicator", command=self.open_find_indicator_window)
         find_indicator_button.pack(pady=10)
+
+        # Grid-search the parameters of the current indicator cards
+        sweep_button = ttk.Button(settings_window, text="Parameter Sweep", command=self.open_sweep_window)
+        sweep_button.pack(pady=10)
+
+        # Backtest the current indicator cards on the loaded candles
+        backtest_button = ttk.Button(settings_window, text="Run Backtest", command=self.run_backtest)
+        backtest_button.pack(pady=10)
+
+        # Save the cards for the command-line batch runner (batch_runner.py)
+        save_button = ttk.Button(settings_window, text="Save Strategy", command=self.save_strategy)
+        save_button.pack(pady=10)
     
     def toggle_config_section(self):
         """Toggles the config section between collapsed and expanded."""
@@ -182,44 +197,51 @@ class BacktesterApp(tb.Window):
             self.config_frame.grid_forget()
             self.config_visible = False
             self.arrow_button.config(text="▶")  # Change arrow to point left
-            self.grid_columnconfigure(0, weight=0, minsize=self.config_collapsed_width)
+            self.backtest_tab.grid_columnconfigure(0, weight=0, minsize=self.config_collapsed_width)
         else:
             # Expand the config section
             self.config_frame.grid(row=0, column=0, sticky="nsew")
             self.config_visible = True
             self.arrow_button.config(text="◀")  # Change arrow to point right
-            self.grid_columnconfigure(0, weight=1, minsize=self.config_expanded_width)
+            self.backtest_tab.grid_columnconfigure(0, weight=1, minsize=self.config_expanded_width)
 
     def open_find_indicator_window(self):
         """Open a pop-up window to search and find indicators."""
         indicator_window = tk.Toplevel(self)
         indicator_window.title("Find Indicator")
         indicator_window.geometry("600x700")
+        self.theme_manager.register(indicator_window, bg='frame_bg')
 
         # Search bar
         search_var = tk.StringVar()
         search_entry = ttk.Entry(indicator_window, textvariable=search_var, width=30)
         search_entry.pack(pady=10)
+        search_entry.focus_set()
 
-        # Listbox for indicators
+        # Listbox for indicators, filtered as the user types
         listbox = tk.Listbox(indicator_window, height=10)
-        available_indicators = [func for func in dir(indicators) if callable(getattr(indicators, func)) and not func.startswith("__")]
-        for indicator in available_indicators:
-            listbox.insert(tk.END, indicator)
         listbox.pack(pady=10)
+        matches = []
+
+        def refresh_list(*args):
+            matches[:] = self.registry().search(search_var.get())
+            listbox.delete(0, tk.END)
+            listbox.insert(tk.END, *[self.registry().get(name).label() for name in matches])
+
+        search_var.trace_add("write", refresh_list)
+        refresh_list()
 
         # Bind listbox selection to an event
-        listbox.bind('<<ListboxSelect>>', lambda event: self.select_indicator(event, listbox, indicator_window))
+        listbox.bind('<<ListboxSelect>>', lambda event: self.select_indicator(event, listbox, indicator_window, matches))
 
-    def select_indicator(self, event, listbox, indicator_window):
+    def select_indicator(self, event, listbox, indicator_window, matches):
         """Callback when an indicator is selected from the list."""
         selection = listbox.curselection()
         if selection:
-            selected_indicator = listbox.get(selection[0])
+            selected_indicator = matches[selection[0]]
 
-            # Get the function from indicators.py dynamically
-            indicator_func = getattr(indicators, selected_indicator)
-            ui_setup = indicator_func()  # Call the function to get its UI setup
+            # Get the UI setup from the registry (imports plug-in modules on first use)
+            ui_setup = self.registry().ui_setup(selected_indicator)
 
             # Add the selected indicator card to the main window
             self.add_indicator_card(selected_indicator, ui_setup)
@@ -229,34 +251,327 @@ class BacktesterApp(tb.Window):
 
     def add_indicator_card(self, indicator_name, ui_setup):
         """Add a new indicator card to the bottom frame."""
-        indicator_card = IndicatorCard(self.bottom_frame, indicator_name=indicator_name, ui_setup=ui_setup)
+        indicator_card = IndicatorCard(self.bottom_frame, indicator_name=indicator_name, ui_setup=ui_setup,
+                                       on_change=self.card_changed)
         indicator_card.pack(fill="x", pady=10)
+        self.card_changed(indicator_card)
+
+    def card_changed(self, card):
+        """A card was added, edited or deleted: recompute the indicators once the edit's events settle."""
+        if not card.winfo_exists():
+            self.indicator_results.pop(card, None)
+        if hasattr(self, 'candles') and self.compute_after_id is None:
+            self.compute_after_id = self.after_idle(self.compute_indicators)
+
+    @perf.timer("indicators.compute")
+    def compute_indicators(self):
+        """Compute every indicator card on the loaded candles without blocking the UI.
+
+        Cached series are used straight away; the missing rows of built-in
+        indicators are computed in the worker pool. Plug-in compute functions
+        only exist in this process, so those cards are computed here.
+        """
+        import indicator_engine
+        from backtest_jobs import indicator_job
+        self.compute_after_id = None
+        if not hasattr(self, 'candles'):
+            self.log_message("Load candles before computing indicators", "WARNING")
+            return
+        cache = self.result_cache()
+        self.indicator_run += 1
+        self.indicator_results = {}
+        shared, pending = None, 0
+        for card in self.bottom_frame.winfo_children():
+            if not isinstance(card, IndicatorCard):
+                continue
+            name, rows = card.indicator_name, card.get_values()
+            try:
+                function = indicator_engine.COMPUTE_FUNCTIONS[name]
+                missing = cache.missing_rows(name, self.candles, rows)
+                if missing and function.__module__ == indicator_engine.__name__:
+                    if shared is None:
+                        shared = self.job_scheduler().share(self.candles)
+                    pending += 1
+                    self.run_job(indicator_job, shared, name, [rows[i] for i in missing],
+                                 on_done=lambda result, run=self.indicator_run, card=card, rows=rows, missing=missing:
+                                 self.indicator_done(run, card, rows, missing, result))
+                else:
+                    self.indicator_results[card] = cache.assemble(name, self.candles, rows) or card.compute(self.candles, cache=cache)
+            except KeyError:
+                self.log_message(f"No compute function registered for indicator '{name}'", "WARNING")
+            except ValueError as error:
+                self.log_message(f"{name}: {error}", "ERROR")
+        if pending:
+            self.indicator_shared[self.indicator_run] = [shared, pending]
+        else:
+            self.log_message(cache.stats_message())
+
+    def indicator_done(self, run, card, rows, missing, result):
+        """A worker computed the missing rows of a card: cache them and keep the card's full result."""
+        jobs = self.indicator_shared[run]
+        jobs[1] -= 1
+        if jobs[1] == 0:
+            # The last job of that pass is done with the shared copy of the candles
+            jobs[0].close()
+            del self.indicator_shared[run]
+        if run != self.indicator_run:
+            return  # superseded by a newer pass
+        cache = self.result_cache()
+        # A failed or cancelled job has already been logged and has no result
+        if result is not None:
+            name = card.indicator_name
+            cache.store(name, self.candles, [rows[i] for i in missing], result)
+            if card.winfo_exists():
+                self.indicator_results[card] = cache.assemble(name, self.candles, rows) or cache.compute(name, self.candles, rows)
+        if jobs[1] == 0:
+            self.log_message(cache.stats_message())
+
+    def indicator_cards(self):
+        """Return [(indicator_name, rows)] for every indicator card, the input of backtest_engine."""
+        return [(widget.indicator_name, widget.get_values()) for widget in self.bottom_frame.winfo_children()
+                if isinstance(widget, IndicatorCard)]
+
+    def run_backtest(self):
+        """Backtest the indicator cards on the loaded candles in the worker pool."""
+        from backtest_jobs import backtest_job
+        if not hasattr(self, 'candles'):
+            self.log_message("Load candles before running a backtest", "WARNING")
+            return
+        cards = self.indicator_cards()
+        if not cards:
+            self.log_message("Add an indicator card before running a backtest", "WARNING")
+            return
+        self.backtest_candles = self.candles
+        self.run_job(backtest_job, self.candles, cards, on_done=self.backtest_done)
+
+    def save_strategy(self):
+        """Save the indicator cards and their field values to a strategy file for batch_runner.py."""
+        from tkinter import filedialog
+        from batch_runner import save_strategy
+        path = filedialog.asksaveasfilename(parent=self, title="Save Strategy", defaultextension=".json",
+                                            filetypes=[("Strategy", "*.json")])
+        if path:
+            save_strategy(path, self.indicator_cards())
+            self.log_message(f"Strategy saved to {path}")
+
+    def backtest_done(self, result):
+        if result is None:
+            return
+        from trade_ledger import TradeLedger, periods_per_year
+        self.backtest_result = result
+        self.ledger = TradeLedger.from_backtest(result)
+        metrics = self.ledger.metrics(periods_per_year(self.backtest_candles['time']))
+        self.log_message(f"Backtest: return {metrics['total_return']:.2%}, max drawdown {metrics['max_drawdown']:.2%}, "
+                         f"{metrics['trades']} trades, win rate {metrics['win_rate']:.0%}, "
+                         f"exposure {metrics['exposure']:.0%}, Sharpe {metrics['sharpe']:.2f}, "
+                         f"Sortino {metrics['sortino']:.2f}")
+        self.plot_ledger()
+        self.run_monte_carlo()
+
+    def plot_ledger(self):
+        """Draw the last backtest's equity curve and trade markers over the price chart."""
+        from trade_ledger import LedgerPlot
+        if self.ledger_plot is not None:
+            self.ledger_plot.remove()
+            self.ledger_plot = None
+        # Trade indexes refer to the bars the backtest ran on; a different timeframe would misplace them
+        if self.ledger is None or self.candles is not self.backtest_candles:
+            return
+        self.ledger_plot = LedgerPlot(self.ax, self.candles['time'], self.ledger.trades, self.ledger.equity)
+        with perf.measure("chart.draw"):
+            self.canvas.draw()
+
+    def run_monte_carlo(self, paths=1000):
+        """Bootstrap the last backtest's trade sequence, one batch per job across the worker pool."""
+        from backtest_jobs import bootstrap_job
+        from trade_ledger import bootstrap_batches, trade_growth
+        if self.ledger is None or not len(self.ledger):
+            return
+        self.monte_carlo_run += 1
+        self.monte_carlo_parts = []
+        batches = bootstrap_batches(paths)
+        self.monte_carlo_pending = len(batches)
+        columns = {'growth': trade_growth(self.ledger.trades, self.ledger.initial_cash)}
+        for size, seed in batches:
+            self.run_job(bootstrap_job, columns, size, seed,
+                         on_done=lambda result, run=self.monte_carlo_run: self.monte_carlo_done(run, result))
+
+    def monte_carlo_done(self, run, result):
+        """Collect one Monte Carlo batch; log the percentiles once the last one is in."""
+        import numpy as np
+        from trade_ledger import summarize_bootstrap
+        if run != self.monte_carlo_run:
+            return  # batch of an older backtest
+        if result is not None:
+            self.monte_carlo_parts.append(result)
+        self.monte_carlo_pending -= 1
+        if self.monte_carlo_pending or not self.monte_carlo_parts:
+            return
+        summary = summarize_bootstrap(np.concatenate([finals for finals, _ in self.monte_carlo_parts]),
+                                      np.concatenate([drawdowns for _, drawdowns in self.monte_carlo_parts]))
+        self.log_message(f"Monte Carlo ({summary['paths']:,} paths): return p5 {summary['return_p5']:.2%}, "
+                         f"p50 {summary['return_p50']:.2%}, p95 {summary['return_p95']:.2%}; "
+                         f"max drawdown p50 {summary['drawdown_p50']:.2%}, p5 {summary['drawdown_p5']:.2%}; "
+                         f"chance of loss {summary['loss_probability']:.0%}")
 
     def create_chart_section(self):
-        chart_frame = ttk.Frame(self, width=600, height=400, relief="flat", padding=10)
-        chart_frame.grid(row=0, column=2 if self.config_visible else 1, sticky="nsew")
+        self.chart_frame = ttk.Frame(self.backtest_tab, width=600, height=400, relief="flat", padding=10)
+        self.chart_frame.grid(row=0, column=2 if self.config_visible else 1, sticky="nsew")
+
+        # Timeframe picker; its values are filled in by build_chart (see resampler.TIMEFRAMES)
+        chart_bar = ttk.Frame(self.chart_frame)
+        chart_bar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(chart_bar, text="Timeframe").pack(side=tk.LEFT, padx=(0, 5))
+        self.timeframe_var = tk.StringVar(value="base")
+        self.timeframe_box = ttk.Combobox(chart_bar, textvariable=self.timeframe_var, state="disabled", width=6)
+        self.timeframe_box.pack(side=tk.LEFT)
+        self.timeframe_box.bind("<<ComboboxSelected>>", lambda event: self.set_timeframe(self.timeframe_var.get()))
+
+        # Shown until the matplotlib chart is built (see build_chart)
+        self.chart_placeholder = ttk.Label(self.chart_frame, text="Loading chart...")
+        self.chart_placeholder.pack(side=tk.TOP, expand=1)
+
+    def import_chart_backend(self):
+        """Runs on the chart-import thread: load matplotlib so build_chart only has to create widgets."""
+        start = time.perf_counter()
+        import matplotlib.figure  # noqa: F401
+        import matplotlib.backends.backend_tkagg  # noqa: F401
+        self.profile.record("import chart backend (background thread)", (time.perf_counter() - start) * 1000.0)
+
+    def poll_chart_import(self):
+        """Build the chart once the background import has finished; reschedules itself until then."""
+        if self.chart_import.is_alive():
+            self.after(self.chart_poll_ms, self.poll_chart_import)
+        else:
+            self.build_chart()
+
+    def build_chart(self):
+        """Create the matplotlib chart (only once). Waits for the background import if it is still running."""
+        if self.canvas is not None:
+            return
+        self.chart_import.join()
+        self.profile.mark("event loop until chart backend ready")
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from resampler import TIMEFRAMES
+        self.timeframe_box.config(values=["base", *TIMEFRAMES], state="readonly")
 
         # Create a placeholder matplotlib chart
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.plot([0, 1, 2, 3], [1, 2, 0, 4], color="#ff5722")
-
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.plot([0, 1, 2, 3], [1, 2, 0, 4], color="#ff5722")
+
+        self.chart_placeholder.destroy()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
+        with perf.measure("chart.draw"):
+            self.canvas.draw()
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.profile.mark("build chart")
+        self.profile.print_report()
+
+    def open_candle_store(self):
+        """Ask for a CandleStore directory and load it."""
+        from tkinter import filedialog
+        path = filedialog.askdirectory(parent=self, title="Open Candle Store", mustexist=True)
+        if path:
+            self.load_candles(path)
+
+    def load_candles(self, store_path, start=None, end=None):
+        """Open a CandleStore and plot the close prices for start <= time < end."""
+        from candle_store import CandleStore
+        try:
+            self.candle_store = CandleStore(store_path)
+        except (OSError, ValueError, KeyError) as error:
+            self.log_message(f"Could not open candle store {store_path}: {error}", "ERROR")
+            return
+        self.base_candles = self.candle_store.slice(start, end)
+        self.resampler = None
+        self.set_timeframe(self.timeframe_var.get())
+        self.log_message(f"Loaded {len(self.base_candles['time'])} candles from {store_path}")
+
+    def set_timeframe(self, timeframe):
+        """Chart (and compute indicators on) the loaded candles at `timeframe`: 'base' or a TIMEFRAMES name.
+
+        Higher timeframes come from a Resampler, which aggregates each one once and then keeps it cached.
+        """
+        from chart_lod import LODLine
+        self.timeframe_var.set(timeframe)
+        if not hasattr(self, 'base_candles'):
+            return
+        if timeframe == "base":
+            self.candles = self.base_candles
+        else:
+            if self.resampler is None:
+                from resampler import Resampler
+                self.resampler = Resampler(self.base_candles)
+            self.candles = self.resampler.get(timeframe)
+
+        # Draw through a level-of-detail line so redraws cost O(chart width), not O(bars)
+        self.build_chart()
+        if self.ledger_plot is not None:
+            self.ledger_plot.remove()
+            self.ledger_plot = None
+        if hasattr(self, 'price_line'):
+            self.price_line.remove()
+        self.ax.clear()
+        self.price_line = LODLine(self.ax, self.candles['time'], self.candles['close'], color="#ff5722")
+        with perf.measure("chart.draw"):
+            self.canvas.draw()
+
+        # Indicator series follow the charted candles
+        if any(isinstance(widget, IndicatorCard) for widget in self.bottom_frame.winfo_children()):
+            self.compute_indicators()
+
+    def create_monitor_tab(self):
+        self.monitor_tab = LiveMonitorTab(self.notebook, self)
+        self.notebook.add(self.monitor_tab, text="Live Monitoring")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+    def on_tab_changed(self, event):
+        """Sample threads and processes only while the Live Monitoring tab is visible."""
+        if self.notebook.select() == str(self.monitor_tab):
+            self.monitor_tab.start()
+        else:
+            self.monitor_tab.stop()
 
     def create_logs_section(self):
         # Create a frame for logs with theme-based background
         self.logs_frame = tk.Frame(self, height=200, bg=self.theme['frame_bg'], padx=10, pady=10)
         self.logs_frame.grid(row=1, column=0, columnspan=3, sticky="nsew")
+        self.theme_manager.register(self.logs_frame, bg='frame_bg')
 
-        # Label for logs section
-        logs_label = ttk.Label(self.logs_frame, text="Logs", font=("Helvetica", 16, "bold"))
+        # Label for logs section, with the level filter on the right
+        self.logs_header = tk.Frame(self.logs_frame, bg=self.theme['frame_bg'])
+        self.logs_header.pack(side=tk.TOP, fill=tk.X)
+        self.theme_manager.register(self.logs_header, bg='frame_bg')
+        logs_label = ttk.Label(self.logs_header, text="Logs", font=("Helvetica", 16, "bold"))
         logs_label.pack(side=tk.TOP, pady=10)
+        self.log_level_var = tk.StringVar(value=LEVELS[0])
+        log_level_box = ttk.Combobox(self.logs_header, textvariable=self.log_level_var, values=LEVELS, state="readonly", width=10)
+        log_level_box.place(relx=1.0, rely=0.5, anchor="e", x=-10)
+        log_level_box.bind("<<ComboboxSelected>>", lambda event: self.log_pane.set_min_level(self.log_level_var.get()))
+
+        # Job progress bar and cancel button
+        self.job_bar = tk.Frame(self.logs_frame, bg=self.theme['frame_bg'])
+        self.job_bar.pack(side=tk.TOP, fill=tk.X, padx=10)
+        self.theme_manager.register(self.job_bar, bg='frame_bg')
+        self.job_progress = ttk.Progressbar(self.job_bar, maximum=1.0)
+        self.job_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.job_status = ttk.Label(self.job_bar, text="Idle")
+        self.job_status.pack(side=tk.LEFT, padx=10)
+        ttk.Button(self.job_bar, text="Cancel", command=self.cancel_jobs).pack(side=tk.RIGHT)
+
+        # Collapsible performance panel to the right of the log text
+        self.perf_panel = PerfPanel(self.logs_frame)
+        self.perf_panel.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 10), pady=10)
 
         # Logs text box
         self.log_text = tk.Text(self.logs_frame, height=10, bg=self.theme['log_bg'], fg=self.theme['log_fg'], font=("Courier", 10), state='disabled', padx=10, pady=10, relief="flat", wrap="none")
         self.log_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.theme_manager.register(self.log_text, bg='log_bg', fg='log_fg')
+
+        self.log_pane = LogPane(self.log_text, self.log_sink, max_lines=self.log_max_lines)
+        self.log_pane.start()
 
     def switch_theme(self):
         """Switch between light and dark themes."""
@@ -264,13 +579,107 @@ class BacktesterApp(tb.Window):
         self.theme = self.theme_manager.switch_theme(new_theme)  # Switch and load the new theme
         self.apply_theme()  # Apply the new theme to the UI
 
-    def log_message(self, message):
-        """Logs a message to the Logs section."""
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.config(state='disabled')
+    def registry(self):
+        """Return the indicator registry, creating it on first use."""
+        if self.indicator_registry is None:
+            from indicator_registry import IndicatorRegistry
+            self.indicator_registry = IndicatorRegistry(plugin_dirs=["indicator_plugins"])
+        return self.indicator_registry
+
+    def result_cache(self):
+        """Return the indicator cache, creating it on first use."""
+        if self.indicator_cache is None:
+            from indicator_cache import IndicatorCache
+            self.indicator_cache = IndicatorCache(disk_dir=".indicator_cache")
+        return self.indicator_cache
+
+    def open_sweep_window(self):
+        from sweep_window import SweepWindow
+        return SweepWindow(self)
+
+    def job_scheduler(self):
+        """Return the worker pool, starting it on first use."""
+        if self.jobs is None:
+            from backtest_jobs import BacktestScheduler
+            self.jobs = BacktestScheduler()
+        return self.jobs
+
+    def run_job(self, func, candles, *args, on_done=None, on_partial=None, **kwargs):
+        """Run func(context, candles, *args, **kwargs) in the worker pool without blocking the UI.
+
+        `on_partial(result)` and `on_done(result)` are called on the Tk thread.
+        """
+        job_id = self.job_scheduler().submit(func, candles, *args, **kwargs)
+        self.job_callbacks[job_id] = (on_done, on_partial)
+        if len(self.job_callbacks) == 1:
+            self.after(self.job_poll_ms, self.poll_jobs)
+        return job_id
+
+    def poll_jobs(self):
+        """Drain worker events into the UI; reschedules itself while jobs are running."""
+        for job_id, kind, payload in self.jobs.drain():
+            if kind == 'progress':
+                fraction, message = payload
+                self.job_progress['value'] = fraction
+                self.job_status.config(text=message or f"Job {job_id}: {fraction:.0%}")
+            elif kind == 'log':
+                self.log_message(f"[job {job_id}] {payload}")
+            elif kind == 'partial':
+                on_partial = self.job_callbacks.get(job_id, (None, None))[1]
+                if on_partial is not None:
+                    on_partial(payload)
+            elif kind in ('done', 'error', 'cancelled'):
+                on_done = self.job_callbacks.pop(job_id, (None, None))[0]
+                if kind == 'error':
+                    self.log_message(f"[job {job_id}] failed: {payload!r}", "ERROR")
+                elif kind == 'cancelled':
+                    self.log_message(f"[job {job_id}] cancelled", "WARNING")
+                if on_done is not None:
+                    on_done(payload if kind == 'done' else None)
+        if self.job_callbacks:
+            self.after(self.job_poll_ms, self.poll_jobs)
+        else:
+            self.job_status.config(text="Idle")
+
+    def cancel_jobs(self):
+        """Cancel every running or queued job."""
+        if self.jobs is not None:
+            for job_id in self.jobs.active_jobs():
+                self.jobs.cancel(job_id)
+
+    def on_close(self):
+        """Stop the market feed and the worker pool before closing the window."""
+        self.perf_panel.stop()
+        if self.perf_dump:
+            perf.dump(self.perf_dump)
+        self.monitor_tab.stop()
+        self.monitor_tab.stop_feed()
+        if self.jobs is not None:
+            self.jobs.shutdown()
+        for shared, pending in self.indicator_shared.values():
+            shared.close()
+        self.destroy()
+
+    def log_message(self, message, level="INFO"):
+        """Logs a message to the Logs section. Safe to call from any thread; shown on the next flush."""
+        perf.count("logs.messages")
+        self.log_sink.write(message, level)
 
 # Run the application
 if __name__ == "__main__":
-    app = BacktesterApp()
+    parser = argparse.ArgumentParser(description="Backtester UI")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import-time and phase-time breakdown once the chart is up")
+    parser.add_argument("--perf", action="store_true",
+                        help="collect hot-path timings from startup (also switchable in the Perf panel)")
+    parser.add_argument("--perf-dump", metavar="FILE",
+                        help="write the session's perf numbers to FILE as JSON on close (implies --perf)")
+    parser.add_argument("--store", metavar="PATH", help="open this CandleStore directory on start-up")
+    args = parser.parse_args()
+    if args.perf or args.perf_dump:
+        perf.enable()
+
+    app = BacktesterApp(profile=startup_profile, perf_dump=args.perf_dump)
+    if args.store:
+        app.load_candles(args.store)
     app.mainloop()
@@ -0,0 +1,157 @@
+import numpy as np
+import indicator_engine
+
+# One row per round-trip trade; indexes are bar positions in the candle arrays
+TRADE_DTYPE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('quantity', np.float64),
+    ('fees', np.float64),
+    ('pnl', np.float64),
+    ('return', np.float64),
+])
+
+
+def default_rows(ui_setup):
+    """Row values of a freshly added card: the placeholders of every dropdown row in a ui_setup."""
+    return [[field['type'](field['placeholder']) for field in row['inputfields']] for row in ui_setup['dropdown']]
+
+
+def crossover_signal(rows, outputs, close):
+    """EMAs/SMAs: long while the first line is above the second; with one row, while price is above the line."""
+    lines = next(iter(outputs.values()))
+    fast, slow = (lines[0], lines[1]) if len(lines) > 1 else (close, lines[0])
+    return fast > slow
+
+
+def rsi_signal(rows, outputs, close):
+    """RSI: enter when RSI drops below the lower threshold, exit above the upper one, hold in between."""
+    rsi = outputs['rsi']
+    upper, lower = float(rows[1][0]), float(rows[2][0])
+    events = np.where(rsi < lower, 1.0, np.where(rsi > upper, 0.0, np.nan))
+    # Carry the last event forward (forward fill by index)
+    index = np.where(np.isnan(events), 0, np.arange(len(events)))
+    np.maximum.accumulate(index, out=index)
+    return np.nan_to_num(events[index], nan=0.0) > 0.0
+
+
+# Signal rules keyed like indicator_engine.COMPUTE_FUNCTIONS: rule(rows, outputs, close) -> bool per bar
+SIGNAL_RULES = {
+    'EMAs': crossover_signal,
+    'SMAs': crossover_signal,
+    'RSI': rsi_signal,
+}
+
+
+def card_signals(candles, cards, cache=None):
+    """Long/flat signal per bar, known at the bar's close: long while every card agrees.
+
+    `cards` is [(indicator_name, rows)] with rows as returned by
+    IndicatorCard.get_values(). With an IndicatorCache the indicator
+    series are reused across calls.
+    """
+    close = indicator_engine.get_field(candles, 'close')
+    signal = np.ones(len(close), dtype=bool)
+    for name, rows in cards:
+        if name not in SIGNAL_RULES:
+            raise KeyError(f"No signal rule registered for indicator '{name}'")
+        if cache is not None:
+            outputs = cache.compute(name, candles, rows)
+        else:
+            outputs = indicator_engine.compute_indicator(name, candles, rows)
+        signal &= SIGNAL_RULES[name](rows, outputs, close)
+    return signal
+
+
+def simulate(candles, signal, initial_cash=10_000.0, fraction=1.0, quantity=None, fee_rate=0.0, slippage=0.0):
+    """Fill a long/flat signal and return (trades, equity, position) without a per-bar loop.
+
+    A signal on bar t's close is filled at bar t+1's open, moved against us
+    by `slippage` (a fraction of price). `fee_rate` is charged on the
+    notional of every fill. Each trade buys either `fraction` of the equity
+    at entry (compounding) or, if given, a fixed `quantity` of units. A
+    trade still open after the last bar is settled at the last close.
+    `equity` is marked to market at every close.
+    """
+    opens = indicator_engine.get_field(candles, 'open')
+    close = indicator_engine.get_field(candles, 'close')
+    n = len(close)
+    if n == 0:
+        return np.empty(0, dtype=TRADE_DTYPE), np.empty(0), np.empty(0, dtype=np.int8)
+
+    # position[t]: held during bar t, after its open
+    position = np.zeros(n, dtype=np.int8)
+    position[1:] = signal[:-1]
+    change = np.diff(position, prepend=np.int8(0), append=np.int8(0))
+    entries = np.flatnonzero(change[:-1] > 0)
+    exits = np.flatnonzero(change < 0)  # exit index n means "settled at the last close"
+
+    at_end = exits == n
+    entry_price = opens[entries] * (1.0 + slippage)
+    exit_price = np.where(at_end, close[-1], opens[np.minimum(exits, n - 1)] * (1.0 - slippage))
+    buy_cost = entry_price * (1.0 + fee_rate)
+    sell_value = exit_price * (1.0 - fee_rate)
+
+    # Equity before each trade, and after the last one
+    if quantity is None:
+        growth = 1.0 - fraction + fraction * sell_value / buy_cost
+        before = initial_cash * np.concatenate([[1.0], np.cumprod(growth)])
+        shares = fraction * before[:-1] / buy_cost
+    else:
+        shares = np.full(len(entries), float(quantity))
+        before = initial_cash + np.concatenate([[0.0], np.cumsum(shares * (sell_value - buy_cost))])
+    cash = before[:-1] - shares * buy_cost
+
+    # Flat bars hold the equity after the last finished trade; held bars are cash + shares * close
+    finished = np.searchsorted(exits, np.arange(n), side='right')
+    equity = before[finished]
+    held = position.astype(bool)
+    trade = np.searchsorted(entries, np.arange(n), side='right') - 1
+    equity[held] = cash[trade[held]] + shares[trade[held]] * close[held]
+    if len(exits) and at_end[-1]:
+        equity[-1] = before[-1]
+
+    trades = np.empty(len(entries), dtype=TRADE_DTYPE)
+    trades['entry_index'] = entries
+    trades['exit_index'] = np.minimum(exits, n - 1)
+    trades['entry_price'] = entry_price
+    trades['exit_price'] = exit_price
+    trades['quantity'] = shares
+    trades['fees'] = shares * (entry_price + exit_price) * fee_rate
+    trades['pnl'] = shares * (sell_value - buy_cost)
+    trades['return'] = sell_value / buy_cost - 1.0
+    return trades, equity, position
+
+
+def summarize(trades, equity, position, initial_cash):
+    """Headline numbers of a run (the keys the sweep table shows, plus a few more)."""
+    peak = np.maximum.accumulate(np.concatenate([[initial_cash], equity]))[1:]
+    return {
+        'total_return': float(equity[-1] / initial_cash - 1.0) if len(equity) else 0.0,
+        'max_drawdown': float((equity / peak - 1.0).min()) if len(equity) else 0.0,
+        'trades': int(len(trades)),
+        'win_rate': float(np.mean(trades['pnl'] > 0)) if len(trades) else 0.0,
+        'exposure': float(position.mean()) if len(position) else 0.0,
+        'fees': float(trades['fees'].sum()),
+    }
+
+
+def run_backtest(candles, cards, cache=None, initial_cash=10_000.0, fraction=1.0, quantity=None,
+                 fee_rate=0.0, slippage=0.0):
+    """Backtest indicator cards on OHLCV candles, headless.
+
+    `candles` is anything indexable by field name (CandleSlice, dict of
+    arrays, SharedCandles). Returns {'trades': TRADE_DTYPE array,
+    'equity': float64 per bar, 'position': int8 per bar, 'metrics': dict}.
+    """
+    signal = card_signals(candles, cards, cache=cache)
+    trades, equity, position = simulate(candles, signal, initial_cash=initial_cash, fraction=fraction,
+                                        quantity=quantity, fee_rate=fee_rate, slippage=slippage)
+    return {
+        'trades': trades,
+        'equity': equity,
+        'position': position,
+        'metrics': summarize(trades, equity, position, initial_cash),
+    }
@@ -0,0 +1,301 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import backtest_engine
+import indicator_cache
+import indicator_engine
+import trade_ledger
+
+# Number of cancel flags shared with the workers; job ids wrap around this
+CANCEL_SLOTS = 4096
+
+
+class SharedCandles:
+    """Candle columns copied once into shared memory so pool workers can read them without pickling.
+
+    Pickling a SharedCandles only sends the block names, shapes and dtypes.
+    The process that created it owns the blocks and must call close().
+    """
+
+    def __init__(self, arrays):
+        self.owner = True
+        # Keep the source's cheap fingerprint (CandleSlice) so caches never hash the data
+        self.key = arrays.fingerprint() if hasattr(arrays, 'fingerprint') else None
+        self.blocks = {}
+        self.layout = {}
+        for field, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            block = SharedMemory(create=True, size=max(1, values.nbytes))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+            self.blocks[field] = block
+            self.layout[field] = (block.name, values.shape, values.dtype.str)
+        self.arrays = self._views()
+
+    def _views(self):
+        return {field: np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.blocks[field].buf)
+                for field, (name, shape, dtype) in self.layout.items()}
+
+    def __getstate__(self):
+        return {'layout': self.layout, 'key': self.key}
+
+    def __setstate__(self, state):
+        # Attaching in a worker: map the existing blocks without taking ownership
+        self.owner = False
+        self.layout = state['layout']
+        self.key = state['key']
+        self.blocks = {}
+        for field, (name, shape, dtype) in self.layout.items():
+            self.blocks[field] = SharedMemory(name=name)
+        self.arrays = self._views()
+
+    def __getitem__(self, field):
+        return self.arrays[field]
+
+    def __contains__(self, field):
+        return field in self.arrays
+
+    def __len__(self):
+        return len(next(iter(self.arrays.values()))) if self.arrays else 0
+
+    def fingerprint(self):
+        """Identity of the shared data for IndicatorCache; hashed once if the source had none."""
+        if self.key is None:
+            self.key = indicator_cache.fingerprint(self.arrays)
+        return self.key
+
+    def close(self):
+        """Release the mapping; the owner also frees the shared memory."""
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
+
+
+class JobContext:
+    """Handed to every job function so it can report back to the UI and check for cancellation."""
+
+    def __init__(self, job_id, events, cancel_flags):
+        self.job_id = job_id
+        self.events = events
+        self.cancel_flags = cancel_flags
+
+    def progress(self, fraction, message=""):
+        """Report progress between 0.0 and 1.0."""
+        _heartbeat()
+        self.events.put((self.job_id, 'progress', (float(fraction), message)))
+
+    def log(self, message):
+        """Send a line to the Logs section."""
+        _heartbeat()
+        self.events.put((self.job_id, 'log', message))
+
+    def partial(self, result):
+        """Send an intermediate result (keep it small, it is pickled)."""
+        _heartbeat()
+        self.events.put((self.job_id, 'partial', result))
+
+    def cancelled(self):
+        """Return True once the job has been cancelled; long jobs should poll this and return early."""
+        _heartbeat()
+        return bool(self.cancel_flags[self.job_id % CANCEL_SLOTS])
+
+
+# Set in every worker process by _init_worker
+_worker_events = None
+_worker_cancel_flags = None
+_worker_heartbeats = None
+_worker_slot = None
+
+
+def _init_worker(events, cancel_flags, heartbeats, next_slot):
+    global _worker_events, _worker_cancel_flags, _worker_heartbeats, _worker_slot
+    _worker_events = events
+    _worker_cancel_flags = cancel_flags
+    _worker_heartbeats = heartbeats
+    with next_slot.get_lock():
+        _worker_slot = next_slot.value % (len(heartbeats) // 2)
+        next_slot.value += 1
+    heartbeats[2 * _worker_slot] = os.getpid()
+    _heartbeat()
+
+
+def _heartbeat():
+    """Record that this worker is alive and making progress (read by BacktestScheduler.heartbeats())."""
+    if _worker_heartbeats is not None:
+        _worker_heartbeats[2 * _worker_slot + 1] = time.time()
+
+
+def _run_job(job_id, func, candles, args, kwargs):
+    """Worker-side wrapper: build the context and run the job."""
+    context = JobContext(job_id, _worker_events, _worker_cancel_flags)
+    _heartbeat()
+    if context.cancelled():
+        return None
+    try:
+        result = func(context, candles, *args, **kwargs)
+        # Marks the end of this job's event stream; see BacktestScheduler.drain()
+        context.events.put((job_id, 'end', None))
+        _heartbeat()
+        return result
+    finally:
+        if isinstance(candles, SharedCandles):
+            candles.close()
+
+
+def indicator_job(context, candles, indicator_name, rows, field="close"):
+    """Job that computes one indicator card in a worker (see indicator_engine)."""
+    context.log(f"Computing {indicator_name} over {len(candles)} bars")
+    result = indicator_engine.compute_indicator(indicator_name, candles, rows, field=field)
+    context.progress(1.0, f"{indicator_name} done")
+    return result
+
+
+def backtest_job(context, candles, cards, **settings):
+    """Job that backtests indicator cards in a worker (see backtest_engine.run_backtest)."""
+    context.log(f"Backtesting {', '.join(name for name, rows in cards)} over {len(candles)} bars")
+    result = backtest_engine.run_backtest(candles, cards, **settings)
+    context.progress(1.0, "Backtest done")
+    return result
+
+
+def bootstrap_job(context, columns, paths, seed):
+    """Job that runs one Monte Carlo batch of a trade ledger in a worker (see trade_ledger.bootstrap)."""
+    if context.cancelled():
+        return None
+    return trade_ledger.bootstrap(columns['growth'], paths, seed)
+
+
+class BacktestScheduler:
+    """Runs backtest and indicator jobs in a process pool, off the Tk main thread.
+
+    Workers stream progress, log lines and partial results through a
+    multiprocessing queue. The UI calls drain() from an after() poll and gets
+    every pending event as (job_id, kind, payload) where kind is one of
+    'progress', 'log', 'partial', 'done', 'error' or 'cancelled'.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        context = multiprocessing.get_context()
+        self.events = context.Queue()
+        self.cancel_flags = context.Array('b', CANCEL_SLOTS, lock=False)
+        # (pid, time of last heartbeat) per worker, for the Live Monitoring tab
+        self.heartbeat_slots = context.Array('d', 2 * self.max_workers, lock=False)
+        next_slot = context.Value('i', 0)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(self.events, self.cancel_flags, self.heartbeat_slots, next_slot))
+        # Completion events come from the executor's thread, so they get their own queue
+        self.finished = queue.Queue()
+        self.futures = {}
+        self.owned_candles = {}
+        # Results come back on a different pipe than the events, so a 'done' is
+        # held until the job's 'end' marker shows all its events were delivered
+        self.ended = set()
+        self.held_done = {}
+        self.job_ids = itertools.count(1)
+
+    def share(self, arrays):
+        """Copy candle arrays into shared memory once, for reuse across many jobs."""
+        return SharedCandles(arrays)
+
+    def submit(self, func, candles, *args, **kwargs):
+        """Run func(context, candles, *args, **kwargs) in the pool and return its job id.
+
+        `func` must be a module-level function. `candles` can be a SharedCandles
+        (caller keeps ownership) or a dict of arrays, which is shared for the
+        lifetime of this job only.
+        """
+        job_id = next(self.job_ids)
+        self.cancel_flags[job_id % CANCEL_SLOTS] = 0
+        if not isinstance(candles, SharedCandles):
+            candles = SharedCandles(candles)
+            self.owned_candles[job_id] = candles
+
+        future = self.executor.submit(_run_job, job_id, func, candles, args, kwargs)
+        self.futures[job_id] = future
+        future.add_done_callback(lambda done, job_id=job_id: self._on_done(job_id, done))
+        return job_id
+
+    def _on_done(self, job_id, future):
+        if future.cancelled() or self.cancel_flags[job_id % CANCEL_SLOTS]:
+            self.finished.put((job_id, 'cancelled', None))
+        elif future.exception() is not None:
+            self.finished.put((job_id, 'error', future.exception()))
+        else:
+            self.finished.put((job_id, 'done', future.result()))
+
+    def cancel(self, job_id):
+        """Cancel a job: queued jobs never start, running jobs see context.cancelled()."""
+        if job_id in self.futures:
+            self.cancel_flags[job_id % CANCEL_SLOTS] = 1
+            self.futures[job_id].cancel()
+
+    def heartbeats(self):
+        """Return {worker pid: (jobs in flight, time.time() of its last heartbeat)}.
+
+        Jobs in flight is pool-wide; the executor does not say which worker runs which job.
+        """
+        in_flight = len(self.active_jobs())
+        beats = self.heartbeat_slots[:]
+        return {int(beats[i]): (in_flight, beats[i + 1]) for i in range(0, len(beats), 2) if beats[i]}
+
+    def active_jobs(self):
+        """Return the ids of jobs that have not finished yet."""
+        return [job_id for job_id, future in self.futures.items() if not future.done()]
+
+    def drain(self, limit=1000):
+        """Return up to `limit` pending events without blocking.
+
+        Every event a job sent is returned before that job's 'done'.
+        """
+        events = []
+        while len(events) < limit:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[1] == 'end':
+                job_id = event[0]
+                if job_id in self.held_done:
+                    events.append(self.held_done.pop(job_id))
+                    self._release(job_id)
+                elif job_id in self.futures:
+                    self.ended.add(job_id)
+            else:
+                events.append(event)
+
+        while len(events) < limit:
+            try:
+                event = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            job_id = event[0]
+            if event[1] == 'done' and job_id not in self.ended:
+                self.held_done[job_id] = event
+                continue
+            self.ended.discard(job_id)
+            events.append(event)
+            self._release(job_id)
+        return events
+
+    def _release(self, job_id):
+        self.futures.pop(job_id, None)
+        candles = self.owned_candles.pop(job_id, None)
+        if candles is not None:
+            candles.close()
+
+    def shutdown(self, cancel_running=True):
+        """Stop the pool and free any shared memory this scheduler created."""
+        if cancel_running:
+            for job_id in list(self.futures):
+                self.cancel(job_id)
+        self.executor.shutdown(wait=True, cancel_futures=cancel_running)
+        for job_id in list(self.owned_candles):
+            self._release(job_id)
@@ -0,0 +1,215 @@
+"""Backtest one saved strategy over a universe of symbols, across every core.
+
+    python batch_runner.py strategy.json data/ -o results.npz
+
+`data/` holds one CandleStore directory per symbol (the directory name is
+the symbol). Symbols are processed in chunks by a process pool; each
+finished chunk is written to `<output>.parts/` so an interrupted run picks
+up where it stopped when started again with the same strategy, data and
+symbols (the worker count may differ). The output is a columnar .npz with
+one array per metric (see result_dtype).
+"""
+import os
+
+# One BLAS/OpenMP thread per worker: the pool already keeps every core busy
+for _variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_variable, "1")
+
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import backtest_engine
+from candle_store import META_FILE, CandleStore
+from param_sweep import default_chunk_size, split_chunks
+
+MANIFEST_FILE = "manifest.json"
+
+RESULT_DTYPE = np.dtype([
+    ('symbol', 'U1'),  # widened to the longest symbol of a run by result_dtype()
+    ('bars', np.int64),
+    ('total_return', np.float64),
+    ('max_drawdown', np.float64),
+    ('trades', np.int64),
+    ('win_rate', np.float64),
+    ('exposure', np.float64),
+    ('fees', np.float64),
+    ('seconds', np.float64),
+    ('error', 'U200'),
+])
+
+
+def save_strategy(path, cards, settings=None):
+    """Write indicator cards ([(indicator_name, rows)]) and engine settings to a JSON strategy file."""
+    strategy = {
+        'cards': [{'indicator': name, 'rows': rows} for name, rows in cards],
+        'settings': dict(settings or {}),
+    }
+    with open(path + ".tmp", 'w') as file:
+        json.dump(strategy, file, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def load_strategy(path):
+    """Read a strategy file back as (cards, settings)."""
+    with open(path, 'r') as file:
+        strategy = json.load(file)
+    cards = [(card['indicator'], card['rows']) for card in strategy['cards']]
+    for name, rows in cards:
+        if name not in backtest_engine.SIGNAL_RULES:
+            raise ValueError(f"Strategy uses '{name}', which has no signal rule in backtest_engine")
+    return cards, strategy.get('settings', {})
+
+
+def result_dtype(symbols):
+    """RESULT_DTYPE with a 'symbol' column wide enough for every symbol, so none is truncated."""
+    width = max([len(symbol) for symbol in symbols] + [1])
+    return np.dtype([('symbol', f'U{width}')] + [(name, RESULT_DTYPE[name]) for name in RESULT_DTYPE.names[1:]])
+
+
+def find_symbols(data_dir):
+    """Every sub-directory of `data_dir` that is a CandleStore, sorted by name."""
+    return sorted(name for name in os.listdir(data_dir)
+                  if os.path.isfile(os.path.join(data_dir, name, META_FILE)))
+
+
+def run_chunk(data_dir, symbols, cards, settings, start=None, end=None):
+    """Worker: backtest each symbol of a chunk. A failing symbol is recorded, not raised."""
+    rows = np.zeros(len(symbols), dtype=result_dtype(symbols))
+    for i, symbol in enumerate(symbols):
+        began = time.perf_counter()
+        rows[i]['symbol'] = symbol
+        try:
+            candles = CandleStore(os.path.join(data_dir, symbol)).slice(start, end)
+            rows[i]['bars'] = len(candles['time'])
+            if len(candles['time']):
+                metrics = backtest_engine.run_backtest(candles, cards, **settings)['metrics']
+                for field, value in metrics.items():
+                    rows[i][field] = value
+        except Exception as error:
+            rows[i]['error'] = f"{type(error).__name__}: {error}"[:200]
+        rows[i]['seconds'] = time.perf_counter() - began
+    return rows
+
+
+def _manifest(strategy_path, data_dir, symbols, start, end):
+    """What identifies a run: resuming is only allowed when all of it matches."""
+    with open(strategy_path, 'rb') as file:
+        strategy_hash = hashlib.sha1(file.read()).hexdigest()
+    symbols_hash = hashlib.sha1("\n".join(symbols).encode("utf-8")).hexdigest()
+    return {'strategy': strategy_hash, 'data_dir': os.path.realpath(data_dir),
+            'start': start, 'end': end, 'symbols': symbols_hash}
+
+
+def _part_file(parts_dir, index):
+    return os.path.join(parts_dir, f"chunk_{index:06d}.npy")
+
+
+def _save_part(parts_dir, index, rows):
+    part_file = _part_file(parts_dir, index)
+    with open(part_file + ".tmp", 'wb') as file:
+        np.save(file, rows)
+    os.replace(part_file + ".tmp", part_file)
+
+
+def _prepare_parts(parts_dir, manifest, chunk_size, default_size, restart):
+    """Create or reuse the parts directory. Returns the chunk size of the run.
+
+    A fresh run uses `chunk_size`, or `default_size` if none was asked for.
+    A resumed run keeps the chunk size it was started with, so part files
+    stay valid whatever the worker count is now; asking for a different
+    chunk size explicitly is a different run. A parts directory without a
+    manifest (interrupted before it was written) is started afresh.
+    """
+    manifest_file = os.path.join(parts_dir, MANIFEST_FILE)
+    if os.path.isfile(manifest_file) and not restart:
+        with open(manifest_file, 'r') as file:
+            saved = json.load(file)
+        saved_size = saved.pop('chunk_size', None)
+        if saved != manifest or (chunk_size is not None and chunk_size != saved_size):
+            raise SystemExit(f"{parts_dir} belongs to a different run; pass --restart to discard it")
+        return saved_size
+
+    chunk_size = chunk_size or default_size
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    os.makedirs(parts_dir)
+    with open(manifest_file + ".tmp", 'w') as file:
+        json.dump(dict(manifest, chunk_size=chunk_size), file)
+    os.replace(manifest_file + ".tmp", manifest_file)
+    return chunk_size
+
+
+def write_results(output, rows):
+    """Write one array per column to a .npz (load with np.load(output))."""
+    with open(output + ".tmp", 'wb') as file:
+        np.savez(file, **{field: rows[field] for field in RESULT_DTYPE.names})
+    os.replace(output + ".tmp", output)
+
+
+def run_batch(strategy_path, data_dir, output, symbols=None, workers=None, chunk_size=None,
+              start=None, end=None, restart=False):
+    """Backtest a strategy over many symbols and write the metrics to `output`. Returns the result rows."""
+    cards, settings = load_strategy(strategy_path)
+    symbols = list(symbols) if symbols else find_symbols(data_dir)
+    workers = workers or os.cpu_count() or 1
+
+    parts_dir = output + ".parts"
+    chunk_size = _prepare_parts(parts_dir, _manifest(strategy_path, data_dir, symbols, start, end), chunk_size,
+                                default_chunk_size(len(symbols), workers), restart)
+    chunks = [chunk for first, chunk in split_chunks(symbols, chunk_size)]
+    done = {index for index in range(len(chunks)) if os.path.exists(_part_file(parts_dir, index))}
+    todo = [index for index in range(len(chunks)) if index not in done]
+    if done:
+        print(f"Resuming: {len(done)} of {len(chunks)} chunks already done")
+
+    began = time.perf_counter()
+    finished_symbols = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_chunk, data_dir, chunks[index], cards, settings, start, end): index
+                   for index in todo}
+        for count, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            _save_part(parts_dir, index, future.result())
+            finished_symbols += len(chunks[index])
+            rate = finished_symbols / max(time.perf_counter() - began, 1e-9)
+            print(f"chunk {count}/{len(todo)}  {finished_symbols} symbols  {rate:.1f} symbols/s", flush=True)
+
+    # Parts are as wide as their own longest symbol; widen them all to the run's
+    dtype = result_dtype(symbols)
+    rows = np.concatenate([np.load(_part_file(parts_dir, index)).astype(dtype) for index in range(len(chunks))]) \
+        if chunks else np.zeros(0, dtype=dtype)
+    write_results(output, rows)
+    shutil.rmtree(parts_dir)
+    failed = np.count_nonzero(rows['error'] != "")
+    print(f"Wrote {len(rows)} symbols to {output}" + (f" ({failed} failed, see the 'error' column)" if failed else ""))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest a saved strategy over a universe of symbols.")
+    parser.add_argument("strategy", help="strategy JSON file (Settings > Save Strategy in the app)")
+    parser.add_argument("data_dir", help="directory with one CandleStore per symbol")
+    parser.add_argument("-o", "--output", default="results.npz", help="columnar output file (.npz)")
+    parser.add_argument("--symbols", help="file with one symbol per line (default: every store in data_dir)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, help="symbols per job (default: a few chunks per worker)")
+    parser.add_argument("--start", type=int, help="first bar time, epoch seconds")
+    parser.add_argument("--end", type=int, help="stop before this bar time, epoch seconds")
+    parser.add_argument("--restart", action="store_true", help="discard the parts of an interrupted run")
+    args = parser.parse_args(argv)
+
+    symbols = None
+    if args.symbols:
+        with open(args.symbols, 'r') as file:
+            symbols = [line.strip() for line in file if line.strip()]
+    run_batch(args.strategy, args.data_dir, args.output, symbols=symbols, workers=args.workers,
+              chunk_size=args.chunk_size, start=args.start, end=args.end, restart=args.restart)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""Performance benchmarks. Run `python benchmarks.py` for all of them or name one, e.g. `python benchmarks.py lod`."""
+import sys
+import time
+import numpy as np
+
+
+def _timed(func, repeat=5):
+    """Return the median wall time of `func()` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(times))
+
+
+def bench_lod():
+    """Redraw latency of the level-of-detail line at 10k, 1M and 10M bars."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from chart_lod import LODLine
+
+    rng = np.random.default_rng(0)
+    print("bars        build ms   full view ms   zoomed ms   naive full ms")
+    for n in (10_000, 1_000_000, 10_000_000):
+        y = 100.0 + np.cumsum(rng.normal(size=n))
+        x = np.arange(n)
+
+        fig = Figure(figsize=(12, 4), dpi=100)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+
+        start = time.perf_counter()
+        line = LODLine(ax, x, y)
+        fig.canvas.draw()
+        build = (time.perf_counter() - start) * 1000.0
+
+        full = _timed(fig.canvas.draw)
+
+        def zoom():
+            left = rng.integers(0, n // 2)
+            ax.set_xlim(left, left + n // 10)
+            fig.canvas.draw()
+        zoomed = _timed(zoom)
+
+        # Drawing every point only stays affordable on the smaller sizes
+        naive = "-"
+        if n <= 1_000_000:
+            line.remove()
+            ax.plot(x, y)
+            ax.set_xlim(0, n)
+            naive = f"{_timed(fig.canvas.draw, repeat=3):.1f}"
+        print(f"{n:<11,} {build:>8.1f}   {full:>12.1f}   {zoomed:>9.1f}   {naive:>13}")
+
+
+def bench_candles():
+    """Live-tick cost of the candlestick layer (blitted), a full canvas.draw(), and a new bar with the last 200 in view."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from candlestick_chart import CandlestickChart
+
+    rng = np.random.default_rng(0)
+    print("candles     full draw ms   tick ms   ticks/s   new bar ms")
+    for n in (1_000, 10_000, 50_000):
+        closes = 100.0 + np.cumsum(rng.normal(size=n))
+        opens = np.concatenate([[closes[0]], closes[:-1]])
+        highs = np.maximum(opens, closes) + 0.5
+        lows = np.minimum(opens, closes) - 0.5
+
+        fig = Figure(figsize=(12, 4), dpi=100)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        chart = CandlestickChart(ax)
+        chart.set_candles(np.arange(n), opens, highs, lows, closes)
+
+        full = _timed(fig.canvas.draw, repeat=3)
+        tick = _timed(lambda: chart.update_last(opens[-1], highs[-1], lows[-1], closes[-1] + rng.normal(scale=0.1)), repeat=50)
+
+        ax.set_xlim(n - 200, n + 2)
+
+        def new_bar():
+            x = chart.live[0] + 1
+            chart.append(x, closes[-1], highs[-1], lows[-1], closes[-1])
+            fig.canvas.draw()
+        bar = _timed(new_bar, repeat=10)
+        print(f"{n:<11,} {full:>12.1f}   {tick:>7.2f}   {1000.0 / tick:>7.0f}   {bar:>10.1f}")
+
+
+def bench_logs(rate=100_000, seconds=2.0, producers=4):
+    """Sustained log throughput: producer threads at `rate` lines/s, UI flushing every 50 ms."""
+    import threading
+    import tkinter as tk
+    from log_sink import LogSink, LogPane
+
+    sink = LogSink(max_lines=10000)
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        text = tk.Text(root, state='disabled')
+        pane = LogPane(text, sink, max_lines=10000)
+        flush = pane.flush
+        label = "tk.Text"
+    except tk.TclError:
+        # No display: measure the sink alone, draining like the UI would
+        root = None
+        flush = lambda: len(sink.drain())
+        label = "headless drain"
+
+    stop_at = time.perf_counter() + seconds
+    per_thread = rate / producers
+
+    def produce(thread_index):
+        sent = 0
+        start = time.perf_counter()
+        while time.perf_counter() < stop_at:
+            due = int((time.perf_counter() - start) * per_thread)
+            while sent < due:
+                sink.write(f"thread {thread_index} fill #{sent} price=101.25 qty=100", "INFO")
+                sent += 1
+            time.sleep(0.001)
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+    for thread in threads:
+        thread.start()
+
+    flushed = 0
+    flush_ms = []
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        flushed += flush()
+        if root is not None:
+            root.update()
+        flush_ms.append((time.perf_counter() - start) * 1000.0)
+        time.sleep(max(0.0, 0.05 - flush_ms[-1] / 1000.0))
+    for thread in threads:
+        thread.join()
+    flushed += flush()
+
+    print(f"mode: {label}")
+    print(f"written {sink.written / seconds:,.0f} lines/s, flushed {flushed / seconds:,.0f} lines/s, "
+          f"dropped by the ring buffer {sink.dropped:,}")
+    print(f"flush ms  p50 {np.percentile(flush_ms, 50):.2f}  p99 {np.percentile(flush_ms, 99):.2f}  max {max(flush_ms):.2f}")
+    if root is not None:
+        root.destroy()
+
+
+def bench_themes():
+    """Theme switch time with 1, 100 and 1000 indicator cards on screen."""
+    import tkinter as tk
+    from tkinter import ttk
+    import indicators
+    from indicator_card import IndicatorCard
+    from theme_manager import ThemeManager
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("skipped: no display")
+        return
+    root.withdraw()
+    style = ttk.Style(root)
+    manager = ThemeManager()
+    frame = tk.Frame(root)
+    frame.pack()
+    manager.register(frame, bg='frame_bg')
+    names = list(manager.themes)
+
+    print("cards    switch ms")
+    cards = []
+    for count in (1, 100, 1000):
+        while len(cards) < count:
+            card = IndicatorCard(frame, indicator_name="EMAs", ui_setup=indicators.EMAs())
+            card.pack()
+            cards.append(card)
+        root.update()
+
+        def switch():
+            manager.switch_theme(names[(names.index(manager.current_theme) + 1) % len(names)])
+            manager.apply(style)
+            root.update_idletasks()
+        print(f"{count:<8,} {_timed(switch):>9.2f}")
+    root.destroy()
+
+
+def bench_feed(rate=50_000, seconds=5.0, symbols=200):
+    """Replay ticks over local TCP at `rate` ticks/s into MarketFeed; the UI side snapshots every 16 ms."""
+    import asyncio
+    import os
+    import resource
+    import tempfile
+    import threading
+    from market_feed import MarketFeed, TCPSource, serve_replay
+
+    rng = np.random.default_rng(0)
+    count = int(rate * seconds)
+    names = np.array([f"SYM{i:04d}" for i in range(symbols)])[rng.integers(0, symbols, count)]
+    prices = 100.0 + np.cumsum(rng.normal(scale=0.01, size=count))
+    with tempfile.NamedTemporaryFile('w', suffix=".ticks", delete=False) as file:
+        path = file.name
+        file.writelines(f"{name},{1.7e9 + i * 1e-3:.3f},{price:.4f},100\n" for i, (name, price) in enumerate(zip(names, prices)))
+
+    for policy in ('latest', 'drop_oldest', 'block'):
+        ports = []
+        listening = threading.Event()
+        server = threading.Thread(target=lambda: asyncio.run(serve_replay(
+            path, rate=rate, ready=lambda port: (ports.append(port), listening.set()))), daemon=True)
+        server.start()
+        listening.wait()
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        feed = MarketFeed(TCPSource("127.0.0.1", ports[0]), policy=policy, max_queue=1000)
+        feed.start()
+        start = time.perf_counter()
+        frame_ms, backlog, per_frame = [], [], []
+        while feed.running() and time.perf_counter() - start < seconds * 2:
+            frame_start = time.perf_counter()
+            symbols_seen, stats = feed.snapshot()
+            frame_ms.append((time.perf_counter() - frame_start) * 1000.0)
+            per_frame.append(len(symbols_seen))
+            backlog.append(min(count, (frame_start - start) * rate) - stats['received'])
+            time.sleep(max(0.0, 0.016 - (time.perf_counter() - frame_start)))
+        elapsed = time.perf_counter() - start
+        feed.stop()
+        rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024.0
+
+        print(f"policy {policy}: {feed.received / elapsed:,.0f} ticks/s ({feed.received:,} of {count:,}), "
+              f"dropped {feed.dropped:,}")
+        print(f"  snapshot ms p50 {np.percentile(frame_ms, 50):.2f}  p99 {np.percentile(frame_ms, 99):.2f}  "
+              f"symbols/frame {np.mean(per_frame):.0f}  backlog p99 {np.percentile(backlog, 99):,.0f} ticks  "
+              f"max RSS growth {rss_growth:.1f} MB")
+    os.unlink(path)
+
+
+def bench_monitor(children=300, interval_ms=1000):
+    """Cost of one Live Monitoring sample (read from /proc) with `children` child processes running."""
+    import subprocess
+    from process_monitor import ProcessSampler
+
+    if not ProcessSampler.available():
+        print("skipped: no /proc")
+        return
+    processes = [subprocess.Popen(["sleep", "60"]) for _ in range(children)]
+    try:
+        sampler = ProcessSampler()
+        sampler.sample()
+        threads, found = sampler.sample()
+        sample_ms = _timed(sampler.sample, repeat=20)
+        print(f"{len(threads)} threads, {len(found)} processes: sample {sample_ms:.2f} ms, "
+              f"{sample_ms / interval_ms:.2%} of one core at one sample per {interval_ms} ms")
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+
+
+def bench_perf(calls=1_000_000):
+    """Per-call overhead of the perf hooks, disabled and enabled, against a bare call."""
+    import perf
+
+    def work():
+        pass
+    timed = perf.timer("bench.timer")(work)
+
+    def measured():
+        with perf.measure("bench.measure"):
+            pass
+
+    def per_call(func):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        return (time.perf_counter() - start) * 1e9 / calls
+
+    bare = per_call(work)
+    print(f"bare call {bare:.0f} ns")
+    for enabled in (False, True):
+        perf.enable() if enabled else perf.disable()
+        print(f"{'enabled ' if enabled else 'disabled'}  timer +{per_call(timed) - bare:.0f} ns   "
+              f"measure +{per_call(measured) - bare:.0f} ns   count +{per_call(lambda: perf.count('bench.count')) - bare:.0f} ns")
+    perf.disable()
+    perf.reset()
+
+
+def bench_ledger(trades=1_000_000, paths=1000):
+    """Ledger memory and metric time for `trades` fills, and Monte Carlo time serial against parallel."""
+    import trade_ledger
+
+    rng = np.random.default_rng(0)
+    ledger = trade_ledger.TradeLedger()
+    rows = np.zeros(trades, dtype=trade_ledger.TRADE_DTYPE)
+    rows['entry_index'] = np.arange(trades) * 2
+    rows['exit_index'] = rows['entry_index'] + 1
+    rows['quantity'] = 1.0
+    rows['pnl'] = rng.normal(0.05, 1.0, trades)
+    start = time.perf_counter()
+    ledger.extend(rows)
+    extend_ms = (time.perf_counter() - start) * 1000.0
+    metrics_ms = _timed(ledger.metrics, repeat=3)
+    print(f"{trades:,} trades: {ledger.nbytes / 1e6:.0f} MB, extend {extend_ms:.0f} ms, metrics {metrics_ms:.0f} ms")
+
+    sample = ledger.trades[:10_000]
+    for workers in (1, None):
+        start = time.perf_counter()
+        trade_ledger.monte_carlo(sample, initial_cash=1e6, paths=paths, seed=0, workers=workers)
+        print(f"monte carlo {paths:,} paths x {len(sample):,} trades, workers={workers or 'all'}: "
+              f"{time.perf_counter() - start:.2f} s")
+
+
+BENCHMARKS = {
+    'lod': bench_lod,
+    'candles': bench_candles,
+    'logs': bench_logs,
+    'themes': bench_themes,
+    'feed': bench_feed,
+    'monitor': bench_monitor,
+    'perf': bench_perf,
+    'ledger': bench_ledger,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
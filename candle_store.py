@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import uuid
+import numpy as np
+
+# Column name -> dtype. Each column lives in its own contiguous file.
+FIELDS = {
+    'time': np.int64,      # bar open time, epoch seconds, strictly increasing
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+
+META_FILE = "meta.json"
+# Bars sampled per fingerprint to catch a store rewritten in place
+FINGERPRINT_SAMPLES = 16
+
+
+class CandleSlice(dict):
+    """{field: memmap view} for a time range of a CandleStore.
+
+    Stores are append-only, so the store's id, the bar range and a few
+    sampled bars identify the content without hashing all of it.
+    """
+
+    def __init__(self, columns, key):
+        super().__init__(columns)
+        self.key = key
+
+    def fingerprint(self):
+        return self.key
+
+
+class CandleStore:
+    """On-disk columnar OHLCV store opened with numpy.memmap.
+
+    A store is a directory holding one raw binary file per field plus a small
+    meta.json with the bar count. Columns are mapped read-only, so opening a
+    store is zero-copy and slicing a time range only touches the pages it needs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = {}
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Candle store '{path}' does not exist")
+        self.open()
+
+    @classmethod
+    def create(cls, path, arrays=None):
+        """Create an empty store at `path` (optionally filled with `arrays`) and open it."""
+        os.makedirs(path, exist_ok=True)
+        for field in FIELDS:
+            open(cls._column_file(path, field), 'wb').close()
+        # A new id on every create, so caches never confuse a re-imported store with the old one
+        cls._write_meta(path, 0, uuid.uuid4().hex)
+        store = cls(path)
+        if arrays is not None:
+            store.append(arrays)
+        return store
+
+    @classmethod
+    def import_csv(cls, csv_file, path, delimiter=","):
+        """One-off conversion of a CSV with a header row naming the FIELDS columns."""
+        table = np.genfromtxt(csv_file, delimiter=delimiter, names=True, dtype=None, encoding="utf-8")
+        arrays = {field: table[field] for field in FIELDS}
+        return cls.create(path, arrays)
+
+    @staticmethod
+    def _column_file(path, field):
+        return os.path.join(path, f"{field}.bin")
+
+    @staticmethod
+    def _write_meta(path, count, store_id):
+        meta_file = os.path.join(path, META_FILE)
+        with open(meta_file + ".tmp", 'w') as file:
+            json.dump({'count': count, 'id': store_id,
+                       'fields': {name: np.dtype(dt).str for name, dt in FIELDS.items()}}, file)
+        os.replace(meta_file + ".tmp", meta_file)
+
+    def open(self):
+        """(Re)map every column file."""
+        with open(os.path.join(self.path, META_FILE), 'r') as file:
+            meta = json.load(file)
+        self.count = meta['count']
+        self.store_id = meta.get('id', "")  # stores created before ids existed have none
+        self.columns = {}
+        for field, dtype in FIELDS.items():
+            if self.count == 0:
+                # mmap cannot map an empty file
+                self.columns[field] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[field] = np.memmap(self._column_file(self.path, field), dtype=dtype, mode='r', shape=(self.count,))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def __contains__(self, field):
+        return field in self.columns
+
+    def time_index(self, start=None, end=None):
+        """Return the (first, stop) bar indexes covering start <= time < end via binary search."""
+        times = self.columns['time']
+        first = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        stop = self.count if end is None else int(np.searchsorted(times, end, side='left'))
+        return first, max(first, stop)
+
+    def slice(self, start=None, end=None):
+        """Return {field: memmap view} for bars with start <= time < end. No data is copied."""
+        first, stop = self.time_index(start, end)
+        return CandleSlice({field: column[first:stop] for field, column in self.columns.items()},
+                           self.fingerprint(first, stop))
+
+    def fingerprint(self, first=0, stop=None):
+        """Return a cheap identity string for bars [first, stop).
+
+        Besides the path, id and range it hashes FINGERPRINT_SAMPLES evenly
+        spaced bars of every column, so a store rewritten in place by other
+        means is still told apart.
+        """
+        stop = self.count if stop is None else stop
+        digest = hashlib.blake2b(digest_size=8)
+        if stop > first:
+            sampled = np.unique(np.linspace(first, stop - 1, FINGERPRINT_SAMPLES).astype(np.int64))
+            for field in FIELDS:
+                digest.update(np.ascontiguousarray(self.columns[field][sampled]).tobytes())
+        return f"{os.path.realpath(self.path)}:{self.store_id}:{first}:{stop}:{digest.hexdigest()}"
+
+    def append(self, arrays):
+        """Append bars given as {field: array}; times must continue after the last stored bar."""
+        lengths = {len(arrays[field]) for field in FIELDS}
+        if len(lengths) != 1:
+            raise ValueError("All candle fields must have the same length")
+        new_count = lengths.pop()
+        if new_count == 0:
+            return
+
+        times = np.asarray(arrays['time'], dtype=np.int64)
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("Candle times must be strictly increasing")
+        if self.count and times[0] <= self.columns['time'][-1]:
+            raise ValueError("Appended candles must start after the last stored candle")
+
+        # Drop our maps before growing the files underneath them
+        self.columns = {}
+        for field, dtype in FIELDS.items():
+            with open(self._column_file(self.path, field), 'r+b') as file:
+                # Cut off bytes left behind by an interrupted append
+                file.truncate(self.count * np.dtype(dtype).itemsize)
+                file.seek(0, os.SEEK_END)
+                np.ascontiguousarray(arrays[field], dtype=dtype).tofile(file)
+        # The meta file is written last so a crash mid-append leaves the old count valid
+        self._write_meta(self.path, self.count + new_count, self.store_id)
+        self.open()
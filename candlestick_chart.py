@@ -0,0 +1,255 @@
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+
+# Fraction of the bar spacing covered by a candle body
+BODY_WIDTH = 0.6
+# Closed candles are grouped into collections of this many; a new bar only rebuilds the newest group
+CHUNK_CANDLES = 256
+
+
+def _body_verts(x, opens, closes, half_width):
+    """Return (n, 4, 2) rectangle corners for candle bodies."""
+    x = np.asarray(x, dtype=np.float64)
+    low = np.minimum(opens, closes)
+    high = np.maximum(opens, closes)
+    verts = np.empty((len(x), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = x - half_width
+    verts[:, 2, 0] = verts[:, 3, 0] = x + half_width
+    verts[:, 0, 1] = verts[:, 3, 1] = low
+    verts[:, 1, 1] = verts[:, 2, 1] = high
+    return verts
+
+
+def _wick_segments(x, highs, lows):
+    """Return (n, 2, 2) high-low segments for candle wicks."""
+    x = np.asarray(x, dtype=np.float64)
+    segments = np.empty((len(x), 2, 2))
+    segments[:, 0, 0] = segments[:, 1, 0] = x
+    segments[:, 0, 1] = lows
+    segments[:, 1, 1] = highs
+    return segments
+
+
+class _CandleChunk:
+    """Up to CHUNK_CANDLES closed candles: one PolyCollection (bodies) and one LineCollection (wicks)."""
+
+    def __init__(self, ax, verts, segments, colors):
+        self.wicks = LineCollection([], linewidths=1)
+        self.bodies = PolyCollection([], linewidths=0.5)
+        ax.add_collection(self.wicks, autolim=False)
+        ax.add_collection(self.bodies, autolim=False)
+        self.verts, self.segments, self.colors = verts, segments, colors
+        self._set_artists()
+
+    def __len__(self):
+        return len(self.verts)
+
+    def extend(self, verts, segments, colors):
+        self.verts = np.concatenate([self.verts, verts])
+        self.segments = np.concatenate([self.segments, segments])
+        self.colors = np.concatenate([self.colors, colors])
+        self._set_artists()
+
+    def _set_artists(self):
+        self.bodies.set_verts(self.verts)
+        self.bodies.set_facecolor(self.colors)
+        self.bodies.set_edgecolor(self.colors)
+        self.wicks.set_segments(self.segments)
+        self.wicks.set_color(self.colors)
+        # Body x-extent, for skipping chunks outside the view
+        self.left = self.verts[0, 0, 0]
+        self.right = self.verts[-1, 2, 0]
+
+    def show_if_within(self, left, right):
+        visible = bool(self.right >= left and self.left <= right)
+        self.wicks.set_visible(visible)
+        self.bodies.set_visible(visible)
+
+    def remove(self):
+        self.wicks.remove()
+        self.bodies.remove()
+
+
+class CandlestickChart:
+    """Candlestick layer drawn with a PolyCollection (bodies) and a LineCollection (wicks) per chunk of candles.
+
+    Closed candles are grouped into chunks of CHUNK_CANDLES, so a new bar
+    only rebuilds the newest chunk, and chunks outside the x-range are not
+    drawn. With `max_candles`, the oldest chunks are dropped once more than
+    that many candles are closed, which bounds memory and redraw cost of a
+    chart that runs forever. The newest candle, the last-price line and the
+    crosshair are animated artists that are blitted over a cached
+    background, so a live tick never triggers a full canvas.draw(). A full
+    redraw only happens when a new bar opens or the price leaves the y-range.
+    """
+
+    def __init__(self, ax, up_color="#26a69a", down_color="#ef5350", crosshair_color="#888888", max_candles=None):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.up_color = to_rgba(up_color)
+        self.down_color = to_rgba(down_color)
+        self.half_width = BODY_WIDTH / 2
+        self.background = None
+        self.max_candles = max_candles
+
+        # Closed candles, oldest chunk first
+        self.chunks = []
+        self.closed_count = 0
+
+        # Newest (still forming) candle and overlays, drawn by blitting only
+        self.live_body = PolyCollection([], linewidths=0.5, animated=True)
+        self.live_wick = LineCollection([], linewidths=1, animated=True)
+        ax.add_collection(self.live_wick)
+        ax.add_collection(self.live_body)
+        self.price_line = ax.axhline(np.nan, linestyle="--", linewidth=0.8, animated=True)
+        self.cross_h = ax.axhline(np.nan, color=crosshair_color, linewidth=0.6, animated=True)
+        self.cross_v = ax.axvline(np.nan, color=crosshair_color, linewidth=0.6, animated=True)
+        self.animated = [self.live_wick, self.live_body, self.price_line, self.cross_h, self.cross_v]
+
+        self.live = None  # (x, open, high, low, close) of the newest candle
+
+        self.callback_ids = [
+            self.canvas.mpl_connect('draw_event', self.on_draw),
+            self.canvas.mpl_connect('motion_notify_event', self.on_mouse_move),
+        ]
+        self.xlim_callback_id = ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def colors(self, opens, closes):
+        """Return an (n, 4) RGBA array: up color where close >= open, down color otherwise."""
+        up = (np.asarray(closes) >= np.asarray(opens))[:, None]
+        return np.where(up, self.up_color, self.down_color)
+
+    def set_candles(self, x, opens, highs, lows, closes):
+        """Replace all candles. The last one becomes the live candle."""
+        x = np.asarray(x, dtype=np.float64)
+        opens, highs, lows, closes = (np.asarray(a, dtype=np.float64) for a in (opens, highs, lows, closes))
+        if len(x) > 1:
+            self.half_width = BODY_WIDTH * float(np.median(np.diff(x))) / 2
+
+        for chunk in self.chunks:
+            chunk.remove()
+        self.chunks = []
+        self.closed_count = 0
+        closed = max(0, len(x) - 1)
+        first = 0 if self.max_candles is None else max(0, closed - self.max_candles)
+        self._add_closed(_body_verts(x[first:closed], opens[first:closed], closes[first:closed], self.half_width),
+                         _wick_segments(x[first:closed], highs[first:closed], lows[first:closed]),
+                         self.colors(opens[first:closed], closes[first:closed]))
+
+        self.live = None
+        if not len(x):
+            self._clear_live_artists()
+        else:
+            self.live = (x[-1], opens[-1], highs[-1], lows[-1], closes[-1])
+            self._set_live_artists()
+            pad = (np.nanmax(highs) - np.nanmin(lows)) * 0.05 or 1.0
+            self.ax.set_xlim(x[0] - 2 * self.half_width, x[-1] + 2 * self.half_width)
+            self.ax.set_ylim(np.nanmin(lows) - pad, np.nanmax(highs) + pad)
+        self.canvas.draw_idle()
+
+    def _add_closed(self, verts, segments, colors):
+        """Append closed candles: top up the newest chunk, then start new ones; trim to max_candles."""
+        added = 0
+        if self.chunks and len(self.chunks[-1]) < CHUNK_CANDLES:
+            added = min(len(verts), CHUNK_CANDLES - len(self.chunks[-1]))
+            if added:
+                self.chunks[-1].extend(verts[:added], segments[:added], colors[:added])
+        for first in range(added, len(verts), CHUNK_CANDLES):
+            stop = first + CHUNK_CANDLES
+            self.chunks.append(_CandleChunk(self.ax, verts[first:stop], segments[first:stop], colors[first:stop]))
+        self.closed_count += len(verts)
+        if self.max_candles is not None:
+            while self.chunks and self.closed_count - len(self.chunks[0]) >= self.max_candles:
+                self.closed_count -= len(self.chunks[0])
+                self.chunks.pop(0).remove()
+        self.on_xlim_changed(self.ax)
+
+    def on_xlim_changed(self, ax):
+        """Only chunks overlapping the view are drawn."""
+        left, right = self.ax.get_xlim()
+        for chunk in self.chunks:
+            chunk.show_if_within(left, right)
+
+    def _set_live_artists(self):
+        x, open_, high, low, close = self.live
+        color = self.up_color if close >= open_ else self.down_color
+        self.live_body.set_verts(_body_verts([x], [open_], [close], self.half_width))
+        self.live_body.set_facecolor([color])
+        self.live_body.set_edgecolor([color])
+        self.live_wick.set_segments(_wick_segments([x], [high], [low]))
+        self.live_wick.set_color([color])
+        self.price_line.set_ydata([close, close])
+        self.price_line.set_color(color)
+
+    def _clear_live_artists(self):
+        """Hide the live candle and the last-price line (no candles, e.g. a symbol switch)."""
+        self.live_body.set_verts([])
+        self.live_wick.set_segments([])
+        self.price_line.set_ydata([np.nan, np.nan])
+
+    def update_last(self, open_, high, low, close):
+        """Revise the newest candle in place and blit it."""
+        if self.live is None:
+            return
+        self.live = (self.live[0], open_, high, low, close)
+        self._set_live_artists()
+        bottom, top = self.ax.get_ylim()
+        if high > top or low < bottom:
+            # The cached background has the old y-range, so redraw everything once
+            pad = (top - bottom) * 0.05
+            self.ax.set_ylim(min(bottom, low - pad), max(top, high + pad))
+            self.canvas.draw_idle()
+        else:
+            self.blit()
+
+    def append(self, x, open_, high, low, close):
+        """Close the live candle into the collections and start a new one."""
+        previous = self.live
+        if previous is not None:
+            lx, lo, lh, ll, lc = previous
+            self._add_closed(_body_verts([lx], [lo], [lc], self.half_width), _wick_segments([lx], [lh], [ll]),
+                             self.colors([lo], [lc]))
+        self.live = (float(x), open_, high, low, close)
+        self._set_live_artists()
+
+        # Scroll the view along if it was following the newest candle
+        left, right = self.ax.get_xlim()
+        if previous is not None and previous[0] <= right < x + self.half_width:
+            shift = x + 2 * self.half_width - right
+            self.ax.set_xlim(left + shift, right + shift)
+        self.canvas.draw_idle()
+
+    def on_draw(self, event):
+        """Cache the freshly drawn background, then paint the animated artists on top."""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self.animated:
+            self.ax.draw_artist(artist)
+
+    def blit(self):
+        """Redraw only the animated artists over the cached background."""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.animated:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def on_mouse_move(self, event):
+        """Move the crosshair with the mouse."""
+        if event.inaxes is not self.ax:
+            if np.isfinite(self.cross_v.get_xdata()[0]):
+                self.cross_h.set_ydata([np.nan, np.nan])
+                self.cross_v.set_xdata([np.nan, np.nan])
+                self.blit()
+            return
+        self.cross_h.set_ydata([event.ydata, event.ydata])
+        self.cross_v.set_xdata([event.xdata, event.xdata])
+        self.blit()
+
+    def disconnect(self):
+        """Stop listening to canvas events."""
+        for callback_id in self.callback_ids:
+            self.canvas.mpl_disconnect(callback_id)
+        self.ax.callbacks.disconnect(self.xlim_callback_id)
@@ -0,0 +1,217 @@
+import numpy as np
+
+# Bucket size of the finest cached level. Ranges smaller than this many
+# buckets are decimated straight from the raw data instead.
+PYRAMID_BASE = 16
+# Each cached level merges this many buckets of the level below
+PYRAMID_FACTOR = 2
+# Aim for this many output buckets per horizontal pixel (each bucket gives a min and a max point)
+BUCKETS_PER_PIXEL = 1
+
+
+def _reduce(mins, min_idx, maxs, max_idx, size):
+    """Merge every `size` consecutive buckets into one, keeping the min/max values and where they occur."""
+    n = len(mins)
+    pad = -n % size
+    if pad:
+        mins = np.concatenate([mins, np.repeat(mins[-1:], pad)])
+        maxs = np.concatenate([maxs, np.repeat(maxs[-1:], pad)])
+        min_idx = np.concatenate([min_idx, np.repeat(min_idx[-1:], pad)])
+        max_idx = np.concatenate([max_idx, np.repeat(max_idx[-1:], pad)])
+
+    # NaN gaps (e.g. indicator warm-up) must never win the min/max
+    low = np.where(np.isnan(mins), np.inf, mins).reshape(-1, size)
+    high = np.where(np.isnan(maxs), -np.inf, maxs).reshape(-1, size)
+    rows = np.arange(low.shape[0])
+    low_at = low.argmin(axis=1)
+    high_at = high.argmax(axis=1)
+
+    new_mins = low[rows, low_at]
+    new_maxs = high[rows, high_at]
+    new_mins[np.isinf(new_mins)] = np.nan
+    new_maxs[np.isinf(new_maxs)] = np.nan
+    return (new_mins, min_idx.reshape(-1, size)[rows, low_at],
+            new_maxs, max_idx.reshape(-1, size)[rows, high_at])
+
+
+def _interleave(mins, min_idx, maxs, max_idx):
+    """Turn per-bucket min/max pairs into one index-ordered point list."""
+    first_is_min = min_idx <= max_idx
+    idx = np.empty(2 * len(mins), dtype=np.int64)
+    values = np.empty(2 * len(mins))
+    idx[0::2] = np.where(first_is_min, min_idx, max_idx)
+    idx[1::2] = np.where(first_is_min, max_idx, min_idx)
+    values[0::2] = np.where(first_is_min, mins, maxs)
+    values[1::2] = np.where(first_is_min, maxs, mins)
+    return idx, values
+
+
+def minmax_decimate(values, buckets, offset=0):
+    """Reduce `values` to at most 2 * `buckets` points keeping each bucket's min and max.
+
+    Returns (indices, values); indices are positions in the original series plus `offset`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(offset, offset + n), values.copy()
+    size = -(-n // buckets)
+    idx = np.arange(offset, offset + n)
+    return _interleave(*_reduce(values, idx, values, idx, size))
+
+
+class MinMaxPyramid:
+    """Cached min/max levels of one series for width-bound range queries.
+
+    Level k holds one (min, max) pair per PYRAMID_BASE * PYRAMID_FACTOR**k raw
+    points. Levels are built on first use; the first one costs O(n), every
+    later query costs O(screen width).
+    """
+
+    def __init__(self, values, base=PYRAMID_BASE, factor=PYRAMID_FACTOR):
+        self.values = values
+        self.base = base
+        self.factor = factor
+        self.levels = []  # (bucket_size, mins, min_idx, maxs, max_idx)
+
+    def __len__(self):
+        return len(self.values)
+
+    def level(self, k):
+        """Return level `k`, building it (and the levels below it) if needed."""
+        while len(self.levels) <= k:
+            if not self.levels:
+                raw = np.asarray(self.values, dtype=np.float64)
+                idx = np.arange(len(raw))
+                reduced = _reduce(raw, idx, raw, idx, self.base)
+                self.levels.append((self.base,) + reduced)
+            else:
+                size, *below = self.levels[-1]
+                if len(below[0]) <= 1:
+                    break
+                self.levels.append((size * self.factor,) + _reduce(*below, self.factor))
+        return self.levels[min(k, len(self.levels) - 1)]
+
+    def query(self, first, stop, width):
+        """Return (indices, values) of about 2 * width points covering raw points [first, stop)."""
+        first = max(0, int(first))
+        stop = min(len(self.values), int(stop))
+        if stop <= first:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        count = stop - first
+        buckets = max(1, int(width * BUCKETS_PER_PIXEL))
+
+        # Few enough points to decimate straight from the raw data
+        if count // self.base < buckets:
+            return minmax_decimate(self.values[first:stop], buckets, offset=first)
+
+        # Coarsest cached level that still gives at least one bucket per pixel
+        k = 0
+        size = self.base
+        while count // (size * self.factor) >= buckets:
+            size *= self.factor
+            k += 1
+        size, mins, min_idx, maxs, max_idx = self.level(k)
+        lo = first // size
+        hi = -(-stop // size)
+        return _interleave(mins[lo:hi], min_idx[lo:hi], maxs[lo:hi], max_idx[lo:hi])
+
+
+class LODLine:
+    """A matplotlib line that only ever draws about two points per pixel of its axes.
+
+    The visible x-range is re-decimated whenever the axes limits change (pan,
+    zoom, resize), so redraw cost follows screen width instead of data size.
+    `x` must be increasing (bar times or indexes).
+    """
+
+    def __init__(self, ax, x, y, **line_kwargs):
+        self.ax = ax
+        self.line, = ax.plot([], [], **line_kwargs)
+        self.callback_id = ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        """Replace the series and reset the view to cover all of it."""
+        self.x = np.asarray(x)
+        self.pyramid = MinMaxPyramid(y)
+        if len(self.x):
+            _, values = self.pyramid.query(0, len(self.x), self.pixel_width())
+            self.ax.set_xlim(self.x[0], self.x[-1])
+            if np.isfinite(values).any():
+                self.ax.set_ylim(np.nanmin(values), np.nanmax(values))
+        self.refresh()
+
+    def pixel_width(self):
+        """Width of the axes in display pixels."""
+        return max(1, int(self.ax.bbox.width))
+
+    def refresh(self):
+        """Re-decimate the visible range into the line."""
+        if not len(self.x):
+            self.line.set_data([], [])
+            return
+        left, right = self.ax.get_xlim()
+        if np.issubdtype(self.x.dtype, np.integer):
+            # A float key would make searchsorted convert the whole x array
+            left, right = np.floor(left), np.ceil(right)
+            left, right = np.array([left, right]).clip(-2**62, 2**62).astype(self.x.dtype)
+        # One extra point on each side keeps the line running off the edges
+        first = max(0, int(np.searchsorted(self.x, left, side='left')) - 1)
+        stop = min(len(self.x), int(np.searchsorted(self.x, right, side='right')) + 1)
+        idx, values = self.pyramid.query(first, stop, self.pixel_width())
+        self.line.set_data(self.x[idx], values)
+
+    def on_xlim_changed(self, ax):
+        self.refresh()
+
+    def remove(self):
+        """Detach from the axes."""
+        self.ax.callbacks.disconnect(self.callback_id)
+        self.line.remove()
+
+
+class LODMarkers:
+    """Point markers (e.g. trade entries) thinned to at most one per pixel column of the visible range.
+
+    Like LODLine, the visible range is re-thinned whenever the x-limits
+    change, so millions of markers cost O(screen width) per redraw.
+    `x` must be increasing.
+    """
+
+    def __init__(self, ax, x, y, **marker_kwargs):
+        self.ax = ax
+        marker_kwargs.setdefault('linestyle', 'none')
+        self.line, = ax.plot([], [], **marker_kwargs)
+        self.callback_id = ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.refresh()
+
+    def refresh(self):
+        """Keep the first marker of every pixel column in view."""
+        if not len(self.x):
+            self.line.set_data([], [])
+            return
+        left, right = self.ax.get_xlim()
+        low, high = left, right
+        if np.issubdtype(self.x.dtype, np.integer):
+            # A float key would make searchsorted convert the whole x array (as in LODLine.refresh)
+            low, high = np.array([np.ceil(left), np.floor(right)]).clip(-2**62, 2**62).astype(self.x.dtype)
+        first = int(np.searchsorted(self.x, low, side='left'))
+        stop = int(np.searchsorted(self.x, high, side='right'))
+        x, y = self.x[first:stop], self.y[first:stop]
+        width = max(1, int(self.ax.bbox.width))
+        if len(x) > width and right > left:
+            column = ((x - left) * (width / (right - left))).astype(np.int64)
+            keep = np.flatnonzero(np.diff(column, prepend=-1))
+            x, y = x[keep], y[keep]
+        self.line.set_data(x, y)
+
+    def on_xlim_changed(self, ax):
+        self.refresh()
+
+    def remove(self):
+        """Detach from the axes."""
+        self.ax.callbacks.disconnect(self.callback_id)
+        self.line.remove()
@@ -0,0 +1,203 @@
+import hashlib
+import os
+from collections import OrderedDict
+import numpy as np
+import indicator_engine
+
+# Indicators whose rows are independent series (one output row per card row)
+ROW_WISE = {'EMAs', 'SMAs'}
+
+
+def fingerprint(ohlcv, field="close"):
+    """Return a string identifying the data (and range) an indicator is computed on.
+
+    Objects with their own fingerprint() (CandleStore slices) are asked
+    directly; anything else is hashed from the field's bytes.
+    """
+    if hasattr(ohlcv, 'fingerprint'):
+        return ohlcv.fingerprint()
+    values = np.ascontiguousarray(indicator_engine.get_field(ohlcv, field))
+    digest = hashlib.blake2b(values.view(np.uint8), digest_size=16).hexdigest()
+    return f"{len(values)}:{digest}"
+
+
+def normalize_params(indicator_name, rows):
+    """Return one params tuple per cached series; only fields that change the numbers are kept.
+
+    Colors and RSI thresholds are display settings, so editing them never
+    invalidates the cache. Other (plug-in) indicators are keyed on every
+    field of every row, since it is unknown which of them matter.
+    """
+    if indicator_name in ROW_WISE:
+        return [(int(row[0]),) for row in rows]
+    if indicator_name == 'RSI':
+        return [(int(rows[0][0]),)]
+    return [tuple(tuple(row) for row in rows)]
+
+
+class IndicatorCache:
+    """Content-addressed cache of computed indicator series.
+
+    Keys combine the dataset fingerprint, the indicator name, the price field
+    and the normalized parameters of one series, so editing one EMA row only
+    recomputes that row. An entry is the {output name: array} dict of that
+    series, so the cache does not need to know an indicator's output names.
+    The in-memory tier is an LRU bounded by bytes; the optional disk tier
+    keeps .npz files between sessions.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data_fingerprint, indicator_name, field, params):
+        text = repr((data_fingerprint, indicator_name, field, params))
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _disk_file(self, key):
+        return os.path.join(self.disk_dir, f"{key}.npz")
+
+    def get(self, key):
+        """Return the cached {output name: array} for `key` or None."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.disk_dir and os.path.exists(self._disk_file(key)):
+            with np.load(self._disk_file(key)) as file:
+                value = {name: file[name] for name in file.files}
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Store {output name: array} in memory (and on disk if a disk tier is configured)."""
+        value = {name: np.asarray(array) for name, array in value.items()}
+        if self.disk_dir:
+            # Written under a temporary name so a crash never leaves a truncated entry behind
+            temporary = self._disk_file(key) + ".tmp.npz"
+            np.savez(temporary, **value)
+            os.replace(temporary, self._disk_file(key))
+        self._remember(key, value)
+
+    @staticmethod
+    def _nbytes(value):
+        return sum(array.nbytes for array in value.values())
+
+    def _remember(self, key, value):
+        if key in self.entries:
+            self.bytes -= self._nbytes(self.entries.pop(key))
+        size = self._nbytes(value)
+        if size > self.max_bytes:
+            return
+        # Cached series are shared between callers, so nobody may modify them in place
+        for array in value.values():
+            array.flags.writeable = False
+        self.entries[key] = value
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self._nbytes(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left alone)."""
+        self.entries.clear()
+        self.bytes = 0
+
+    def _keys(self, indicator_name, ohlcv, rows, field):
+        data_fingerprint = fingerprint(ohlcv, field)
+        return [self.make_key(data_fingerprint, indicator_name, field, params)
+                for params in normalize_params(indicator_name, rows)]
+
+    @staticmethod
+    def _join(indicator_name, series):
+        if indicator_name not in ROW_WISE:
+            return dict(series[0])
+        return {name: np.vstack([entry[name] for entry in series]) for name in series[0]}
+
+    def compute(self, indicator_name, ohlcv, rows, field="close"):
+        """Same result as indicator_engine.compute_indicator, computing only the uncached series."""
+        keys = self._keys(indicator_name, ohlcv, rows, field)
+        cached = [self.get(key) for key in keys]
+        missing = [i for i, value in enumerate(cached) if value is None]
+
+        if indicator_name not in ROW_WISE:
+            if cached[0] is None:
+                cached[0] = indicator_engine.compute_indicator(indicator_name, ohlcv, rows, field=field)
+                self.put(keys[0], cached[0])
+            return self._join(indicator_name, cached)
+
+        if missing:
+            # Compute every missing row in one batched call
+            result = indicator_engine.compute_indicator(indicator_name, ohlcv, [rows[i] for i in missing], field=field)
+            for position, i in enumerate(missing):
+                cached[i] = {name: values[position] for name, values in result.items()}
+                self.put(keys[i], cached[i])
+        if not cached:
+            return indicator_engine.compute_indicator(indicator_name, ohlcv, rows, field=field)
+        return self._join(indicator_name, cached)
+
+    def missing_rows(self, indicator_name, ohlcv, rows, field="close"):
+        """Return the indexes of the rows that have to be computed elsewhere (e.g. in a worker).
+
+        Each series is looked up once, counted in the stats and loaded from
+        disk if needed. Indicators that are not row-wise are one series, so
+        either none or all of their rows are missing.
+        """
+        cached = [self.get(key) for key in self._keys(indicator_name, ohlcv, rows, field)]
+        if indicator_name not in ROW_WISE:
+            return [] if cached[0] is not None else list(range(len(rows)))
+        return [i for i, value in enumerate(cached) if value is None]
+
+    def store(self, indicator_name, ohlcv, rows, result, field="close"):
+        """Cache the result of compute_indicator(indicator_name, ohlcv, rows) computed elsewhere."""
+        keys = self._keys(indicator_name, ohlcv, rows, field)
+        if indicator_name not in ROW_WISE:
+            self.put(keys[0], result)
+            return
+        for position, key in enumerate(keys):
+            self.put(key, {name: values[position] for name, values in result.items()})
+
+    def assemble(self, indicator_name, ohlcv, rows, field="close"):
+        """Return a card's result from the memory tier alone, or None if a series is not there.
+
+        Not counted in the stats: use it after missing_rows() and store().
+        """
+        series = [self.entries.get(key) for key in self._keys(indicator_name, ohlcv, rows, field)]
+        if not series or any(entry is None for entry in series):
+            return None
+        return self._join(indicator_name, series)
+
+    def stats(self):
+        """Return hit/miss counters and memory use."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def stats_message(self):
+        """One-line summary for the Logs section."""
+        s = self.stats()
+        return (f"Indicator cache: {s['hits']} hits, {s['disk_hits']} disk hits, {s['misses']} misses "
+                f"({s['hit_rate']:.0%} hit rate), {s['entries']} series, "
+                f"{s['bytes'] / 2**20:.1f}/{s['max_bytes'] / 2**20:.0f} MB, {s['evictions']} evictions")
+
@@ -1,38 +1,105 @@
 import tkinter as tk
 from tkinter import ttk
 
-class IndicatorCard(tk.Frame):
-    def __init__(self, parent, indicator_name="Indicator Name", ui_setup=None, **kwargs):
-        super().__init__(parent, **kwargs)
+# Number of row widget sets a card keeps; more rows than this scroll through them
+VISIBLE_ROWS = 8
+
+
+class CardModel:
+    """The parameters of one indicator card, kept as plain typed values.
+
+    Each row has the dropdown row config it came from (display name and
+    inputfields) and one value per field, converted with the field's `type`
+    and checked against the field's optional `min`. The widgets only ever
+    show a window onto this model.
+    """
+
+    def __init__(self, ui_setup):
+        self.ui_setup = ui_setup
+        self.row_configs = []
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add_row(self, row_config, values=None):
+        """Append a row; missing values default to the field placeholders."""
+        fields = row_config['inputfields']
+        if values is None:
+            values = [field['placeholder'] for field in fields]
+        self.row_configs.append(row_config)
+        self.rows.append([field['type'](value) for field, value in zip(fields, values)])
+        return len(self.rows) - 1
+
+    def fields(self, index):
+        return self.row_configs[index]['inputfields']
+
+    def label(self, index):
+        """Row label; rows of indicators with a '+' button are numbered (EMA 1, EMA 2, ...)."""
+        display_name = self.row_configs[index]['display_name']
+        if 'button' in self.ui_setup['frontend']:
+            display_name = f"{display_name} {index + 1}"
+        return f"{display_name}:"
+
+    def set_text(self, index, column, text):
+        """Store typed-in text, converted to the field type.
+
+        Raises ValueError if it does not convert or is below the field's `min`.
+        """
+        field = self.fields(index)[column]
+        value = field['type'](text)
+        if 'min' in field and value < field['min']:
+            raise ValueError(f"{value} is below the minimum of {field['min']}")
+        self.rows[index][column] = value
+
+    def values(self):
+        """Return a copy of every row's values, e.g. [[13, 'yellow'], [21, 'red']]."""
+        return [list(row) for row in self.rows]
+
+
+class IndicatorCard(ttk.Frame):
+    def __init__(self, parent, indicator_name="Indicator Name", ui_setup=None, on_change=None, **kwargs):
+        # Colors come from the named styles compiled by ThemeManager (Card.*, CardDropdown.*, ...)
+        super().__init__(parent, style="Card.TFrame", padding=10, **kwargs)
 
         # Save ui_setup for later use
         self.ui_setup = ui_setup
-        
-        # Configure card appearance
-        self.config(bg="#e0e0e0", bd=2, relief="groove", padx=10, pady=10)
+        self.indicator_name = indicator_name
+        # on_change(card) is called after a row is edited or added and after the card is deleted
+        self.on_change = on_change
+
+        # Row parameters live in the model; the dropdown only shows VISIBLE_ROWS of them
+        self.model = CardModel(ui_setup)
+        self.first_row = 0
+        self.row_widgets = []  # recycled (label, [(entry, StringVar), ...]) sets
 
         # Dropdown toggle button (far left)
-        self.dropdown_button = ttk.Button(self, text=">", command=self.toggle_card_dropdown)
+        self.dropdown_button = ttk.Button(self, text=">", style="CardButton.TButton", command=self.toggle_card_dropdown)
         self.dropdown_button.grid(row=0, column=0, padx=(5, 5), sticky="w")
 
         # Indicator Label (next to the dropdown button)
-        self.indicator_label = ttk.Label(self, text=indicator_name, font=("Helvetica", 14, "bold"))
+        self.indicator_label = ttk.Label(self, text=indicator_name, style="Card.TLabel", font=("Helvetica", 14, "bold"))
         self.indicator_label.grid(row=0, column=1, sticky="w", padx=5)
-        
+
         # "+" Button (far right if present in frontend)
         if ui_setup and 'button' in ui_setup['frontend']:
-            add_button = ttk.Button(self, text=ui_setup['frontend']['button']['placeholder'], command=self.add_row)
+            add_button = ttk.Button(self, text=ui_setup['frontend']['button']['placeholder'], style="CardButton.TButton", command=self.add_row)
             add_button.grid(row=0, column=4, padx=(10, 0), sticky="e")
 
         # Delete Button (far right, next to the "+")
-        delete_button = ttk.Button(self, text="X", command=self.delete_card, width=2)
+        delete_button = ttk.Button(self, text="X", style="CardButton.TButton", command=self.delete_card, width=2)
         delete_button.grid(row=0, column=5, padx=(5, 5), sticky="e")
-        
+
         # Create the dropdown frame for dynamic rows (hidden by default)
-        self.dropdown_frame = tk.Frame(self, bg="#f5f5f5")
+        self.dropdown_frame = ttk.Frame(self, style="CardDropdown.TFrame")
         self.dropdown_frame.grid(row=1, column=0, columnspan=5, sticky="ew", pady=(10, 0))
         self.dropdown_frame.grid_remove()  # Hidden by default
 
+        # Scrollbar for cards with more rows than VISIBLE_ROWS (shown only when needed)
+        self.row_scrollbar = ttk.Scrollbar(self.dropdown_frame, orient=tk.VERTICAL, command=self.scroll_rows)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.dropdown_frame.bind(sequence, self.on_mouse_wheel)
+
         # If there are predefined dropdown rows (like RSI), add them directly
         if 'dropdown' in ui_setup and len(ui_setup['dropdown']) > 0:
             self.populate_dropdown_initially(ui_setup['dropdown'])
@@ -47,74 +114,160 @@ class IndicatorCard(tk.Frame):
 
     def populate_dropdown_initially(self, dropdown_config):
         """Immediately populate dropdown rows (e.g., for RSI or predefined EMAs)."""
-        for i, row_config in enumerate(dropdown_config):
-            self.add_predefined_row(i, row_config)
-
-    def add_predefined_row(self, row_index, row_config):
-        """Add a predefined row to the dropdown for indicators like RSI or others."""
-        display_name = row_config['display_name']
-
-        # Append the row number if the indicator has a '+' button (for EMA, SMA, etc.)
-        if 'button' in self.ui_setup['frontend']:
-            display_name = f"{display_name} {row_index + 1}"
-        
-        # Add the label
-        ttk.Label(self.dropdown_frame, text=f"{display_name}:").grid(row=row_index, column=0, sticky="w", padx=5)
-
-        # Loop through all input fields in the row_config and create corresponding input fields
-        for j, field in enumerate(row_config['inputfields']):
-            input_type, placeholder = field['type'], field['placeholder']
-
-            # Create Entry field with a placeholder
-            entry = ttk.Entry(self.dropdown_frame)
-            entry.grid(row=row_index, column=j + 1, padx=(10, 0))
-
-            # Set placeholder for the entry
-            entry.insert(0, placeholder)
-            entry.bind("<FocusIn>", lambda e, ph=placeholder: self.clear_placeholder(e, ph))
-            entry.bind("<FocusOut>", lambda e, ph=placeholder: self.set_placeholder(e, ph))
+        for row_config in dropdown_config:
+            self.model.add_row(row_config)
+        self.render_rows()
 
     def add_row(self, dropdown_config=None):
         """Add a new row to the dropdown dynamically (e.g., for EMAs/SMAs)."""
         # Show dropdown if it's hidden
         self.dropdown_frame.grid()
 
-        # Calculate the current number of rows
-        num_rows = len(self.dropdown_frame.winfo_children()) // 3  # Assuming 3 widgets per row
-
         # If no config is provided, use the default config
         dropdown_config = dropdown_config or self.ui_setup['dropdown']
 
-        # Loop through the dropdown rows and add all fields dynamically
-        for i, field in enumerate(dropdown_config):
-            display_name = field['display_name']
-            input_fields = field['inputfields']
+        # Keep whatever is being typed before the visible rows move (changed() below reports it)
+        self.commit_visible_rows(notify=False)
+        for row_config in dropdown_config:
+            self.model.add_row(row_config)
 
-            # Add label for the row
-            ttk.Label(self.dropdown_frame, text=f"{display_name} {num_rows + 1}:").grid(row=num_rows, column=0, sticky="w", padx=5)
+        # Scroll so the new row is visible
+        self.first_row = max(0, len(self.model) - VISIBLE_ROWS)
+        self.render_rows()
+        self.changed()
 
-            # Add input fields from dropdown config dynamically
-            for j, field_config in enumerate(input_fields):
-                placeholder = field_config['placeholder']
+    def changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
 
-                # Create Entry field with proper validation
-                entry = ttk.Entry(self.dropdown_frame)
-                entry.grid(row=num_rows, column=j + 1, padx=(10, 0))
+    def get_values(self):
+        """Return the typed field values of every row, e.g. [[13, 'yellow'], [21, 'red']]."""
+        self.commit_visible_rows(notify=False)
+        return self.model.values()
 
-                # Set placeholder for each field
-                entry.insert(0, placeholder)
-                entry.bind("<FocusIn>", lambda e, ph=placeholder: self.clear_placeholder(e, ph))
-                entry.bind("<FocusOut>", lambda e, ph=placeholder: self.set_placeholder(e, ph))
+    def compute(self, ohlcv, cache=None):
+        """Compute all rows of this card in one batched call (see indicator_engine).
 
-    def clear_placeholder(self, event, placeholder):
-        """Clear the placeholder when the entry is clicked."""
-        if event.widget.get() == placeholder:
-            event.widget.delete(0, tk.END)
+        With an IndicatorCache only the rows whose parameters changed are recomputed.
+        """
+        if cache is not None:
+            return cache.compute(self.indicator_name, ohlcv, self.get_values())
+        import indicator_engine  # numpy; imported on first use to keep start-up light
+        return indicator_engine.compute_indicator(self.indicator_name, ohlcv, self.get_values())
+
+    def _create_row_widgets(self, slot):
+        """Create one recycled widget set: a label and enough entries for the widest row."""
+        label = ttk.Label(self.dropdown_frame, style="CardDropdown.TLabel")
+        label.grid(row=slot, column=0, sticky="w", padx=5)
+        max_fields = max(len(config['inputfields']) for config in self.ui_setup['dropdown'] + self.model.row_configs)
+        entries = []
+        for column in range(max_fields):
+            var = tk.StringVar()
+            entry = ttk.Entry(self.dropdown_frame, textvariable=var, style="Custom.TEntry")
+            entry.grid(row=slot, column=column + 1, padx=(10, 0))
+            entry.bind("<FocusIn>", lambda e, s=slot, c=column: self.clear_placeholder(e, s, c))
+            entry.bind("<FocusOut>", lambda e, s=slot, c=column: self.commit_entry(s, c, notify=True))
+            entry.bind("<Return>", lambda e, s=slot, c=column: self.commit_entry(s, c, notify=True))
+            entry.bind("<MouseWheel>", self.on_mouse_wheel)
+            entry.bind("<Button-4>", self.on_mouse_wheel)
+            entry.bind("<Button-5>", self.on_mouse_wheel)
+            entries.append((entry, var))
+        self.row_widgets.append((label, entries))
+
+    def render_rows(self):
+        """Point the recycled widget sets at model rows first_row .. first_row + VISIBLE_ROWS."""
+        total = len(self.model)
+        visible = min(VISIBLE_ROWS, total)
+        while len(self.row_widgets) < visible:
+            self._create_row_widgets(len(self.row_widgets))
+
+        for slot, (label, entries) in enumerate(self.row_widgets):
+            index = self.first_row + slot
+            if index >= total:
+                label.grid_remove()
+                for entry, var in entries:
+                    entry.grid_remove()
+                continue
+            label.config(text=self.model.label(index))
+            label.grid()
+            values = self.model.rows[index]
+            for column, (entry, var) in enumerate(entries):
+                if column < len(values):
+                    var.set(str(values[column]))
+                    entry.grid()
+                else:
+                    entry.grid_remove()
 
-    def set_placeholder(self, event, placeholder):
-        """Restore placeholder if entry is empty when it loses focus."""
-        if event.widget.get() == "":
-            event.widget.insert(0, placeholder)
+        # Only cards with more rows than fit get a scrollbar
+        if total > VISIBLE_ROWS:
+            max_fields = len(self.row_widgets[0][1])
+            self.row_scrollbar.grid(row=0, column=max_fields + 1, rowspan=VISIBLE_ROWS, sticky="ns")
+            self.row_scrollbar.set(self.first_row / total, (self.first_row + VISIBLE_ROWS) / total)
+        else:
+            self.row_scrollbar.grid_remove()
+
+    def commit_entry(self, slot, column, notify=False):
+        """Write one visible entry back into the model, reverting it if the value is invalid.
+
+        Returns True if the stored value changed; with `notify`, on_change is called then.
+        """
+        index = self.first_row + slot
+        if index >= len(self.model) or column >= len(self.model.fields(index)):
+            return False
+        entry, var = self.row_widgets[slot][1][column]
+        text = var.get()
+        old = self.model.rows[index][column]
+        if text == "":
+            # Empty entry: show the stored value again (like the old placeholder behaviour)
+            var.set(str(old))
+            return False
+        try:
+            self.model.set_text(index, column, text)
+        except ValueError:
+            var.set(str(old))
+            return False
+        if self.model.rows[index][column] == old:
+            return False
+        if notify:
+            self.changed()
+        return True
+
+    def commit_visible_rows(self, notify=True):
+        changed = False
+        for slot, (label, entries) in enumerate(self.row_widgets):
+            for column in range(len(entries)):
+                changed |= self.commit_entry(slot, column)
+        if changed and notify:
+            self.changed()
+
+    def scroll_rows(self, action, amount, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        total = len(self.model)
+        if action == 'moveto':
+            first = int(round(float(amount) * total))
+        elif unit == 'pages':
+            first = self.first_row + int(amount) * VISIBLE_ROWS
+        else:
+            first = self.first_row + int(amount)
+        first = max(0, min(first, total - VISIBLE_ROWS))
+        if first != self.first_row:
+            self.commit_visible_rows()
+            self.first_row = first
+            self.render_rows()
+
+    def on_mouse_wheel(self, event):
+        """Scroll rows with the wheel (MouseWheel on Windows/macOS, Button-4/5 on X11)."""
+        if len(self.model) > VISIBLE_ROWS:
+            up = event.num == 4 or getattr(event, 'delta', 0) > 0
+            self.scroll_rows('scroll', -1 if up else 1, 'units')
+
+    def clear_placeholder(self, event, slot, column):
+        """Clear the placeholder when the entry is clicked."""
+        index = self.first_row + slot
+        if index < len(self.model) and column < len(self.model.fields(index)):
+            placeholder = self.model.fields(index)[column]['placeholder']
+            if event.widget.get() == str(placeholder):
+                event.widget.delete(0, tk.END)
 
     def toggle_card_dropdown(self):
         """Toggle the dropdown content visibility."""
@@ -127,4 +280,5 @@ class IndicatorCard(tk.Frame):
 
     def delete_card(self):
         """Remove the card from its parent."""
-        self.destroy()
\ No newline at end of file
+        self.destroy()
+        self.changed()
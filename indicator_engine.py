@@ -0,0 +1,188 @@
+import numpy as np
+
+# Block length used by the linear recurrence kernel. Each block is solved with a
+# small matrix product, so larger blocks mean fewer Python-level steps but more flops.
+RECURRENCE_BLOCK = 64
+
+
+def get_field(ohlcv, field="close"):
+    """Return one OHLCV column as a float64 array.
+
+    `ohlcv` can be anything indexable by field name (dict of arrays, NumPy
+    structured array, CandleStore, ...) or a plain 1-D array of prices.
+    """
+    if isinstance(ohlcv, np.ndarray) and ohlcv.dtype.names is None:
+        return np.asarray(ohlcv, dtype=np.float64)
+    return np.asarray(ohlcv[field], dtype=np.float64)
+
+
+def _linear_recurrence(x, decay, init):
+    """Solve y[t] = x[t] + decay * y[t-1] for every row of `x` at once.
+
+    x: (k, n) inputs, decay: (k,) per-row decay factors, init: (k,) value of y[-1].
+    The series is cut into blocks that are solved with one batched matrix
+    product; the carries between blocks form the same recurrence with
+    decay**block, which is solved recursively, so no loop runs per bar.
+    """
+    k, n = x.shape
+    if n == 0:
+        return x.copy()
+
+    block = RECURRENCE_BLOCK
+    if n <= block:
+        block = n
+    m = -(-n // block)
+    padded = np.zeros((k, m * block))
+    padded[:, :n] = x
+    blocks = padded.reshape(k, m, block)
+
+    # powers[k, i] = decay_k ** i for i in 0..block
+    powers = decay[:, None] ** np.arange(block + 1)[None, :]
+    lag = np.arange(block)[:, None] - np.arange(block)[None, :]
+    weights = np.where(lag >= 0, powers[:, np.clip(lag, 0, block)], 0.0)
+
+    # Solve every block as if it started from zero
+    local = np.matmul(blocks, weights.transpose(0, 2, 1))
+
+    # Carry the end value of each block into the next one
+    totals = local[:, :, -1]
+    if m == 1:
+        carries = init[:, None]
+    else:
+        step = powers[:, block]
+        ends = _linear_recurrence(totals, step, init)
+        carries = np.concatenate([init[:, None], ends[:, :-1]], axis=1)
+
+    result = local + carries[:, :, None] * powers[:, None, 1:]
+    return result.reshape(k, m * block)[:, :n]
+
+
+def compute_emas(prices, periods):
+    """Compute an EMA for every period in one pass.
+
+    Returns a (len(periods), len(prices)) array. Each EMA is seeded with the
+    first price, i.e. ema[0] == prices[0] (same as pandas `ewm(adjust=False)`).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.float64).reshape(-1)
+    if np.any(periods < 1):
+        raise ValueError(f"EMA period must be positive, got {periods.min():g}")
+    if len(prices) == 0:
+        return np.empty((len(periods), 0))
+
+    alpha = 2.0 / (periods + 1.0)
+    x = alpha[:, None] * prices[None, :]
+    return _linear_recurrence(x, 1.0 - alpha, np.full(len(periods), prices[0]))
+
+
+def compute_smas(prices, periods):
+    """Compute an SMA for every period in one pass.
+
+    Returns a (len(periods), len(prices)) array, NaN until a full window exists.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.int64).reshape(-1)
+    n = len(prices)
+    out = np.full((len(periods), n), np.nan)
+    if n == 0:
+        return out
+
+    # Centre the prices before summing to keep cumsum round-off small on long series
+    offset = prices[0]
+    sums = np.concatenate([[0.0], np.cumsum(prices - offset)])
+    for row, period in enumerate(periods):
+        if period < 1:
+            raise ValueError(f"SMA period must be positive, got {period}")
+        if period <= n:
+            out[row, period - 1:] = (sums[period:] - sums[:-period]) / period + offset
+    return out
+
+
+def compute_rsi(prices, periods):
+    """Compute Wilder's RSI for every period in one pass.
+
+    Returns a (len(periods), len(prices)) array. The first average gain/loss
+    is the simple mean of the first `period` changes, so rsi[:period] is NaN.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.int64).reshape(-1)
+    n = len(prices)
+    out = np.full((len(periods), n), np.nan)
+    if n < 2:
+        return out
+
+    change = np.diff(prices, prepend=prices[0])
+    gains = np.clip(change, 0.0, None)
+    losses = np.clip(-change, 0.0, None)
+    gain_sums = np.cumsum(gains)
+    loss_sums = np.cumsum(losses)
+
+    # Build the recurrence inputs: zero before the seed, the seed at `period`,
+    # then gain / period for every later bar.
+    valid = periods < n
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return out
+    p = periods[rows]
+    if np.any(p < 1):
+        raise ValueError("RSI period must be positive")
+    index = np.arange(n)[None, :]
+    after = index > p[:, None]
+    x_gain = np.where(after, gains[None, :] / p[:, None], 0.0)
+    x_loss = np.where(after, losses[None, :] / p[:, None], 0.0)
+    x_gain[np.arange(len(p)), p] = gain_sums[p] / p
+    x_loss[np.arange(len(p)), p] = loss_sums[p] / p
+
+    decay = 1.0 - 1.0 / p
+    zeros = np.zeros(len(p))
+    avg_gain = _linear_recurrence(x_gain, decay, zeros)
+    avg_loss = _linear_recurrence(x_loss, decay, zeros)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), rsi)
+    out[rows] = np.where(index >= p[:, None], rsi, np.nan)
+    return out
+
+
+def _row_periods(rows):
+    """Pull the period (first input field) out of each card row."""
+    return [int(row[0]) for row in rows]
+
+
+def EMAs(ohlcv, rows, field="close"):
+    """Compute every EMA row of an EMAs card. Returns {'ema': (rows, bars)}."""
+    return {'ema': compute_emas(get_field(ohlcv, field), _row_periods(rows))}
+
+
+def SMAs(ohlcv, rows, field="close"):
+    """Compute every SMA row of an SMAs card. Returns {'sma': (rows, bars)}."""
+    return {'sma': compute_smas(get_field(ohlcv, field), _row_periods(rows))}
+
+
+def RSI(ohlcv, rows, field="close"):
+    """Compute the RSI card. Rows follow indicators.RSI(): period, upper, lower, color."""
+    period = int(rows[0][0])
+    return {'rsi': compute_rsi(get_field(ohlcv, field), [period])[0]}
+
+
+# Compute functions keyed by the name of their ui_setup function in indicators.py
+COMPUTE_FUNCTIONS = {
+    'EMAs': EMAs,
+    'SMAs': SMAs,
+    'RSI': RSI,
+}
+
+# Name of the output array each compute function returns
+OUTPUT_NAMES = {
+    'EMAs': 'ema',
+    'SMAs': 'sma',
+    'RSI': 'rsi',
+}
+
+
+def compute_indicator(indicator_name, ohlcv, rows, field="close"):
+    """Compute the outputs of an indicator card from its name and row values."""
+    if indicator_name not in COMPUTE_FUNCTIONS:
+        raise KeyError(f"No compute function registered for indicator '{indicator_name}'")
+    return COMPUTE_FUNCTIONS[indicator_name](ohlcv, rows, field=field)
@@ -0,0 +1,208 @@
+import ast
+import importlib
+import importlib.util
+import inspect
+import os
+from bisect import bisect_left
+import indicator_engine
+import indicators
+
+DEFAULT_CATEGORY = "Other"
+
+
+class IndicatorEntry:
+    """What the Find Indicator window needs to know about one indicator.
+
+    Built-in entries are complete from the start. Plug-in entries are read
+    from source with `ast` and only import their module when ui_setup() is
+    first asked for.
+    """
+
+    def __init__(self, name, display_name, category, module_name=None, module_path=None, func=None):
+        self.name = name
+        self.display_name = display_name
+        self.category = category
+        self.module_name = module_name
+        self.module_path = module_path
+        self.func = func
+        self.search_text = f"{name} {display_name} {category}".lower()
+
+    def ui_setup(self):
+        """Return a fresh ui_setup dict, importing the plug-in module on first use."""
+        if self.func is None:
+            spec = importlib.util.spec_from_file_location(self.module_name, self.module_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            # Plug-ins may ship compute functions (and their output names) next to their ui_setup functions
+            indicator_engine.COMPUTE_FUNCTIONS.update(getattr(module, 'COMPUTE_FUNCTIONS', {}))
+            indicator_engine.OUTPUT_NAMES.update(getattr(module, 'OUTPUT_NAMES', {}))
+            self.func = getattr(module, self.name)
+        return self.func()
+
+    def parameter_schema(self):
+        """Return [(row display name, [field type, ...]), ...] from the ui_setup."""
+        return [(row['display_name'], [field['type'] for field in row['inputfields']])
+                for row in self.ui_setup()['dropdown']]
+
+    def label(self):
+        return f"{self.display_name}  ({self.category})"
+
+
+def _frontend_constants(func_node):
+    """Pull the constant 'display_name' / 'category' out of the 'frontend' dict in a ui_setup function."""
+    found = {}
+    for node in ast.walk(func_node):
+        if not isinstance(node, ast.Dict):
+            continue
+        for key, value in zip(node.keys, node.values):
+            if isinstance(key, ast.Constant) and key.value == 'frontend' and isinstance(value, ast.Dict):
+                for inner_key, inner_value in zip(value.keys, value.values):
+                    if isinstance(inner_key, ast.Constant) and isinstance(inner_value, ast.Constant):
+                        found[inner_key.value] = inner_value.value
+    return found
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _is_subsequence(query, text):
+    """True if the characters of `query` appear in `text` in order (fuzzy match)."""
+    position = 0
+    for char in query:
+        position = text.find(char, position) + 1
+        if position == 0:
+            return False
+    return True
+
+
+class IndicatorRegistry:
+    """Indexed catalogue of every indicator the app can add as a card.
+
+    Sources are the ui_setup functions defined in indicators.py plus any
+    plug-in modules (*.py) in `plugin_dirs`. The catalogue is built on first
+    use and indexed by word prefix and by trigram, so filtering stays fast
+    with hundreds of entries.
+    """
+
+    def __init__(self, plugin_dirs=()):
+        self.plugin_dirs = list(plugin_dirs)
+        self.entries = None
+        self.prefixes = []  # sorted (word, entry name) pairs
+        self.trigram_index = {}
+        self.last_query = None
+        self.last_matches = None
+
+    def build(self):
+        """Scan the sources and build the indexes (only once)."""
+        if self.entries is not None:
+            return
+        self.entries = {}
+        for name, func in inspect.getmembers(indicators, inspect.isfunction):
+            # Only functions defined in indicators.py itself, not imports
+            if func.__module__ != indicators.__name__ or name.startswith("_"):
+                continue
+            frontend = func()['frontend']
+            self.entries[name] = IndicatorEntry(name, frontend.get('display_name', name),
+                                                frontend.get('category', DEFAULT_CATEGORY), func=func)
+        for directory in self.plugin_dirs:
+            self.scan_plugin_dir(directory)
+        self.build_index()
+
+    def scan_plugin_dir(self, directory):
+        """Register the ui_setup functions of every module in `directory` without importing them."""
+        if not os.path.isdir(directory):
+            return
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.endswith(".py") or file_name.startswith("_"):
+                continue
+            path = os.path.join(directory, file_name)
+            with open(path, 'r', encoding="utf-8") as file:
+                tree = ast.parse(file.read(), filename=path)
+            module_name = f"indicator_plugin_{file_name[:-3]}"
+            for node in tree.body:
+                if not isinstance(node, ast.FunctionDef) or node.name.startswith("_"):
+                    continue
+                frontend = _frontend_constants(node)
+                if not frontend:
+                    continue  # not a ui_setup function
+                self.entries[node.name] = IndicatorEntry(
+                    node.name, frontend.get('display_name', node.name),
+                    frontend.get('category', DEFAULT_CATEGORY), module_name=module_name, module_path=path)
+
+    def build_index(self):
+        self.prefixes = []
+        self.trigram_index = {}
+        for name, entry in self.entries.items():
+            for word in set(entry.search_text.split()):
+                self.prefixes.append((word, name))
+            for trigram in _trigrams(entry.search_text):
+                self.trigram_index.setdefault(trigram, set()).add(name)
+        self.prefixes.sort()
+        self.last_query = None
+        self.last_matches = None
+
+    def names(self):
+        self.build()
+        return sorted(self.entries, key=lambda name: (self.entries[name].category, self.entries[name].display_name.lower()))
+
+    def get(self, name):
+        self.build()
+        return self.entries[name]
+
+    def ui_setup(self, name):
+        return self.get(name).ui_setup()
+
+    def _prefix_matches(self, word):
+        start = bisect_left(self.prefixes, (word, ""))
+        matches = set()
+        for indexed_word, name in self.prefixes[start:]:
+            if not indexed_word.startswith(word):
+                break
+            matches.add(name)
+        return matches
+
+    def search(self, query):
+        """Return entry names matching `query`, best matches first.
+
+        Ranking: word prefix, then substring, then fuzzy (characters in order).
+        When the query only extends the previous one, just the previous
+        matches are re-checked, so typing is incremental.
+        """
+        self.build()
+        query = query.strip().lower()
+        if not query:
+            self.last_query, self.last_matches = "", self.names()
+            return self.last_matches
+
+        if self.last_query and query.startswith(self.last_query):
+            candidates = self.last_matches
+        else:
+            candidates = self.entries
+
+        words = query.split()
+        # Narrow with the indexes first: every word must prefix-match or share the trigrams
+        indexed = None
+        for word in words:
+            hits = self._prefix_matches(word)
+            if len(word) >= 3:
+                trigram_sets = [self.trigram_index.get(t, set()) for t in _trigrams(word)]
+                hits = hits | set.intersection(*trigram_sets)
+            indexed = hits if indexed is None else indexed & hits
+
+        ranked = []
+        for name in candidates:
+            text = self.entries[name].search_text
+            if name in indexed and all(any(w.startswith(word) for w in text.split()) for word in words):
+                rank = 0
+            elif name in indexed and all(word in text for word in words):
+                rank = 1
+            elif _is_subsequence(query.replace(" ", ""), text.replace(" ", "")):
+                rank = 2
+            else:
+                continue
+            ranked.append((rank, self.entries[name].display_name.lower(), name))
+        ranked.sort()
+        self.last_query = query
+        self.last_matches = [name for _, _, name in ranked]
+        return self.last_matches
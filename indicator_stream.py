@@ -0,0 +1,175 @@
+import numpy as np
+
+
+class StreamingEMA:
+    """EMA for several periods that updates in O(1) per bar.
+
+    Matches indicator_engine.compute_emas: the first bar seeds every EMA.
+    `append` adds a new bar, `update_last` revises the newest (still forming) bar.
+    """
+
+    def __init__(self, periods):
+        self.periods = np.asarray(periods, dtype=np.float64).reshape(-1)
+        self.alpha = 2.0 / (self.periods + 1.0)
+        self.count = 0
+        self.committed = None  # EMA values up to the bar before the newest one
+        self.value = np.full(len(self.periods), np.nan)
+
+    def _step(self, price):
+        if self.committed is None:
+            return np.full(len(self.periods), float(price))
+        return self.alpha * price + (1.0 - self.alpha) * self.committed
+
+    def append(self, price):
+        """Add a new bar and return the EMA values."""
+        if self.count:
+            self.committed = self.value
+        self.count += 1
+        self.value = self._step(price)
+        return self.value
+
+    def update_last(self, price):
+        """Replace the close of the newest bar and return the EMA values."""
+        if not self.count:
+            return self.append(price)
+        self.value = self._step(price)
+        return self.value
+
+
+class StreamingSMA:
+    """SMA for several periods backed by one shared ring buffer.
+
+    Each period keeps a running window sum, so a bar costs O(len(periods)).
+    The sums are rebuilt from the buffer once per buffer lap to stop round-off drift.
+    """
+
+    def __init__(self, periods):
+        self.periods = np.asarray(periods, dtype=np.int64).reshape(-1)
+        if np.any(self.periods < 1):
+            raise ValueError("SMA periods must be positive")
+        self.size = int(self.periods.max())
+        self.buffer = np.zeros(self.size)
+        self.sums = np.zeros(len(self.periods))
+        self.count = 0
+        self.value = np.full(len(self.periods), np.nan)
+
+    def _refresh(self):
+        full = self.count >= self.periods
+        self.value = np.where(full, self.sums / self.periods, np.nan)
+        return self.value
+
+    def _resync(self):
+        """Recompute every window sum from the ring buffer."""
+        last = (self.count - 1) % self.size
+        ordered = np.roll(self.buffer, -(last + 1))  # oldest .. newest
+        tail_sums = np.concatenate([[0.0], np.cumsum(ordered[::-1])])
+        self.sums = tail_sums[np.minimum(self.periods, self.count)]
+
+    def append(self, price):
+        """Add a new bar and return the SMA values."""
+        pos = self.count % self.size
+        # Values that fall out of each window (only once the window is full)
+        leaving_pos = (pos - self.periods) % self.size
+        leaving = np.where(self.count >= self.periods, self.buffer[leaving_pos], 0.0)
+        self.buffer[pos] = price
+        self.count += 1
+        self.sums = self.sums + price - leaving
+        if self.count % self.size == 0:
+            self._resync()
+        return self._refresh()
+
+    def update_last(self, price):
+        """Replace the close of the newest bar and return the SMA values."""
+        if not self.count:
+            return self.append(price)
+        pos = (self.count - 1) % self.size
+        self.sums = self.sums + (price - self.buffer[pos])
+        self.buffer[pos] = price
+        return self._refresh()
+
+
+class StreamingRSI:
+    """Wilder's RSI for several periods that updates in O(1) per bar.
+
+    Matches indicator_engine.compute_rsi: NaN until `period` changes are seen,
+    seeded with their simple mean, then Wilder smoothing.
+    """
+
+    def __init__(self, periods):
+        self.periods = np.asarray(periods, dtype=np.int64).reshape(-1)
+        if np.any(self.periods < 1):
+            raise ValueError("RSI periods must be positive")
+        k = len(self.periods)
+        self.count = 0
+        # State committed up to the bar before the newest one
+        self.prev_close = None
+        self.committed = (np.zeros(k), np.zeros(k))
+        # State including the newest bar
+        self.last_close = None
+        self.state = self.committed
+        self.value = np.full(k, np.nan)
+
+    def _step(self, price):
+        """Return (gain, loss) averages/sums after adding `price` to the committed state."""
+        gain_acc, loss_acc = self.committed
+        if self.prev_close is None:
+            return gain_acc, loss_acc
+        change = price - self.prev_close
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        index = self.count - 1
+        p = self.periods
+        # Before the seed bar the accumulators hold plain sums, after it Wilder averages
+        seeding = index <= p
+        gain_acc = np.where(seeding, gain_acc + gain, gain / p + (1.0 - 1.0 / p) * gain_acc)
+        loss_acc = np.where(seeding, loss_acc + loss, loss / p + (1.0 - 1.0 / p) * loss_acc)
+        at_seed = index == p
+        gain_acc = np.where(at_seed, gain_acc / p, gain_acc)
+        loss_acc = np.where(at_seed, loss_acc / p, loss_acc)
+        return gain_acc, loss_acc
+
+    def _refresh(self):
+        avg_gain, avg_loss = self.state
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        rsi = np.where(avg_loss == 0.0, np.where(avg_gain == 0.0, 50.0, 100.0), rsi)
+        self.value = np.where(self.count - 1 >= self.periods, rsi, np.nan)
+        return self.value
+
+    def append(self, price):
+        """Add a new bar and return the RSI values."""
+        if self.count:
+            self.committed = self.state
+            self.prev_close = self.last_close
+        self.count += 1
+        self.last_close = float(price)
+        self.state = self._step(self.last_close)
+        return self._refresh()
+
+    def update_last(self, price):
+        """Replace the close of the newest bar and return the RSI values."""
+        if not self.count:
+            return self.append(price)
+        self.last_close = float(price)
+        self.state = self._step(self.last_close)
+        return self._refresh()
+
+
+# Streaming classes keyed by the name of their ui_setup function in indicators.py
+STREAMING_CLASSES = {
+    'EMAs': StreamingEMA,
+    'SMAs': StreamingSMA,
+    'RSI': StreamingRSI,
+}
+
+
+def create_stream(indicator_name, rows):
+    """Create the streaming state for an indicator card from its row values."""
+    if indicator_name not in STREAMING_CLASSES:
+        raise KeyError(f"No streaming version registered for indicator '{indicator_name}'")
+    if indicator_name == 'RSI':
+        periods = [int(rows[0][0])]
+    else:
+        periods = [int(row[0]) for row in rows]
+    return STREAMING_CLASSES[indicator_name](periods)
+
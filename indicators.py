@@ -6,13 +6,14 @@ def EMAs():
     ui_setup = {
         'frontend': {
             'display_name': "EMAs",
+            'category': "Trend",
             'button': {'placeholder': '+', 'result': 'add_row'}  # When clicked, add row to dropdown
         },
         'dropdown': [
             {
                 'display_name': 'EMA',
                 'inputfields': [
-                    {'type': int, 'placeholder': 13},  # EMA number
+                    {'type': int, 'placeholder': 13, 'min': 1},  # EMA number
                     {'type': str, 'placeholder': 'yellow'}  # EMA color
                 ]
             }
@@ -24,13 +25,14 @@ def SMAs():
     ui_setup = {
         'frontend': {
             'display_name': "SMAs",
+            'category': "Trend",
             'button': {'placeholder': '+', 'result': 'add_row'}  # When clicked, add row to dropdown
         },
         'dropdown': [
             {
                 'display_name': 'SMA',
                 'inputfields': [
-                    {'type': int, 'placeholder': 13},  # EMA number
+                    {'type': int, 'placeholder': 13, 'min': 1},  # EMA number
                     {'type': str, 'placeholder': 'yellow'}  # EMA color
                 ]
             }
@@ -44,13 +46,14 @@ def RSI():
     """
     ui_setup = {
         'frontend': {
-            'display_name': "RSI"
+            'display_name': "RSI",
+            'category': "Momentum"
         },
         'dropdown': [
             {
                 'display_name': 'RSI Period',
                 'inputfields': [
-                    {'type': int, 'placeholder': 14}  # RSI period (e.g., 14)
+                    {'type': int, 'placeholder': 14, 'min': 1}  # RSI period (e.g., 14)
                 ]
             },
             {
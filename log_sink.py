@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+import tkinter as tk
+import perf
+
+# Ordered log levels; a filter hides everything below the chosen level
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+class LogSink:
+    """Thread-safe, bounded buffer of log lines waiting to be shown.
+
+    Producers (any thread or job callback) call write(); the UI takes
+    everything at once with drain(). When producers outrun the UI the
+    oldest lines are dropped, so memory stays bounded.
+    """
+
+    def __init__(self, max_lines=10000):
+        self.pending = deque(maxlen=max_lines)
+        self.lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    def write(self, message, level="INFO"):
+        """Queue a line for display."""
+        with self.lock:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append((level, message))
+            self.written += 1
+
+    def drain(self):
+        """Return and clear every pending (level, message) pair."""
+        with self.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+        return lines
+
+
+class LogPane:
+    """Flushes a LogSink into a read-only tk.Text once per frame.
+
+    Each flush does one bulk insert, trims the widget to `max_lines` and only
+    scrolls if the view was already at the bottom. Level filtering hides
+    lines with elided tags instead of re-inserting the history.
+    """
+
+    def __init__(self, text_widget, sink, max_lines=10000, interval_ms=50):
+        self.text = text_widget
+        self.sink = sink
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.line_count = 0
+        self.after_id = None
+        self.min_level = LEVELS[0]
+
+        for level in LEVELS:
+            self.text.tag_configure(level)
+        self.text.tag_configure("WARNING", foreground="#e0a000")
+        self.text.tag_configure("ERROR", foreground="#e53935")
+
+    def start(self):
+        """Begin flushing every `interval_ms` milliseconds."""
+        if self.after_id is None:
+            self.after_id = self.text.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.text.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        self.flush()
+        self.after_id = self.text.after(self.interval_ms, self._tick)
+
+    @perf.timer("logs.insert")
+    def flush(self):
+        """Move every pending line into the widget in one insert."""
+        lines = self.sink.drain()
+        if not lines:
+            return 0
+        # Only the newest max_lines can survive trimming anyway
+        lines = lines[-self.max_lines:]
+
+        # Build "text, tag, text, tag, ..." arguments, merging runs of the same level
+        chunks = []
+        run_level, run = lines[0][0], []
+        for level, message in lines:
+            if level != run_level:
+                chunks.extend(("".join(run), run_level))
+                run_level, run = level, []
+            run.append(message + "\n")
+        chunks.extend(("".join(run), run_level))
+
+        perf.count("logs.lines", len(lines))
+        at_bottom = self.text.yview()[1] >= 1.0
+        self.text.config(state='normal')
+        self.text.insert(tk.END, *chunks)
+        # Count Text lines, not messages: tracebacks and reprs can span several
+        self.line_count += sum(text.count("\n") for text in chunks[0::2])
+        if self.line_count > self.max_lines:
+            excess = self.line_count - self.max_lines
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count = self.max_lines
+        self.text.config(state='disabled')
+        if at_bottom:
+            self.text.see(tk.END)
+        return len(lines)
+
+    def set_min_level(self, min_level):
+        """Show only lines at `min_level` or above."""
+        self.min_level = min_level
+        threshold = LEVELS.index(min_level)
+        for index, level in enumerate(LEVELS):
+            self.text.tag_configure(level, elide=index < threshold)
+        self.text.see(tk.END)
+
@@ -0,0 +1,295 @@
+"""Market-data ingest: an asyncio reader in a background thread, handed to Tk once per frame.
+
+Messages are text lines `symbol,time,price,size` (time in epoch seconds).
+A source is anything with an async `chunks()` generator yielding bytes;
+FileReplaySource and TCPSource (plus serve_replay() as a local stand-in
+for a real feed) are provided.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+# Per-symbol buffering when the UI falls behind:
+#   'latest'      keep a running summary only (constant memory, the UI sees every high/low/volume)
+#   'drop_oldest' keep the newest `max_queue` ticks per symbol, dropping older ones
+#   'block'       keep every tick; stop reading the source while a queue is full (backpressure)
+POLICIES = ('latest', 'drop_oldest', 'block')
+
+# Pacing step of the replay sources, in seconds, and batch size when replaying unpaced
+REPLAY_STEP = 0.005
+REPLAY_BATCH_LINES = 1000
+READ_SIZE = 64 * 1024
+
+
+def parse_ticks(data):
+    """Parse a batch of complete lines into ([(symbol, time, price, size)], bad line count)."""
+    ticks = []
+    bad = 0
+    for line in data.split(b"\n"):
+        if not line:
+            continue
+        try:
+            symbol, tick_time, price, size = line.split(b",")
+            ticks.append((symbol.decode(), float(tick_time), float(price), float(size)))
+        except ValueError:
+            bad += 1
+    return ticks, bad
+
+
+def _batches(lines, rate):
+    """Join lines into batches of REPLAY_STEP seconds' worth at `rate` lines/s."""
+    per_step = max(1, int(rate * REPLAY_STEP)) if rate else REPLAY_BATCH_LINES
+    for first in range(0, len(lines), per_step):
+        yield b"".join(lines[first:first + per_step])
+
+
+class FileReplaySource:
+    """Replays a file of tick lines, at `rate` lines per second (None: as fast as possible)."""
+
+    def __init__(self, path, rate=None, loop_forever=False):
+        self.path = path
+        self.rate = rate
+        self.loop_forever = loop_forever
+
+    async def chunks(self):
+        with open(self.path, 'rb') as file:
+            lines = file.readlines()
+        start = time.perf_counter()
+        sent = 0
+        while True:
+            for batch in _batches(lines, self.rate):
+                yield batch
+                sent += batch.count(b"\n")
+                if self.rate:
+                    # Sleep until the schedule catches up with what was sent
+                    await asyncio.sleep(max(0.0, start + sent / self.rate - time.perf_counter()))
+                else:
+                    await asyncio.sleep(0)
+            if not self.loop_forever:
+                return
+
+
+class TCPSource:
+    """Reads tick lines from a TCP connection (see serve_replay for a local stand-in)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    async def chunks(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    return
+                yield data
+        finally:
+            writer.close()
+
+
+async def serve_replay(path, host="127.0.0.1", port=0, rate=None, ready=None):
+    """Serve a tick file to every TCP client at `rate` lines/s. `ready(port)` is called once listening."""
+    source = FileReplaySource(path, rate)
+
+    async def handle(reader, writer):
+        try:
+            async for batch in source.chunks():
+                writer.write(batch)
+                await writer.drain()  # TCP flow control: a slow client slows the replay down
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+class _Summary:
+    """Running per-symbol summary since the last snapshot."""
+
+    __slots__ = ('time', 'open', 'last', 'high', 'low', 'volume', 'count')
+
+    def __init__(self, tick_time, price):
+        self.time, self.open, self.last, self.high, self.low = tick_time, price, price, price, price
+        self.volume = 0.0
+        self.count = 0
+
+    def add(self, tick_time, price, size):
+        self.time, self.last = tick_time, price
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.volume += size
+        self.count += 1
+
+
+class MarketFeed:
+    """Runs a source on an asyncio loop in a background thread and buffers ticks per symbol.
+
+    The reader parses whole network/file chunks at a time and takes the lock
+    once per chunk. The UI calls snapshot() (usually through a FeedPump) and
+    gets one coalesced entry per symbol that changed since the last call.
+    """
+
+    def __init__(self, source, policy='latest', max_queue=10000):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
+        self.source = source
+        self.policy = policy
+        self.max_queue = max_queue
+        self.lock = threading.Lock()
+        self.summaries = {}  # symbol -> _Summary
+        self.queues = {}     # symbol -> deque of (time, price, size), queueing policies only
+        self.received = 0
+        self.dropped = 0
+        self.bad_lines = 0
+        self.error = None
+        self.last_ingest = None  # time.time() of the last parsed chunk
+        self.stopping = False
+        self.thread = None
+        self.loop = None
+        self.task = None
+        self.space = None    # asyncio.Event, set while every queue has room ('block' policy)
+
+    def start(self):
+        if self.thread is None:
+            self.stopping = False
+            self.thread = threading.Thread(target=self._thread_main, name="market-feed", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=2.0):
+        """Cancel the reader and wait for its thread."""
+        if self.thread is None:
+            return
+        self.stopping = True
+        if self.loop is not None and self.task is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.task.cancel)
+            except RuntimeError:
+                pass  # the source ended and the loop has already closed
+        self.thread.join(timeout)
+        self.thread = None
+
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._main())
+        except asyncio.CancelledError:
+            pass
+        except Exception as error:
+            self.error = error
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.space = asyncio.Event()
+        self.space.set()
+        remainder = b""
+        async for data in self.source.chunks():
+            if self.stopping:
+                return
+            # Only complete lines are parsed; a partial last line waits for the next chunk
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            ticks, bad = parse_ticks(data[:cut])
+            self._ingest(ticks, bad)
+            if self.policy == 'block':
+                await self.space.wait()
+        if remainder:
+            self._ingest(*parse_ticks(remainder))
+
+    def queue_depth(self):
+        """Ticks buffered for the UI (symbols with a pending summary under the 'latest' policy)."""
+        with self.lock:
+            if self.policy == 'latest':
+                return len(self.summaries)
+            return sum(len(queue) for queue in self.queues.values())
+
+    def _ingest(self, ticks, bad):
+        with self.lock:
+            self.last_ingest = time.time()
+            self.received += len(ticks)
+            self.bad_lines += bad
+            summaries = self.summaries
+            for symbol, tick_time, price, size in ticks:
+                summary = summaries.get(symbol)
+                if summary is None:
+                    summary = summaries[symbol] = _Summary(tick_time, price)
+                summary.add(tick_time, price, size)
+            if self.policy == 'latest':
+                return
+            for symbol, tick_time, price, size in ticks:
+                queue = self.queues.get(symbol)
+                if queue is None:
+                    maxlen = self.max_queue if self.policy == 'drop_oldest' else None
+                    queue = self.queues[symbol] = deque(maxlen=maxlen)
+                if len(queue) == self.max_queue and self.policy == 'drop_oldest':
+                    self.dropped += 1
+                queue.append((tick_time, price, size))
+            if self.policy == 'block' and any(len(queue) >= self.max_queue for queue in self.queues.values()):
+                self.space.clear()
+
+    def snapshot(self):
+        """Take everything received since the last call: {symbol: {...}} plus counters.
+
+        Each symbol entry has time/open/last/high/low/volume/count, and with the
+        queueing policies also 'ticks': the buffered (time, price, size) tuples.
+        """
+        with self.lock:
+            summaries, self.summaries = self.summaries, {}
+            queues, self.queues = self.queues, {}
+            stats = {'received': self.received, 'dropped': self.dropped, 'bad_lines': self.bad_lines}
+        if self.policy == 'block' and self.loop is not None and not self.space.is_set():
+            self.loop.call_soon_threadsafe(self.space.set)
+
+        symbols = {}
+        for symbol, summary in summaries.items():
+            entry = {name: getattr(summary, name) for name in _Summary.__slots__}
+            if symbol in queues:
+                entry['ticks'] = list(queues[symbol])
+            symbols[symbol] = entry
+        return symbols, stats
+
+
+class FeedPump:
+    """Hands MarketFeed snapshots to the Tk thread once per frame via after().
+
+    `callback(symbols, stats)` runs on the Tk thread only when something
+    arrived, so a busy feed costs one call per frame, not one per tick.
+    """
+
+    def __init__(self, widget, feed, callback, interval_ms=16):
+        self.widget = widget
+        self.feed = feed
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.after_id = None
+
+    def start(self):
+        if self.after_id is None:
+            self.after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        self.flush()
+        self.after_id = self.widget.after(self.interval_ms, self._tick)
+
+    def flush(self):
+        symbols, stats = self.feed.snapshot()
+        if symbols:
+            self.callback(symbols, stats)
+        return len(symbols)
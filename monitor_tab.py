@@ -0,0 +1,222 @@
+import time
+import tkinter as tk
+from tkinter import filedialog, ttk
+from process_monitor import ProcessSampler
+
+# Bar length of the live candlestick chart, in seconds of tick time
+LIVE_BAR_SECONDS = 60
+# Closed candles kept on the live chart; older ones are dropped a chunk at a time
+LIVE_MAX_CANDLES = 2000
+
+THREAD_COLUMNS = [
+    # (key, heading, width)
+    ('name', "Thread", 160),
+    ('id', "TID", 70),
+    ('cpu', "CPU", 60),
+    ('queue', "Queue", 70),
+    ('heartbeat', "Heartbeat", 80),
+]
+PROCESS_COLUMNS = [
+    ('name', "Process", 140),
+    ('id', "PID", 70),
+    ('cpu', "CPU", 60),
+    ('memory', "Memory", 80),
+    ('threads', "Threads", 60),
+    ('queue', "Queue", 60),
+    ('heartbeat', "Heartbeat", 80),
+]
+
+
+def _percent(value):
+    return "-" if value is None else f"{value:.1f}%"
+
+
+def _count(value):
+    return "-" if value is None else f"{value:,}"
+
+
+def _age(heartbeat, now):
+    return "-" if heartbeat is None else f"{max(0.0, now - heartbeat):.1f}s ago"
+
+
+class DiffedTree:
+    """A ttk.Treeview kept equal to a {row id: values} dict with as few Tcl calls as possible.
+
+    Rows that disappeared are deleted, new ones inserted, and only rows whose
+    values changed are updated in place; the table is never cleared. The
+    Treeview only draws the rows in view, so hundreds of rows stay cheap.
+    """
+
+    def __init__(self, parent, columns, height=10):
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=[key for key, _, _ in columns], show="headings", height=height)
+        for key, heading, width in columns:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w" if key == 'name' else "e", stretch=key == 'name')
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.rows = {}
+
+    def update(self, rows):
+        """Make the table show `rows` ({iid: tuple of display values}, in display order for new rows)."""
+        gone = [iid for iid in self.rows if iid not in rows]
+        if gone:
+            self.tree.delete(*gone)
+        for iid, values in rows.items():
+            old = self.rows.get(iid)
+            if old is None:
+                self.tree.insert("", tk.END, iid=iid, values=values)
+            elif old != values:
+                self.tree.item(iid, values=values)
+        self.rows = rows
+
+
+class LiveMonitorTab(ttk.Frame):
+    """Live Monitoring tab: threads and subprocesses tables on the left, live candlestick chart on the right.
+
+    The tables are refreshed from a ProcessSampler every `interval_ms`. The
+    chart follows one symbol of a MarketFeed, fed once per frame by a FeedPump.
+    """
+
+    def __init__(self, parent, app, interval_ms=1000, **kwargs):
+        super().__init__(parent, padding=10, **kwargs)
+        self.app = app
+        self.interval_ms = interval_ms
+        self.after_id = None
+        self.sampler = ProcessSampler()
+        self.sampler.add_thread_probe("MainThread", lambda: (len(app.log_sink.pending), time.time()))
+        self.sampler.add_process_probe(lambda: app.jobs.heartbeats() if app.jobs is not None else {})
+
+        self.feed = None
+        self.pump = None
+        self.chart = None
+        self.bar_time = None
+        self.bar_count = 0
+        self.known_symbols = set()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=2)
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        ttk.Label(self, text="Threads", font=("Helvetica", 12, "bold")).grid(row=0, column=0, sticky="w")
+        self.threads_table = DiffedTree(self, THREAD_COLUMNS)
+        self.threads_table.frame.grid(row=1, column=0, sticky="nsew", pady=(5, 10))
+        ttk.Label(self, text="Subprocesses", font=("Helvetica", 12, "bold")).grid(row=2, column=0, sticky="w")
+        self.process_table = DiffedTree(self, PROCESS_COLUMNS)
+        self.process_table.frame.grid(row=3, column=0, sticky="nsew", pady=(5, 0))
+
+        # Feed controls above the chart
+        feed_bar = ttk.Frame(self)
+        feed_bar.grid(row=0, column=1, sticky="ew", padx=(10, 0))
+        ttk.Button(feed_bar, text="Replay Ticks...", command=self.open_replay).pack(side=tk.LEFT)
+        ttk.Label(feed_bar, text="Symbol").pack(side=tk.LEFT, padx=(10, 5))
+        self.symbol_var = tk.StringVar()
+        self.symbol_box = ttk.Combobox(feed_bar, textvariable=self.symbol_var, state="readonly", width=10)
+        self.symbol_box.pack(side=tk.LEFT)
+        self.symbol_box.bind("<<ComboboxSelected>>", lambda event: self.reset_chart())
+        self.feed_status = ttk.Label(feed_bar, text="No feed")
+        self.feed_status.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.chart_frame = ttk.Frame(self)
+        self.chart_frame.grid(row=1, column=1, rowspan=3, sticky="nsew", padx=(10, 0))
+
+        if not self.sampler.available():
+            self.threads_table.update({'none': ("/proc not available", "", "", "", "")})
+
+    def start(self):
+        """Begin sampling (call when the tab is shown)."""
+        if self.after_id is None and self.sampler.available():
+            self._tick()
+
+    def stop(self):
+        if self.after_id is not None:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        self.refresh()
+        self.after_id = self.after(self.interval_ms, self._tick)
+
+    def refresh(self):
+        """Take one sample and patch both tables."""
+        threads, processes = self.sampler.sample()
+        now = time.time()
+        self.threads_table.update({
+            f"t{tid}": (name, tid, _percent(cpu), _count(queue), _age(heartbeat, now))
+            for tid, (name, cpu, queue, heartbeat) in threads.items()})
+        self.process_table.update({
+            f"p{pid}": (name, pid, _percent(cpu), f"{rss / 1e6:,.0f} MB", threads, _count(queue), _age(heartbeat, now))
+            for pid, (name, cpu, rss, threads, queue, heartbeat) in processes.items()})
+
+    def open_replay(self):
+        path = filedialog.askopenfilename(parent=self, title="Replay Ticks",
+                                          filetypes=[("Ticks", "*.ticks *.csv *.txt"), ("All files", "*")])
+        if path:
+            from market_feed import FileReplaySource
+            self.start_feed(FileReplaySource(path, rate=50_000, loop_forever=True))
+
+    def start_feed(self, source, policy='latest'):
+        """Stream `source` (see market_feed) into the chart."""
+        from market_feed import FeedPump, MarketFeed
+        self.stop_feed()
+        self.feed = MarketFeed(source, policy=policy)
+        self.sampler.add_thread_probe(
+            "market-feed", lambda: (self.feed.queue_depth(), self.feed.last_ingest) if self.feed else (None, None))
+        self.feed.start()
+        self.pump = FeedPump(self, self.feed, self.on_ticks)
+        self.pump.start()
+        self.app.log_message(f"Market feed started ({policy} policy)")
+
+    def stop_feed(self):
+        if self.pump is not None:
+            self.pump.stop()
+            self.pump = None
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed = None
+
+    def build_chart(self):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from candlestick_chart import CandlestickChart
+        self.figure = Figure(figsize=(5, 4), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.chart_frame)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.chart = CandlestickChart(self.figure.add_subplot(111), max_candles=LIVE_MAX_CANDLES)
+
+    def reset_chart(self):
+        """Start the chart over for the selected symbol."""
+        self.bar_time = None
+        self.bar_count = 0
+        if self.chart is not None:
+            self.chart.set_candles([], [], [], [], [])
+
+    def on_ticks(self, symbols, stats):
+        """FeedPump callback: one coalesced update per frame."""
+        self.feed_status.config(text=f"{stats['received']:,} ticks, {stats['dropped']:,} dropped")
+        if not self.known_symbols.issuperset(symbols):
+            self.known_symbols.update(symbols)
+            self.symbol_box.config(values=sorted(self.known_symbols))
+            if not self.symbol_var.get():
+                self.symbol_var.set(min(self.known_symbols))
+        summary = symbols.get(self.symbol_var.get())
+        if summary is None:
+            return
+        if self.chart is None:
+            self.build_chart()
+
+        # Ticks are bucketed into LIVE_BAR_SECONDS bars by tick time; a frame lands in the bar of its newest tick
+        bar_time = summary['time'] // LIVE_BAR_SECONDS
+        if self.bar_time is None:
+            self.chart.set_candles([0], [summary['open']], [summary['high']], [summary['low']], [summary['last']])
+            self.bar_count = 1
+        elif bar_time > self.bar_time:
+            self.chart.append(self.bar_count, summary['open'], summary['high'], summary['low'], summary['last'])
+            self.bar_count += 1
+        else:
+            x, open_, high, low, close = self.chart.live
+            self.chart.update_last(open_, max(high, summary['high']), min(low, summary['low']), summary['last'])
+        self.bar_time = bar_time
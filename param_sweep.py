@@ -0,0 +1,109 @@
+import itertools
+import numpy as np
+import backtest_engine
+from indicator_cache import IndicatorCache
+
+# Memory budget of the indicator cache kept in each worker process
+WORKER_CACHE_BYTES = 256 * 1024 * 1024
+# Aim for this many chunks per worker so fast chunks can fill in behind slow ones
+CHUNKS_PER_WORKER = 8
+
+
+def parse_values(text, field_type=int):
+    """Parse a sweep field: "13", "13,21,34" or an inclusive range "start:stop[:step]"."""
+    text = str(text).strip()
+    if field_type is str:
+        return [part.strip() for part in text.split(",") if part.strip()]
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" in part:
+            bounds = [field_type(piece) for piece in part.split(":")]
+            if len(bounds) not in (2, 3):
+                raise ValueError(f"Range '{part}' must look like start:stop or start:stop:step")
+            start, stop = bounds[0], bounds[1]
+            step = bounds[2] if len(bounds) == 3 else 1
+            if step <= 0:
+                raise ValueError(f"Range step must be positive in '{part}'")
+            values.extend(field_type(v) for v in np.arange(start, stop + step / 2, step))
+        else:
+            values.append(field_type(part))
+    if not values:
+        raise ValueError("No values given")
+    return values
+
+
+def expand_grid(cards):
+    """Expand per-field value lists into every combination.
+
+    `cards` is [(indicator_name, rows)] where each row is a list of value
+    lists, one per input field. Returns a list of combinations, each shaped
+    like [(indicator_name, rows)] with plain values, ready for the engine.
+    """
+    slots = []
+    for card_index, (name, rows) in enumerate(cards):
+        for row_index, row in enumerate(rows):
+            for field_index, values in enumerate(row):
+                slots.append(((card_index, row_index, field_index), list(values)))
+
+    combos = []
+    for choice in itertools.product(*(values for _, values in slots)):
+        picked = dict(zip((where for where, _ in slots), choice))
+        combo = []
+        for card_index, (name, rows) in enumerate(cards):
+            combo.append((name, [[picked[(card_index, row_index, field_index)] for field_index in range(len(row))]
+                                 for row_index, row in enumerate(rows)]))
+        combos.append(combo)
+    return combos
+
+
+def score_combo(candles, combo, cache):
+    """Evaluate one combination with the backtest engine: long while every card agrees, flat otherwise."""
+    return backtest_engine.run_backtest(candles, combo, cache=cache)['metrics']
+
+
+# Per-worker cache, so combinations handled by the same worker share indicator series
+_worker_cache = None
+
+
+def sweep_chunk(context, candles, combos, first_index):
+    """Job function: score a chunk of combinations and stream each result back."""
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = IndicatorCache(max_bytes=WORKER_CACHE_BYTES)
+
+    results = []
+    for offset, combo in enumerate(combos):
+        if context.cancelled():
+            break
+        metrics = score_combo(candles, combo, _worker_cache)
+        result = (first_index + offset, combo, metrics)
+        results.append(result)
+        context.partial(result)
+    return len(results)
+
+
+def default_chunk_size(count, workers):
+    """Chunk length that gives every worker about CHUNKS_PER_WORKER chunks of `count` items."""
+    return max(1, count // max(1, workers * CHUNKS_PER_WORKER))
+
+
+def split_chunks(items, size):
+    """Split a list into contiguous [(start index, chunk)] of `size` items (the last may be shorter)."""
+    return [(start, items[start:start + size]) for start in range(0, len(items), size)]
+
+
+def chunk_combos(combos, workers):
+    """Split combinations into contiguous chunks; neighbours share most parameters and so cache hits."""
+    return split_chunks(combos, default_chunk_size(len(combos), workers))
+
+
+def describe_combo(combo):
+    """Short text for a combination, e.g. "EMAs 13/21 | RSI 14 70 30"."""
+    parts = []
+    for name, rows in combo:
+        numbers = [str(value) for row in rows for value in row if not isinstance(value, str)]
+        parts.append(f"{name} {'/'.join(numbers) if name in ('EMAs', 'SMAs') else ' '.join(numbers)}")
+    return " | ".join(parts)
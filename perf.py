@@ -0,0 +1,262 @@
+"""Lightweight hot-path instrumentation: timers, counters and histograms.
+
+Disabled by default. While disabled a @timer costs one attribute check per
+call and measure() hands back a shared no-op context manager, so the hooks
+can stay on hot paths. Enable with enable() (the app's `--perf` flag).
+
+    @perf.timer("chart.draw")
+    def redraw(): ...
+
+    with perf.measure("indicators.compute"):
+        ...
+
+    perf.count("logs.lines", len(lines))
+
+`python perf.py old.json new.json` compares two dump() files.
+"""
+import functools
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+# Histogram resolution: buckets per doubling of the value (about 9% wide each)
+SUB_BUCKETS = 8
+
+
+class _State:
+    enabled = False
+
+
+state = _State()
+
+
+class Histogram:
+    """Log-bucketed histogram of durations in milliseconds: O(1) record, fixed memory."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value <= 0.0:
+            index = -sys.maxsize
+        else:
+            mantissa, exponent = math.frexp(value)
+            index = exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    @staticmethod
+    def _upper_bound(index):
+        if index == -sys.maxsize:
+            return 0.0
+        exponent, sub = divmod(index, SUB_BUCKETS)
+        return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (never above max)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.50),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max,
+        }
+
+
+histograms = {}
+counters = {}
+started = time.time()
+
+
+def enable():
+    state.enabled = True
+
+
+def disable():
+    state.enabled = False
+
+
+def enabled():
+    return state.enabled
+
+
+def reset():
+    global started
+    histograms.clear()
+    counters.clear()
+    started = time.time()
+
+
+def record(name, ms):
+    """Add one duration (milliseconds) to the histogram `name`."""
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = Histogram()
+    histogram.record(ms)
+
+
+def count(name, amount=1):
+    if state.enabled:
+        counters[name] = counters.get(name, 0) + amount
+
+
+class _Measure:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class _NoMeasure:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_MEASURE = _NoMeasure()
+
+
+def measure(name):
+    """Context manager timing its block into the histogram `name`."""
+    return _Measure(name) if state.enabled else _NO_MEASURE
+
+
+def timer(name):
+    """Decorator timing every call into the histogram `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - start) * 1000.0)
+        return wrapper
+    return decorate
+
+
+def instrument_tk():
+    """Time every Tk callback (event bindings, after(), widget commands) into 'tk.callback'.
+
+    Patches tkinter.CallWrapper once; the patch itself checks enabled(), so it
+    costs nothing measurable while instrumentation is off.
+    """
+    import tkinter
+    if getattr(tkinter.CallWrapper.__call__, 'perf_wrapped', False):
+        return
+    tkinter.CallWrapper.__call__ = timer("tk.callback")(tkinter.CallWrapper.__call__)
+    tkinter.CallWrapper.__call__.perf_wrapped = True
+
+
+class LoopLag:
+    """Measures Tk event-loop lag with an after() heartbeat.
+
+    Every `interval_ms` a callback is scheduled; how late it actually runs
+    goes into the 'tk.loop_lag' histogram. A busy or blocked loop shows up
+    here even when no single callback is slow.
+    """
+
+    def __init__(self, widget, interval_ms=50):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.after_id = None
+        self.due = None
+
+    def start(self):
+        if self.after_id is None:
+            self._schedule()
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _schedule(self):
+        self.due = time.perf_counter() + self.interval_ms / 1000.0
+        self.after_id = self.widget.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        if state.enabled:
+            record("tk.loop_lag", max(0.0, (time.perf_counter() - self.due) * 1000.0))
+        self._schedule()
+
+
+def snapshot():
+    """Every histogram summary and counter collected so far."""
+    return {
+        'histograms': {name: histogram.summary() for name, histogram in sorted(histograms.items())},
+        'counters': dict(sorted(counters.items())),
+    }
+
+
+def dump(path, label=""):
+    """Write this session's numbers to a JSON file (compare two with `python perf.py a.json b.json`)."""
+    report = snapshot()
+    report['session'] = {
+        'label': label,
+        'started': started,
+        'seconds': time.time() - started,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    with open(path + ".tmp", 'w') as file:
+        json.dump(report, file, indent=2)
+    os.replace(path + ".tmp", path)
+    return report
+
+
+def compare(old_path, new_path):
+    """Return text lines comparing p50/p99 of two dump() files."""
+    with open(old_path, 'r') as file:
+        old = json.load(file)['histograms']
+    with open(new_path, 'r') as file:
+        new = json.load(file)['histograms']
+    lines = [f"{'metric':<28} {'p50 old':>9} {'p50 new':>9} {'p99 old':>9} {'p99 new':>9}  change p99"]
+    for name in sorted(set(old) | set(new)):
+        a, b = old.get(name), new.get(name)
+        if a is None or b is None:
+            lines.append(f"{name:<28} {'only in ' + ('new' if a is None else 'old'):>40}")
+            continue
+        change = (b['p99_ms'] / a['p99_ms'] - 1.0) if a['p99_ms'] else 0.0
+        lines.append(f"{name:<28} {a['p50_ms']:>9.2f} {b['p50_ms']:>9.2f} {a['p99_ms']:>9.2f} {b['p99_ms']:>9.2f}  {change:+.0%}")
+    return lines
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python perf.py old.json new.json")
+    print("\n".join(compare(sys.argv[1], sys.argv[2])))
@@ -0,0 +1,101 @@
+import tkinter as tk
+from tkinter import filedialog, ttk
+import perf
+from monitor_tab import DiffedTree
+
+PERF_COLUMNS = [
+    # (key, heading, width)
+    ('name', "Metric", 150),
+    ('count', "Count", 60),
+    ('p50', "p50 ms", 60),
+    ('p99', "p99 ms", 60),
+    ('max', "Max ms", 60),
+]
+
+
+class PerfPanel(ttk.Frame):
+    """Collapsible panel beside the Logs section with p50/p99 of every perf histogram.
+
+    The table only refreshes (every `interval_ms`) while the panel is expanded.
+    Enabling instrumentation here also times Tk callbacks and starts the
+    event-loop lag heartbeat.
+    """
+
+    def __init__(self, parent, interval_ms=500, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.interval_ms = interval_ms
+        self.after_id = None
+        self.expanded = False
+        self.lag = perf.LoopLag(self)
+
+        header = ttk.Frame(self)
+        header.pack(side=tk.TOP, fill=tk.X)
+        self.toggle_button = ttk.Button(header, text="Perf ◂", width=8, command=self.toggle)
+        self.toggle_button.pack(side=tk.LEFT)
+
+        # Everything below the header is hidden while collapsed
+        self.body = ttk.Frame(self)
+        controls = ttk.Frame(self.body)
+        controls.pack(side=tk.TOP, fill=tk.X, pady=(5, 5))
+        self.enabled_var = tk.BooleanVar(value=perf.enabled())
+        ttk.Checkbutton(controls, text="Enabled", variable=self.enabled_var,
+                        command=lambda: self.set_enabled(self.enabled_var.get())).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Reset", command=self.reset).pack(side=tk.RIGHT)
+        ttk.Button(controls, text="Dump...", command=self.dump).pack(side=tk.RIGHT, padx=(0, 5))
+        self.table = DiffedTree(self.body, PERF_COLUMNS, height=6)
+        self.table.frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        if perf.enabled():
+            self.set_enabled(True)
+
+    def set_enabled(self, enabled):
+        self.enabled_var.set(enabled)
+        if enabled:
+            perf.instrument_tk()
+            perf.enable()
+            self.lag.start()
+        else:
+            perf.disable()
+            self.lag.stop()
+
+    def toggle(self):
+        self.expanded = not self.expanded
+        if self.expanded:
+            self.body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+            self.toggle_button.config(text="Perf ▸")
+            self._tick()
+        else:
+            self.body.pack_forget()
+            self.toggle_button.config(text="Perf ◂")
+            if self.after_id is not None:
+                self.after_cancel(self.after_id)
+                self.after_id = None
+
+    def _tick(self):
+        self.refresh()
+        self.after_id = self.after(self.interval_ms, self._tick)
+
+    def refresh(self):
+        snapshot = perf.snapshot()
+        rows = {name: (name, f"{stats['count']:,}", f"{stats['p50_ms']:.2f}", f"{stats['p99_ms']:.2f}",
+                       f"{stats['max_ms']:.2f}")
+                for name, stats in snapshot['histograms'].items()}
+        rows.update({f"counter:{name}": (name, f"{value:,}", "", "", "")
+                     for name, value in snapshot['counters'].items()})
+        self.table.update(rows)
+
+    def reset(self):
+        perf.reset()
+        self.refresh()
+
+    def dump(self):
+        path = filedialog.asksaveasfilename(parent=self, title="Dump Performance Numbers", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            perf.dump(path)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+        self.lag.stop()
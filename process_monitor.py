@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+
+# Grandchildren are looked up on every Nth sample only; direct children on every sample
+TREE_RESCAN_SAMPLES = 5
+
+# Linux /proc accounting units
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _read_stat(path):
+    """Return (name, fields after the name) from a /proc .../stat file, or None if it is gone."""
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    # The name is in parentheses and may itself contain spaces or ')'
+    open_paren, close_paren = data.find(b"("), data.rfind(b")")
+    return data[open_paren + 1:close_paren].decode(errors="replace"), data[close_paren + 2:].split()
+
+
+def _children(pid):
+    """Direct children of `pid`, from /proc/<pid>/task/*/children."""
+    children = []
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return children
+    for tid in tids:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children", 'rb') as file:
+                children.extend(int(child) for child in file.read().split())
+        except OSError:
+            pass
+    return children
+
+
+class ProcessSampler:
+    """Samples CPU, memory, queue depth and heartbeat of this process's threads and child processes.
+
+    Everything is read straight from /proc (Linux); nothing is spawned. CPU
+    is the share of one core used since the previous sample. Queue depth
+    and heartbeat come from probes the app registers: thread probes by
+    thread name, process probes as one callable returning {pid: ...}.
+    """
+
+    def __init__(self, pid=None):
+        self.pid = pid or os.getpid()
+        self.previous = {}       # ('thread' | 'process', id) -> (cpu ticks, wall time)
+        self.thread_probes = {}  # thread name -> probe() -> (queue depth, heartbeat time)
+        self.process_probes = []  # probe() -> {pid: (queue depth, heartbeat time)}
+        self.descendants = []    # deeper than direct children, from the last full rescan
+        self.samples = 0
+
+    @staticmethod
+    def available():
+        return os.path.isdir("/proc/self/task")
+
+    def add_thread_probe(self, thread_name, probe):
+        """`probe()` returns (queue depth or None, time.time() of its last heartbeat or None)."""
+        self.thread_probes[thread_name] = probe
+
+    def add_process_probe(self, probe):
+        """`probe()` returns {pid: (queue depth or None, heartbeat time or None)}."""
+        self.process_probes.append(probe)
+
+    def _cpu_percent(self, key, ticks, now, seen):
+        seen.add(key)
+        previous = self.previous.get(key)
+        self.previous[key] = (ticks, now)
+        if previous is None or now <= previous[1]:
+            return None
+        return 100.0 * (ticks - previous[0]) / CLOCK_TICKS / (now - previous[1])
+
+    def processes(self):
+        """This process and its descendants, parents first.
+
+        Walking the whole tree costs a few file reads per process, so below
+        the direct children it is only redone every TREE_RESCAN_SAMPLES samples.
+        """
+        children = _children(self.pid)
+        if self.samples % TREE_RESCAN_SAMPLES == 0:
+            self.descendants, stack = [], list(reversed(children))
+            while stack:
+                pid = stack.pop()
+                grandchildren = _children(pid)
+                self.descendants.extend(grandchildren)
+                stack.extend(reversed(grandchildren))
+        self.samples += 1
+        return [self.pid] + children + self.descendants
+
+    def sample(self):
+        """Return ({tid: row}, {pid: row}) with rows shaped like the monitor tables.
+
+        Thread rows: (name, cpu %, queue depth, heartbeat time).
+        Process rows: (name, cpu %, rss bytes, threads, queue depth, heartbeat time).
+        CPU is None on the first sample of a thread or process.
+        """
+        now = time.monotonic()
+        seen = set()
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+
+        threads = {}
+        try:
+            tids = os.listdir(f"/proc/{self.pid}/task")
+        except OSError:
+            tids = []
+        for tid in tids:
+            stat = _read_stat(f"/proc/{self.pid}/task/{tid}/stat")
+            if stat is None:
+                continue
+            comm, fields = stat
+            tid = int(tid)
+            name = names.get(tid, comm)
+            cpu = self._cpu_percent(('thread', tid), int(fields[11]) + int(fields[12]), now, seen)
+            probe = self.thread_probes.get(name)
+            queue_depth, heartbeat = probe() if probe is not None else (None, None)
+            threads[tid] = (name, cpu, queue_depth, heartbeat)
+
+        probed = {}
+        for probe in self.process_probes:
+            probed.update(probe())
+        processes = {}
+        for pid in self.processes():
+            stat = _read_stat(f"/proc/{pid}/stat")
+            if stat is None:
+                continue
+            comm, fields = stat
+            cpu = self._cpu_percent(('process', pid), int(fields[11]) + int(fields[12]), now, seen)
+            queue_depth, heartbeat = probed.get(pid, (None, None))
+            processes[pid] = (comm, cpu, int(fields[21]) * PAGE_SIZE, int(fields[17]), queue_depth, heartbeat)
+
+        # Forget threads and processes that have exited
+        for key in [key for key in self.previous if key not in seen]:
+            del self.previous[key]
+        return threads, processes
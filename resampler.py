@@ -0,0 +1,191 @@
+import hashlib
+import numpy as np
+from candle_store import FIELDS, CandleSlice
+
+# Timeframe name -> bar length in seconds
+TIMEFRAMES = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+
+def timeframe_seconds(timeframe):
+    """Accept a TIMEFRAMES name ('5m') or a number of seconds."""
+    return TIMEFRAMES[timeframe] if isinstance(timeframe, str) else int(timeframe)
+
+
+def resample(candles, seconds, offset=0):
+    """Aggregate OHLCV bars into `seconds`-long bars in one vectorized pass.
+
+    Buckets start at multiples of `seconds` (shifted by `offset`, e.g. a
+    session open) in epoch time; empty buckets produce no bar. Each bucket
+    is a contiguous run of base bars, so every field is one reduceat over
+    the run starts.
+    """
+    times = np.asarray(candles['time'], dtype=np.int64)
+    if len(times) == 0:
+        return {field: np.empty(0, dtype=dtype) for field, dtype in FIELDS.items()}
+    buckets = (times - offset) // seconds * seconds + offset
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+    ends = np.concatenate([starts[1:], [len(times)]])
+    return {
+        'time': buckets[starts],
+        'open': np.asarray(candles['open'], dtype=np.float64)[starts],
+        'high': np.maximum.reduceat(np.asarray(candles['high'], dtype=np.float64), starts),
+        'low': np.minimum.reduceat(np.asarray(candles['low'], dtype=np.float64), starts),
+        'close': np.asarray(candles['close'], dtype=np.float64)[ends - 1],
+        'volume': np.add.reduceat(np.asarray(candles['volume'], dtype=np.float64), starts),
+    }
+
+
+class _Columns:
+    """OHLCV columns with spare capacity, so appending is amortized O(new bars).
+
+    With copy=False the given arrays (e.g. read-only CandleStore memmaps)
+    are used as they are until the first write, which copies them into
+    buffers of our own.
+    """
+
+    def __init__(self, arrays, copy=True):
+        self.count = len(arrays['time'])
+        self.owned = False
+        self.data = {field: np.asarray(arrays[field], dtype=dtype) for field, dtype in FIELDS.items()}
+        if copy:
+            self._grow(max(16, self.count * 2))
+
+    def views(self):
+        return {field: column[:self.count] for field, column in self.data.items()}
+
+    def _grow(self, capacity):
+        for field, column in self.data.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.data[field] = grown
+        self.owned = True
+
+    def own(self):
+        """Make the columns writable, copying borrowed arrays once."""
+        if not self.owned:
+            self._grow(max(16, self.count * 2))
+
+    def extend(self, arrays):
+        added = len(arrays['time'])
+        if not self.owned or self.count + added > len(self.data['time']):
+            self._grow(max(16, 2 * len(self.data['time']), self.count + added))
+        for field, column in self.data.items():
+            column[self.count:self.count + added] = arrays[field]
+        self.count += added
+
+
+class Resampler:
+    """Base bars plus cached higher timeframes that follow them incrementally.
+
+    A timeframe is aggregated from the whole history the first time it is
+    asked for and cached. After that, append() and update_last() only
+    touch the newest (partial) bar of each cached timeframe and add any new
+    ones, so live updates cost O(new data), not O(history).
+
+    The base candles are not copied (a CandleStore slice stays a memmap)
+    until the first append or update_last. Arrays returned by base() and
+    get() are views; re-fetch them after an append, which can move the
+    underlying buffers.
+    """
+
+    def __init__(self, candles, offset=0):
+        self.offset = offset
+        self.base_columns = _Columns(candles, copy=False)
+        self.timeframes = {}  # seconds -> _Columns
+        # Identity of the base bars, chained with every change: a CandleSlice's
+        # fingerprint, otherwise a hash of every field
+        if hasattr(candles, 'fingerprint'):
+            self.key = candles.fingerprint()
+        else:
+            self.key = ""
+            self._chain('base', candles)
+
+    def __len__(self):
+        return self.base_columns.count
+
+    def base(self):
+        return self.base_columns.views()
+
+    def get(self, timeframe):
+        """Return the candles of `timeframe` (name or seconds) as a CandleSlice."""
+        seconds = timeframe_seconds(timeframe)
+        if seconds not in self.timeframes:
+            self.timeframes[seconds] = _Columns(resample(self.base(), seconds, self.offset))
+        columns = self.timeframes[seconds]
+        return CandleSlice(columns.views(), self.fingerprint(seconds))
+
+    def fingerprint(self, seconds):
+        """Identity for IndicatorCache: changes whenever the bars of any timeframe change."""
+        return f"resampler:{self.key}:{self.offset}:{seconds}:{self.timeframes[seconds].count}"
+
+    def _chain(self, kind, arrays):
+        """Fold a change into self.key, so equal keys mean equal base bars."""
+        digest = hashlib.blake2b(f"{self.key}:{kind}".encode(), digest_size=16)
+        for field, dtype in FIELDS.items():
+            digest.update(np.ascontiguousarray(arrays[field], dtype=dtype).view(np.uint8))
+        self.key = digest.hexdigest()
+
+    def _rebuild_last(self, seconds):
+        """Recompute the newest bar of a timeframe from the base bars in its bucket."""
+        columns = self.timeframes[seconds]
+        base = self.base()
+        last = columns.count - 1
+        first = int(np.searchsorted(base['time'], columns.data['time'][last], side='left'))
+        columns.data['open'][last] = base['open'][first]
+        columns.data['high'][last] = base['high'][first:].max()
+        columns.data['low'][last] = base['low'][first:].min()
+        columns.data['close'][last] = base['close'][-1]
+        columns.data['volume'][last] = base['volume'][first:].sum()
+
+    def append(self, arrays):
+        """Add new base bars ({field: array}, times after the last bar).
+
+        Returns {seconds: index of the first bar that changed} for every cached timeframe.
+        """
+        times = np.asarray(arrays['time'], dtype=np.int64)
+        if len(times) == 0:
+            return {}
+        if np.any(np.diff(times) <= 0) or (len(self) and times[0] <= self.base_columns.data['time'][len(self) - 1]):
+            raise ValueError("Appended bars must have strictly increasing times after the last bar")
+        self.base_columns.extend(arrays)
+        self._chain('append', arrays)
+
+        changed = {}
+        for seconds, columns in self.timeframes.items():
+            new_bars = resample(arrays, seconds, self.offset)
+            skip = 0
+            if columns.count and new_bars['time'][0] == columns.data['time'][columns.count - 1]:
+                # The first new base bars continue the current partial bar
+                self._merge_last(seconds, new_bars)
+                skip = 1
+                changed[seconds] = columns.count - 1
+            else:
+                changed[seconds] = columns.count
+            columns.extend({field: values[skip:] for field, values in new_bars.items()})
+        return changed
+
+    def _merge_last(self, seconds, new_bars):
+        """Fold the first bar of `new_bars` into the newest cached bar (same bucket)."""
+        data = self.timeframes[seconds].data
+        last = self.timeframes[seconds].count - 1
+        data['high'][last] = max(data['high'][last], new_bars['high'][0])
+        data['low'][last] = min(data['low'][last], new_bars['low'][0])
+        data['close'][last] = new_bars['close'][0]
+        data['volume'][last] += new_bars['volume'][0]
+
+    def update_last(self, open_, high, low, close, volume):
+        """Revise the newest base bar (a live tick). Returns {seconds: index of the changed bar}."""
+        last = len(self) - 1
+        self.base_columns.own()
+        for field, value in (('open', open_), ('high', high), ('low', low), ('close', close), ('volume', volume)):
+            self.base_columns.data[field][last] = value
+        self._chain('update', {field: column[last:last + 1] for field, column in self.base_columns.data.items()})
+        for seconds in self.timeframes:
+            self._rebuild_last(seconds)
+        return {seconds: columns.count - 1 for seconds, columns in self.timeframes.items()}
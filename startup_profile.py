@@ -0,0 +1,84 @@
+import builtins
+import sys
+import threading
+import time
+
+
+class StartupProfile:
+    """Import-time and phase-time breakdown of app start-up (`python app.py --profile-startup`).
+
+    Disabled by default, in which case every method is a cheap no-op.
+    mark(name) closes a phase that ran on the Tk thread since the previous
+    mark; record(name, ms) adds one that ran elsewhere (e.g. a background
+    import). The import timer wraps builtins.__import__ and keeps the
+    cumulative time of each module imported for the first time at the top
+    level, per thread.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.last_mark = self.start
+        self.phases = []   # (name, ms)
+        self.imports = []  # (module name, ms, thread name)
+        self.reported = False
+        self._local = threading.local()
+        self._original_import = None
+
+    def install_import_timer(self):
+        if not self.enabled or self._original_import is not None:
+            return
+        original = self._original_import = builtins.__import__
+        local = self._local
+        imports = self.imports
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            depth = getattr(local, 'depth', 0)
+            local.depth = depth + 1
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                local.depth = depth
+                if depth == 0:
+                    imports.append((name, (time.perf_counter() - start) * 1000.0, threading.current_thread().name))
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_timer(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, name):
+        """Close the phase that started at the previous mark."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last_mark) * 1000.0))
+        self.last_mark = now
+
+    def record(self, name, ms):
+        if self.enabled:
+            self.phases.append((name, ms))
+
+    def report(self, slowest=15):
+        """Return the breakdown as text lines (slowest imports first, phases in order)."""
+        total = (time.perf_counter() - self.start) * 1000.0
+        lines = [f"startup: {total:.0f} ms since the first app import", "", "phases:"]
+        lines += [f"  {ms:8.1f} ms  {name}" for name, ms in self.phases]
+        lines += ["", f"top-level imports (slowest {slowest}):"]
+        for name, ms, thread in sorted(self.imports, key=lambda item: -item[1])[:slowest]:
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"  {ms:8.1f} ms  {name}{where}")
+        return lines
+
+    def print_report(self):
+        """Print the breakdown once and stop timing imports."""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        self.uninstall_import_timer()
+        print("\n".join(self.report()), flush=True)
@@ -0,0 +1,174 @@
+import tkinter as tk
+from tkinter import ttk
+from indicator_card import IndicatorCard
+from param_sweep import chunk_combos, describe_combo, expand_grid, parse_values, sweep_chunk
+
+# Columns of the results table: (key, heading, width)
+RESULT_COLUMNS = [
+    ('rank', "#", 50),
+    ('params', "Parameters", 260),
+    ('total_return', "Return", 90),
+    ('max_drawdown', "Max DD", 90),
+    ('trades', "Trades", 70),
+    ('exposure', "Exposure", 80),
+]
+# Only the best rows under the current sort are shown; the rest stay in memory
+MAX_TABLE_ROWS = 500
+
+
+class SweepWindow(tk.Toplevel):
+    """Parameter sweep: one range/list entry per indicator field, results in a sortable table.
+
+    Fields accept "13", "13,21,34" or "5:50:5". Every combination runs in
+    the app's worker pool and results stream into the table as they finish.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.title("Parameter Sweep")
+        self.geometry("760x600")
+        app.theme_manager.register(self, bg='frame_bg')
+
+        self.field_vars = []  # [(indicator_name, [[(StringVar, type), ...] per row])]
+        self.results = []
+        self.new_results = False
+        self.sort_key = 'total_return'
+        self.sort_descending = True
+        self.pending_chunks = 0
+        self.total = 0
+        self.shared = None
+        self.sweep_id = 0  # results and completions of older sweeps are ignored
+
+        self.create_fields_section()
+        self.create_results_section()
+
+    def create_fields_section(self):
+        fields_frame = ttk.Frame(self, padding=10)
+        fields_frame.pack(side=tk.TOP, fill=tk.X)
+
+        row_index = 0
+        for card in self.app.bottom_frame.winfo_children():
+            if not isinstance(card, IndicatorCard):
+                continue
+            ttk.Label(fields_frame, text=card.indicator_name, font=("Helvetica", 12, "bold")).grid(row=row_index, column=0, sticky="w")
+            row_index += 1
+            card_rows = []
+            for index, values in enumerate(card.get_values()):
+                row_vars = []
+                for column, (value, field) in enumerate(zip(values, card.model.fields(index))):
+                    var = tk.StringVar(value=str(value))
+                    ttk.Entry(fields_frame, textvariable=var, width=14).grid(row=row_index, column=column + 1, padx=(10, 0), pady=2)
+                    row_vars.append((var, field['type']))
+                card_rows.append(row_vars)
+                row_index += 1
+            self.field_vars.append((card.indicator_name, card_rows))
+
+        buttons = ttk.Frame(self, padding=(10, 0))
+        buttons.pack(side=tk.TOP, fill=tk.X)
+        # Disabled while a sweep runs: its chunks still use the shared candles
+        self.run_button = ttk.Button(buttons, text="Run Sweep", command=self.run_sweep)
+        self.run_button.pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Cancel", command=self.app.cancel_jobs).pack(side=tk.LEFT, padx=10)
+        self.status = ttk.Label(buttons, text="")
+        self.status.pack(side=tk.LEFT, padx=10)
+
+    def create_results_section(self):
+        table_frame = ttk.Frame(self, padding=10)
+        table_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        self.table = ttk.Treeview(table_frame, columns=[key for key, _, _ in RESULT_COLUMNS], show="headings")
+        for key, heading, width in RESULT_COLUMNS:
+            self.table.heading(key, text=heading, command=lambda key=key: self.sort_by(key))
+            self.table.column(key, width=width, anchor="w" if key == 'params' else "e")
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def run_sweep(self):
+        """Expand the grid and fan it out over the worker pool."""
+        if self.pending_chunks:
+            return
+        if not hasattr(self.app, 'candles'):
+            self.app.log_message("Load candles before running a sweep", "WARNING")
+            return
+        try:
+            cards = [(name, [[parse_values(var.get(), field_type) for var, field_type in row] for row in rows])
+                     for name, rows in self.field_vars]
+        except ValueError as error:
+            self.status.config(text=f"Invalid field: {error}")
+            return
+
+        combos = expand_grid(cards)
+        self.results = []
+        self.table.delete(*self.table.get_children())
+        if not combos:
+            self.status.config(text="Nothing to sweep")
+            return
+
+        # Copy the candles into shared memory once for every chunk
+        scheduler = self.app.job_scheduler()
+        self.shared = scheduler.share(self.app.candles)
+        chunks = chunk_combos(combos, scheduler.max_workers)
+        self.sweep_id += 1
+        self.pending_chunks = len(chunks)
+        self.run_button.config(state="disabled")
+        for first_index, chunk in chunks:
+            self.app.run_job(sweep_chunk, self.shared, chunk, first_index,
+                             on_partial=lambda result, sweep_id=self.sweep_id: self.add_result(sweep_id, result),
+                             on_done=lambda count, sweep_id=self.sweep_id: self.chunk_done(sweep_id, count))
+        self.total = len(combos)
+        self.status.config(text=f"0 / {self.total} combinations")
+        self.app.log_message(f"Sweep started: {len(combos)} combinations in {len(chunks)} chunks")
+        self.app.after(200, self.refresh_table)
+
+    def add_result(self, sweep_id, result):
+        if sweep_id != self.sweep_id:
+            return
+        index, combo, metrics = result
+        self.results.append((describe_combo(combo), metrics))
+        self.new_results = True
+
+    def chunk_done(self, sweep_id, count):
+        if sweep_id != self.sweep_id:
+            return
+        self.pending_chunks -= 1
+        if self.pending_chunks == 0:
+            self.shared.close()
+            self.shared = None
+            if self.winfo_exists():
+                self.run_button.config(state="normal")
+            self.app.log_message(f"Sweep finished: {len(self.results)} combinations scored")
+
+    def sort_by(self, key):
+        """Sort by a column; clicking the same column again flips the order."""
+        if key == self.sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key, self.sort_descending = key, key not in ('params', 'rank')
+        self.new_results = True
+        self.refresh_table()
+
+    def refresh_table(self):
+        """Re-sort and redraw the table, at most a few times per second while results stream in."""
+        if not self.winfo_exists():
+            return
+        if self.new_results:
+            self.new_results = False
+            if self.sort_key == 'params':
+                ordered = sorted(self.results, key=lambda item: item[0], reverse=self.sort_descending)
+            elif self.sort_key == 'rank':
+                ordered = list(reversed(self.results)) if self.sort_descending else list(self.results)
+            else:
+                ordered = sorted(self.results, key=lambda item: item[1][self.sort_key], reverse=self.sort_descending)
+            self.table.delete(*self.table.get_children())
+            for rank, (params, metrics) in enumerate(ordered[:MAX_TABLE_ROWS], start=1):
+                self.table.insert("", tk.END, values=(
+                    rank, params,
+                    f"{metrics['total_return']:.2%}", f"{metrics['max_drawdown']:.2%}",
+                    metrics['trades'], f"{metrics['exposure']:.0%}",
+                ))
+            self.status.config(text=f"{len(self.results)} / {self.total} combinations")
+        if self.pending_chunks or self.new_results:
+            self.app.after(200, self.refresh_table)
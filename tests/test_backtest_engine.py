@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from backtest_engine import TRADE_DTYPE, run_backtest, simulate
+
+
+def make_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    opens = close * np.exp(rng.normal(0.0, 0.002, n))
+    return {'time': np.arange(n, dtype=np.int64) * 60, 'open': opens, 'high': np.maximum(opens, close),
+            'low': np.minimum(opens, close), 'close': close, 'volume': np.ones(n)}
+
+
+def random_signal(n, seed=0):
+    """Long/flat runs of random length, like a real indicator signal."""
+    rng = np.random.default_rng(seed)
+    return np.repeat(rng.integers(0, 2, n).astype(bool), rng.integers(1, 8, n))[:n]
+
+
+def reference(candles, signal, initial_cash=10_000.0, fraction=1.0, quantity=None, fee_rate=0.0, slippage=0.0):
+    """Bar-by-bar loop with the semantics simulate() documents."""
+    opens, close = candles['open'], candles['close']
+    n = len(close)
+    cash, shares, entry = initial_cash, 0.0, None
+    trades, equity, position = [], np.empty(n), np.zeros(n, dtype=np.int8)
+
+    def close_trade(exit_index, exit_price):
+        nonlocal cash, shares, entry
+        entry_index, entry_price, buy_cost = entry
+        sell_value = exit_price * (1.0 - fee_rate)
+        cash += shares * sell_value
+        trades.append((entry_index, exit_index, entry_price, exit_price, shares,
+                       shares * (entry_price + exit_price) * fee_rate, shares * (sell_value - buy_cost),
+                       sell_value / buy_cost - 1.0))
+        shares, entry = 0.0, None
+
+    for t in range(n):
+        want = t > 0 and bool(signal[t - 1])
+        if want and entry is None:
+            price = opens[t] * (1.0 + slippage)
+            buy_cost = price * (1.0 + fee_rate)
+            shares = float(quantity) if quantity is not None else fraction * cash / buy_cost
+            cash -= shares * buy_cost
+            entry = (t, price, buy_cost)
+        elif not want and entry is not None:
+            close_trade(t, opens[t] * (1.0 - slippage))
+        position[t] = entry is not None
+        equity[t] = cash + shares * close[t]
+    if entry is not None:
+        close_trade(n - 1, close[-1])
+        equity[-1] = cash
+    return np.array(trades, dtype=TRADE_DTYPE), equity, position
+
+
+@pytest.mark.parametrize("sizing", [{'fraction': 1.0}, {'fraction': 0.4}, {'quantity': 3.0}])
+@pytest.mark.parametrize("costs", [{}, {'fee_rate': 0.001}, {'fee_rate': 0.0005, 'slippage': 0.0002}])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_reference_loop(sizing, costs, seed):
+    candles = make_candles(3000, seed)
+    signal = random_signal(3000, seed)
+    expected = reference(candles, signal, **sizing, **costs)
+    actual = simulate(candles, signal, **sizing, **costs)
+    assert len(actual[0]) == len(expected[0]) > 10
+    for name in TRADE_DTYPE.names:
+        np.testing.assert_allclose(actual[0][name], expected[0][name], rtol=1e-9, err_msg=name)
+    np.testing.assert_allclose(actual[1], expected[1], rtol=1e-9)
+    np.testing.assert_array_equal(actual[2], expected[2])
+
+
+@pytest.mark.parametrize("sizing", [{'fraction': 1.0}, {'quantity': 2.0}])
+def test_position_open_at_last_bar_is_settled_at_last_close(sizing):
+    candles = make_candles(200, 3)
+    signal = random_signal(200, 3)
+    signal[-40:] = True
+    trades, equity, position = simulate(candles, signal, fee_rate=0.001, **sizing)
+    expected = reference(candles, signal, fee_rate=0.001, **sizing)
+    assert position[-1] == 1
+    assert trades[-1]['exit_index'] == 199 and trades[-1]['exit_price'] == candles['close'][-1]
+    np.testing.assert_allclose(equity, expected[1], rtol=1e-9)
+    np.testing.assert_allclose(trades['pnl'], expected[0]['pnl'], rtol=1e-9)
+
+
+def test_never_in_the_market_keeps_cash():
+    candles = make_candles(100)
+    trades, equity, position = simulate(candles, np.zeros(100, dtype=bool))
+    assert len(trades) == 0 and not position.any()
+    np.testing.assert_array_equal(equity, 10_000.0)
+
+
+def test_zero_bars():
+    empty = {field: np.empty(0) for field in ('time', 'open', 'high', 'low', 'close', 'volume')}
+    result = run_backtest(empty, [('EMAs', [[5], [20]])])
+    assert len(result['trades']) == 0 and len(result['equity']) == 0 and len(result['position']) == 0
+    assert result['metrics']['trades'] == 0 and result['metrics']['total_return'] == 0.0
+
+
+def test_run_backtest_metrics_agree_with_equity():
+    candles = make_candles(1000, 4)
+    result = run_backtest(candles, [('EMAs', [[5], [20]])], fee_rate=0.001)
+    metrics = result['metrics']
+    assert metrics['trades'] == len(result['trades'])
+    assert metrics['total_return'] == pytest.approx(result['equity'][-1] / 10_000.0 - 1.0)
+    assert metrics['exposure'] == pytest.approx(result['position'].mean())
+    assert metrics['fees'] == pytest.approx(result['trades']['fees'].sum())
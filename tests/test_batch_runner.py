@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import pytest
+import batch_runner
+from candle_store import CandleStore
+from param_sweep import split_chunks
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD", "A_VERY_LONG_SYMBOL_NAME_FROM_SOME_VENUE_2031"]
+
+
+@pytest.fixture
+def universe(tmp_path):
+    data_dir = tmp_path / "data"
+    for seed, symbol in enumerate(SYMBOLS):
+        rng = np.random.default_rng(seed)
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 300)))
+        CandleStore.create(str(data_dir / symbol), {
+            'time': np.arange(300, dtype=np.int64) * 60, 'open': close, 'high': close, 'low': close,
+            'close': close, 'volume': np.ones(300)})
+    strategy = str(tmp_path / "strategy.json")
+    batch_runner.save_strategy(strategy, [('EMAs', [[5, 'red'], [20, 'blue']])])
+    return strategy, str(data_dir), str(tmp_path / "results.npz")
+
+
+def test_long_symbols_are_not_truncated(universe):
+    strategy, data_dir, output = universe
+    rows = batch_runner.run_batch(strategy, data_dir, output, workers=2, chunk_size=2)
+    assert list(rows['symbol']) == sorted(SYMBOLS)
+    assert list(np.load(output)['symbol']) == sorted(SYMBOLS)
+    assert not os.path.exists(output + ".parts")
+
+
+def test_resume_with_another_worker_count(universe):
+    strategy, data_dir, output = universe
+    parts_dir = output + ".parts"
+    manifest = batch_runner._manifest(strategy, data_dir, sorted(SYMBOLS), None, None)
+    assert batch_runner._prepare_parts(parts_dir, manifest, None, 2, False) == 2
+    # Pretend the first chunk finished before the interruption
+    first = split_chunks(sorted(SYMBOLS), 2)[0][1]
+    done = batch_runner.run_chunk(data_dir, first, *batch_runner.load_strategy(strategy))
+    done['bars'] = -1
+    batch_runner._save_part(parts_dir, 0, done)
+
+    rows = batch_runner.run_batch(strategy, data_dir, output, workers=3)
+    assert list(rows['bars']) == [-1, -1, 300, 300, 300]
+
+
+def test_explicit_other_chunk_size_is_another_run(universe):
+    strategy, data_dir, output = universe
+    manifest = batch_runner._manifest(strategy, data_dir, sorted(SYMBOLS), None, None)
+    batch_runner._prepare_parts(output + ".parts", manifest, 2, 2, False)
+    with pytest.raises(SystemExit):
+        batch_runner.run_batch(strategy, data_dir, output, chunk_size=3)
+    assert len(batch_runner.run_batch(strategy, data_dir, output, chunk_size=3, restart=True)) == len(SYMBOLS)
+
+
+def test_parts_dir_without_manifest_starts_fresh(universe):
+    strategy, data_dir, output = universe
+    os.makedirs(output + ".parts")
+    rows = batch_runner.run_batch(strategy, data_dir, output, workers=2)
+    assert len(rows) == len(SYMBOLS) and (rows['error'] == "").all()
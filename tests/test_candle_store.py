@@ -0,0 +1,93 @@
+import os
+import numpy as np
+import pytest
+from candle_store import FIELDS, CandleStore
+
+
+def candles(n, first=0, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(size=n))
+    return {'time': (first + np.arange(n, dtype=np.int64)) * 60, 'open': close, 'high': close + 1.0,
+            'low': close - 1.0, 'close': close, 'volume': np.ones(n)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore.create(str(tmp_path / "store"), candles(100))
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    (None, None, (0, 100)),
+    (0, 600, (0, 10)),
+    (30, 600, (1, 10)),      # between bars: starts at the next one
+    (600, 601, (10, 11)),
+    (-600, 60, (0, 1)),
+    (5940, None, (99, 100)),
+    (6000, 9000, (100, 100)),
+    (600, 300, (10, 10)),    # end before start is empty, not negative
+])
+def test_time_index(store, start, end, expected):
+    assert store.time_index(start, end) == expected
+    first, stop = expected
+    np.testing.assert_array_equal(store.slice(start, end)['time'], store['time'][first:stop])
+
+
+def test_append_continues_and_persists(store):
+    store.append(candles(50, first=100, seed=1))
+    reopened = CandleStore(store.path)
+    assert len(reopened) == 150
+    np.testing.assert_array_equal(reopened['time'], np.arange(150) * 60)
+    np.testing.assert_array_equal(reopened['close'][100:], candles(50, first=100, seed=1)['close'])
+
+
+@pytest.mark.parametrize("times", [
+    [6000, 6060, 6060],   # repeated time
+    [6060, 6000],         # decreasing
+    [5940, 6000],         # overlaps the last stored bar
+])
+def test_append_rejects_times_that_do_not_increase(store, times):
+    bars = candles(len(times))
+    bars['time'] = np.array(times, dtype=np.int64)
+    with pytest.raises(ValueError):
+        store.append(bars)
+    assert len(CandleStore(store.path)) == 100
+
+
+def test_append_rejects_mismatched_lengths(store):
+    bars = candles(5, first=100)
+    bars['volume'] = bars['volume'][:4]
+    with pytest.raises(ValueError):
+        store.append(bars)
+    assert len(store) == 100
+
+
+def test_interrupted_append_is_truncated(store):
+    # A crash after writing column bytes but before meta.json leaves extra bytes behind
+    for field, dtype in FIELDS.items():
+        with open(os.path.join(store.path, f"{field}.bin"), 'ab') as file:
+            file.write(np.full(7, 999, dtype=dtype).tobytes())
+    reopened = CandleStore(store.path)
+    assert len(reopened) == 100
+
+    reopened.append(candles(3, first=100, seed=2))
+    assert len(reopened) == 103
+    np.testing.assert_array_equal(reopened['time'][98:], np.arange(98, 103) * 60)
+    for field, dtype in FIELDS.items():
+        assert os.path.getsize(os.path.join(store.path, f"{field}.bin")) == 103 * np.dtype(dtype).itemsize
+
+
+def test_empty_store(tmp_path):
+    store = CandleStore.create(str(tmp_path / "empty"))
+    assert len(store) == 0
+    assert store.time_index(0, 600) == (0, 0)
+    assert all(len(column) == 0 for column in store.slice().values())
+    store.append(candles(0))
+    assert len(CandleStore(store.path)) == 0
+
+    store.append(candles(10))
+    assert len(CandleStore(store.path)) == 10
+
+
+def test_missing_store_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CandleStore(str(tmp_path / "nowhere"))
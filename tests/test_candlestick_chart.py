@@ -0,0 +1,36 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from candlestick_chart import CandlestickChart
+
+
+@pytest.fixture
+def chart():
+    figure, ax = plt.subplots()
+    chart = CandlestickChart(ax)
+    yield chart
+    chart.disconnect()
+    plt.close(figure)
+
+
+def series(n):
+    close = 100.0 + np.sin(np.arange(n) / 5.0)
+    return np.arange(n), close - 0.5, close + 1.0, close - 1.0, close
+
+
+def test_empty_candles_clear_the_previous_live_candle(chart):
+    chart.set_candles(*series(10))
+    assert len(chart.live_body.get_paths()) == 1 and np.isfinite(chart.price_line.get_ydata()[0])
+
+    chart.set_candles([], [], [], [], [])
+    assert chart.live is None and chart.closed_count == 0 and chart.chunks == []
+    assert len(chart.live_body.get_paths()) == 0 and len(chart.live_wick.get_segments()) == 0
+    assert np.isnan(chart.price_line.get_ydata()[0])
+
+    # The next symbol starts from its first bar
+    chart.append(0, 10.0, 11.0, 9.0, 10.5)
+    assert chart.live == (0.0, 10.0, 11.0, 9.0, 10.5) and chart.closed_count == 0
+    assert chart.price_line.get_ydata()[0] == 10.5
+
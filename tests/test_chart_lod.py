@@ -0,0 +1,25 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from chart_lod import LODMarkers
+
+
+@pytest.fixture
+def ax():
+    figure, ax = plt.subplots()
+    yield ax
+    plt.close(figure)
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float64])
+def test_markers_in_a_fractional_view(ax, dtype):
+    x = (1_600_000_000 + np.arange(50) * 60).astype(dtype)
+    markers = LODMarkers(ax, x, np.arange(50.0), marker='^')
+    ax.set_xlim(x[10] - 0.5, x[20] + 0.5)
+    np.testing.assert_array_equal(markers.line.get_xdata(), x[10:21])
+    ax.set_xlim(x[10] + 0.5, x[20] - 0.5)
+    np.testing.assert_array_equal(markers.line.get_xdata(), x[11:20])
+    ax.set_xlim(x[10] + 0.25, x[10] + 0.75)
+    assert len(markers.line.get_xdata()) == 0
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+import indicator_engine
+from candle_store import CandleStore
+from indicator_cache import IndicatorCache
+
+
+def candles(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(size=n))
+    return {'time': np.arange(n, dtype=np.int64) * 60, 'open': close, 'high': close + 1.0, 'low': close - 1.0,
+            'close': close, 'volume': np.ones(n)}
+
+
+def band(ohlcv, rows, field="close"):
+    """Plug-in style indicator whose second row changes the numbers and which has two outputs."""
+    close = indicator_engine.get_field(ohlcv, field)
+    period, width = int(rows[0][0]), float(rows[1][0])
+    middle = indicator_engine.compute_smas(close, [period])[0]
+    return {'upper': middle + width, 'lower': middle - width}
+
+
+@pytest.fixture
+def plugin():
+    indicator_engine.COMPUTE_FUNCTIONS['Band'] = band
+    yield 'Band'
+    del indicator_engine.COMPUTE_FUNCTIONS['Band']
+
+
+def test_row_wise_matches_engine_and_reuses_rows():
+    data = candles()
+    cache = IndicatorCache()
+    first = cache.compute('EMAs', data, [[9, 'red'], [21, 'blue']])
+    second = cache.compute('EMAs', data, [[9, 'green'], [50, 'blue']])
+    np.testing.assert_allclose(first['ema'], indicator_engine.compute_emas(data['close'], [9, 21]))
+    np.testing.assert_allclose(second['ema'], indicator_engine.compute_emas(data['close'], [9, 50]))
+    assert cache.misses == 3 and cache.hits == 1
+
+
+def test_all_hits_without_output_names(plugin):
+    data = candles()
+    cache = IndicatorCache()
+    rows = [[10], [2.0]]
+    cache.compute(plugin, data, rows)
+    again = cache.compute(plugin, data, rows)
+    assert cache.hits == 1
+    assert set(again) == {'upper', 'lower'}
+    np.testing.assert_allclose(again['upper'], band(data, rows)['upper'], equal_nan=True)
+
+
+def test_every_row_of_unknown_indicators_is_keyed(plugin):
+    data = candles()
+    cache = IndicatorCache()
+    narrow = cache.compute(plugin, data, [[10], [1.0]])
+    wide = cache.compute(plugin, data, [[10], [3.0]])
+    np.testing.assert_allclose((wide['upper'] - narrow['upper'])[9:], 2.0)
+
+
+def test_disk_tier_round_trip(tmp_path, plugin):
+    data = candles()
+    IndicatorCache(disk_dir=str(tmp_path)).compute(plugin, data, [[10], [1.0]])
+    cache = IndicatorCache(disk_dir=str(tmp_path))
+    result = cache.compute(plugin, data, [[10], [1.0]])
+    assert cache.disk_hits == 1 and set(result) == {'upper', 'lower'}
+
+
+def test_recreated_store_is_not_served_stale(tmp_path):
+    path = str(tmp_path / "store")
+    cache = IndicatorCache(disk_dir=str(tmp_path / "cache"))
+    old = cache.compute('SMAs', CandleStore.create(path, candles(seed=1)).slice(), [[5]])
+    # Same path, same length and same times, different prices
+    new = cache.compute('SMAs', CandleStore.create(path, candles(seed=2)).slice(), [[5]])
+    assert cache.misses == 2
+    assert not np.allclose(old['sma'], new['sma'], equal_nan=True)
+
+
+def test_rows_computed_elsewhere_are_stored_row_wise():
+    data = candles()
+    cache = IndicatorCache()
+    cache.compute('EMAs', data, [[9, 'red']])
+    rows = [[9, 'red'], [21, 'blue'], [50, 'green']]
+    missing = cache.missing_rows('EMAs', data, rows)
+    assert missing == [1, 2] and cache.assemble('EMAs', data, rows) is None
+
+    # What a worker would return for the missing rows
+    cache.store('EMAs', data, [rows[i] for i in missing],
+                indicator_engine.compute_indicator('EMAs', data, [rows[i] for i in missing]))
+    assert cache.missing_rows('EMAs', data, rows) == []
+    np.testing.assert_allclose(cache.assemble('EMAs', data, rows)['ema'],
+                               indicator_engine.compute_emas(data['close'], [9, 21, 50]))
+
+
+def test_unknown_indicators_are_stored_whole(plugin):
+    data = candles()
+    cache = IndicatorCache()
+    rows = [[10], [2.0]]
+    assert cache.missing_rows(plugin, data, rows) == [0, 1]
+    cache.store(plugin, data, rows, band(data, rows))
+    assert cache.missing_rows(plugin, data, rows) == []
+    assert set(cache.assemble(plugin, data, rows)) == {'upper', 'lower'}
@@ -0,0 +1,36 @@
+import pytest
+import indicators
+from indicator_card import CardModel
+
+
+@pytest.fixture
+def rsi():
+    ui_setup = indicators.RSI()
+    model = CardModel(ui_setup)
+    for row_config in ui_setup['dropdown']:
+        model.add_row(row_config)
+    return model
+
+
+@pytest.mark.parametrize("text", ["0", "-3", "abc", "2.5"])
+def test_invalid_period_is_rejected_and_kept(rsi, text):
+    with pytest.raises(ValueError):
+        rsi.set_text(0, 0, text)
+    assert rsi.values()[0] == [14]
+
+
+def test_valid_period_and_fields_without_min(rsi):
+    rsi.set_text(0, 0, "1")
+    rsi.set_text(2, 0, "0")  # thresholds have no minimum
+    assert rsi.values()[:3] == [[1], [70], [0]]
+
+
+@pytest.mark.parametrize("name", ["EMAs", "SMAs"])
+def test_moving_average_periods_have_a_minimum(name):
+    ui_setup = getattr(indicators, name)()
+    model = CardModel(ui_setup)
+    model.add_row(ui_setup['dropdown'][0])
+    with pytest.raises(ValueError):
+        model.set_text(0, 0, "0")
+    model.set_text(0, 1, "red")
+    assert model.values() == [[13, 'red']]
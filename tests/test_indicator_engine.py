@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+import indicator_engine
+
+
+@pytest.mark.parametrize("kernel", [indicator_engine.compute_emas, indicator_engine.compute_smas,
+                                    indicator_engine.compute_rsi])
+@pytest.mark.parametrize("period", [0, -1])
+def test_periods_below_one_are_rejected(kernel, period):
+    with pytest.raises(ValueError):
+        kernel(100.0 + np.arange(50.0), [5, period])
+
+
+def test_ema_period_one_follows_prices():
+    prices = 100.0 + np.sin(np.arange(50.0))
+    np.testing.assert_allclose(indicator_engine.compute_emas(prices, [1])[0], prices)
@@ -0,0 +1,57 @@
+import textwrap
+import numpy as np
+import pytest
+import indicator_engine
+from indicator_cache import IndicatorCache
+from indicator_registry import IndicatorRegistry
+
+PLUGIN = textwrap.dedent('''
+    import indicator_engine
+
+
+    def Channel():
+        return {
+            'frontend': {'display_name': "Price Channel", 'category': "Volatility"},
+            'dropdown': [
+                {'display_name': "Period", 'inputfields': [{'type': int, 'placeholder': 20}]},
+                {'display_name': "Offset", 'inputfields': [{'type': float, 'placeholder': 1.0}]},
+            ],
+        }
+
+
+    def compute_channel(ohlcv, rows, field="close"):
+        close = indicator_engine.get_field(ohlcv, field)
+        middle = indicator_engine.compute_smas(close, [int(rows[0][0])])[0]
+        return {'channel': middle + float(rows[1][0])}
+
+
+    COMPUTE_FUNCTIONS = {'Channel': compute_channel}
+    OUTPUT_NAMES = {'Channel': 'channel'}
+''')
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "channel.py").write_text(PLUGIN)
+    yield IndicatorRegistry(plugin_dirs=[str(tmp_path)])
+    indicator_engine.COMPUTE_FUNCTIONS.pop('Channel', None)
+    indicator_engine.OUTPUT_NAMES.pop('Channel', None)
+
+
+def test_plugin_is_listed_without_importing(registry):
+    assert registry.search("chan") == ['Channel']
+    assert 'Channel' not in indicator_engine.COMPUTE_FUNCTIONS
+
+
+def test_picking_a_plugin_makes_it_computable(registry):
+    registry.ui_setup('Channel')
+    assert indicator_engine.OUTPUT_NAMES['Channel'] == 'channel'
+
+    close = 100.0 + np.arange(50.0)
+    cache = IndicatorCache()
+    first = cache.compute('Channel', close, [[5], [1.0]])
+    second = cache.compute('Channel', close, [[5], [1.0]])
+    shifted = cache.compute('Channel', close, [[5], [2.0]])
+    assert cache.hits == 1
+    np.testing.assert_array_equal(first['channel'], second['channel'])
+    np.testing.assert_allclose(shifted['channel'][4:] - first['channel'][4:], 1.0)
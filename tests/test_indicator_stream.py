@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+import indicator_engine
+from indicator_stream import StreamingEMA, StreamingRSI, StreamingSMA, create_stream
+
+PERIODS = [2, 13, 21, 50]
+
+BATCH = {
+    StreamingEMA: indicator_engine.compute_emas,
+    StreamingSMA: indicator_engine.compute_smas,
+    StreamingRSI: indicator_engine.compute_rsi,
+}
+
+
+def random_walk(n, seed=1):
+    return 100.0 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+
+def replay(stream, prices, revisions=3, seed=0):
+    """Feed every bar as a live feed would: a first tick, a few revisions, then the final close."""
+    rng = np.random.default_rng(seed)
+    values = []
+    for price in prices:
+        stream.append(price + rng.normal())
+        for _ in range(revisions):
+            stream.update_last(price + rng.normal())
+        values.append(stream.update_last(price).copy())
+    return np.array(values).T
+
+
+@pytest.mark.parametrize("stream_class", [StreamingEMA, StreamingSMA, StreamingRSI])
+@pytest.mark.parametrize("revisions", [0, 3])
+def test_matches_batch(stream_class, revisions):
+    prices = random_walk(2000)
+    expected = BATCH[stream_class](prices, PERIODS)
+    streamed = replay(stream_class(PERIODS), prices, revisions=revisions)
+    np.testing.assert_array_equal(np.isnan(streamed), np.isnan(expected))
+    np.testing.assert_allclose(streamed, expected, rtol=0, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("stream_class", [StreamingSMA, StreamingRSI])
+def test_nan_warm_up(stream_class):
+    prices = random_walk(60)
+    streamed = replay(stream_class(PERIODS), prices)
+    # SMA needs `period` bars, RSI `period` changes (period + 1 bars)
+    extra = 1 if stream_class is StreamingRSI else 0
+    for row, period in enumerate(PERIODS):
+        first = period - 1 + extra
+        assert np.isnan(streamed[row, :first]).all()
+        assert not np.isnan(streamed[row, first:]).any()
+
+
+def test_ema_has_no_warm_up():
+    prices = random_walk(10)
+    streamed = replay(StreamingEMA(PERIODS), prices)
+    assert not np.isnan(streamed).any()
+    np.testing.assert_allclose(streamed[:, 0], prices[0])
+
+
+def test_sma_resync_across_ring_buffer_laps():
+    # Large offset prices make running-sum drift visible unless the sums are rebuilt every lap
+    prices = 1e6 + random_walk(20_000, seed=2)
+    stream = StreamingSMA([3, 50])
+    expected = indicator_engine.compute_smas(prices, [3, 50])
+    streamed = replay(stream, prices, revisions=2)
+    assert stream.count // stream.size > 100  # many laps of the 50-bar buffer
+    np.testing.assert_allclose(streamed[:, 49:], expected[:, 49:], rtol=1e-12)
+
+
+def test_update_last_before_any_bar_appends():
+    stream = StreamingSMA([1])
+    np.testing.assert_allclose(stream.update_last(5.0), [5.0])
+    assert stream.count == 1
+
+
+def test_create_stream_reads_card_rows():
+    assert list(create_stream('EMAs', [[9], [21]]).periods) == [9, 21]
+    assert list(create_stream('RSI', [[14], [70], [30]]).periods) == [14]
+    with pytest.raises(KeyError):
+        create_stream('Unknown', [[1]])
+
+
+def test_invalid_periods():
+    with pytest.raises(ValueError):
+        StreamingSMA([0])
+    with pytest.raises(ValueError):
+        StreamingRSI([-1])
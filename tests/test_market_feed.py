@@ -0,0 +1,112 @@
+import time
+import pytest
+from market_feed import FileReplaySource, MarketFeed
+
+
+def tick_lines(count, symbols=("AAA", "BBB")):
+    return [f"{symbols[i % len(symbols)]},{1000 + i},{100.0 + i % 17},{1 + i % 3}\n" for i in range(count)]
+
+
+def run_to_end(feed, timeout=5.0):
+    feed.start()
+    feed.thread.join(timeout)
+    assert not feed.running() and feed.error is None
+
+
+class SplitReplaySource(FileReplaySource):
+    """FileReplaySource whose batches are cut every `size` bytes, mid-line, like network reads."""
+
+    def __init__(self, path, size):
+        super().__init__(path)
+        self.size = size
+
+    async def chunks(self):
+        data = b"".join([batch async for batch in super().chunks()])
+        for first in range(0, len(data), self.size):
+            yield data[first:first + self.size]
+
+
+@pytest.fixture
+def tick_file(tmp_path):
+    def write(lines):
+        path = tmp_path / "ticks.csv"
+        path.write_text("".join(lines))
+        return str(path)
+    return write
+
+
+@pytest.mark.parametrize("size", [1, 7, 50, 10 ** 6])
+def test_lines_cut_across_chunks_are_reassembled(tick_file, size):
+    lines = tick_lines(300)
+    feed = MarketFeed(SplitReplaySource(tick_file(lines), size), policy='drop_oldest')
+    run_to_end(feed)
+    symbols, stats = feed.snapshot()
+    assert stats['received'] == 300 and stats['bad_lines'] == 0
+    assert [tick[0] for tick in symbols['AAA']['ticks']] == [1000.0 + i for i in range(0, 300, 2)]
+
+
+def test_last_line_without_newline_is_parsed(tick_file):
+    lines = tick_lines(10)
+    lines[-1] = lines[-1].rstrip("\n")
+    feed = MarketFeed(FileReplaySource(tick_file(lines)))
+    run_to_end(feed)
+    symbols, stats = feed.snapshot()
+    assert stats['received'] == 10
+    assert symbols['BBB']['time'] == 1009.0
+
+
+def test_bad_lines_are_counted_and_skipped(tick_file):
+    lines = tick_lines(20)
+    lines[3:3] = ["garbage\n", "AAA,not-a-time,1,1\n", "AAA,1,2\n", "\n", "AAA,1,2,3,4\n"]
+    feed = MarketFeed(FileReplaySource(tick_file(lines)))
+    run_to_end(feed)
+    symbols, stats = feed.snapshot()
+    assert stats['bad_lines'] == 4  # the empty line is not a tick, but not an error either
+    assert stats['received'] == 20
+
+
+def test_drop_oldest_keeps_the_newest_ticks(tick_file):
+    feed = MarketFeed(FileReplaySource(tick_file(tick_lines(100, symbols=("AAA",)))), policy='drop_oldest',
+                      max_queue=10)
+    run_to_end(feed)
+    symbols, stats = feed.snapshot()
+    assert stats['dropped'] == 90 and stats['received'] == 100
+    assert [tick[0] for tick in symbols['AAA']['ticks']] == [1000.0 + i for i in range(90, 100)]
+    # The summary still covers every tick, dropped or not
+    assert symbols['AAA']['count'] == 100 and symbols['AAA']['volume'] == sum(1 + i % 3 for i in range(100))
+
+
+def test_block_delivers_every_tick(tick_file):
+    lines = tick_lines(5000)
+    feed = MarketFeed(FileReplaySource(tick_file(lines)), policy='block', max_queue=50)
+    feed.start()
+    delivered = {"AAA": [], "BBB": []}
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
+        finished = not feed.running()
+        symbols, stats = feed.snapshot()
+        for symbol, entry in symbols.items():
+            delivered[symbol].extend(tick[0] for tick in entry['ticks'])
+        if finished:
+            break
+        time.sleep(0.001)
+    assert feed.error is None
+    assert stats['dropped'] == 0 and stats['received'] == 5000
+    assert delivered["AAA"] == [1000.0 + i for i in range(0, 5000, 2)]
+    assert delivered["BBB"] == [1000.0 + i for i in range(1, 5000, 2)]
+
+
+def test_latest_coalesces_into_one_summary_per_symbol(tick_file):
+    lines = tick_lines(1000)
+    feed = MarketFeed(FileReplaySource(tick_file(lines)), policy='latest')
+    run_to_end(feed)
+    assert feed.queue_depth() == 2
+    symbols, stats = feed.snapshot()
+    assert set(symbols) == {"AAA", "BBB"} and 'ticks' not in symbols['AAA']
+    prices = [100.0 + i % 17 for i in range(0, 1000, 2)]
+    aaa = symbols['AAA']
+    assert (aaa['count'], aaa['open'], aaa['last']) == (500, prices[0], prices[-1])
+    assert (aaa['high'], aaa['low'], aaa['time']) == (max(prices), min(prices), 1998.0)
+    assert aaa['volume'] == sum(1 + i % 3 for i in range(0, 1000, 2))
+    # Taken once: the next snapshot starts empty
+    assert feed.snapshot()[0] == {} and feed.queue_depth() == 0
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from candle_store import CandleStore
+from indicator_cache import IndicatorCache
+from resampler import TIMEFRAMES, Resampler, resample
+
+
+def candles(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(size=n))
+    return {'time': np.arange(n, dtype=np.int64) * 60, 'open': close + rng.normal(size=n), 'high': close + 1.0,
+            'low': close - 1.0, 'close': close, 'volume': rng.uniform(1.0, 5.0, n)}
+
+
+def part(data, start, stop):
+    return {field: values[start:stop] for field, values in data.items()}
+
+
+def assert_same_bars(actual, expected):
+    for field in expected:
+        np.testing.assert_allclose(actual[field], expected[field], err_msg=field)
+
+
+def test_different_data_of_same_length_gets_different_keys():
+    # One after the other, like reloading candles: the first Resampler is freed before the second exists
+    cache = IndicatorCache()
+    old = cache.compute('SMAs', Resampler(candles(seed=1)).get('5m'), [[5]])
+    new = cache.compute('SMAs', Resampler(candles(seed=2)).get('5m'), [[5]])
+    assert cache.misses == 2 and cache.hits == 0
+    assert not np.allclose(old['sma'], new['sma'], equal_nan=True)
+
+
+def test_same_data_gets_same_key_and_changes_move_it():
+    first, second = Resampler(candles()), Resampler(candles())
+    assert first.get('15m').fingerprint() == second.get('15m').fingerprint()
+    tick = candles(1, seed=3)
+    tick['time'][:] = 1000 * 60
+    first.append(tick)
+    second.append({**tick, 'close': tick['close'] + 1.0})
+    assert first.get('15m').fingerprint() != second.get('15m').fingerprint()
+
+
+@pytest.mark.parametrize("timeframe", ['5m', '15m', '1h'])
+def test_incremental_matches_full_resample(timeframe):
+    data = candles(2000)
+    resampler = Resampler(part(data, 0, 700))
+    resampler.get(timeframe)
+    for start, stop in ((700, 703), (703, 1200), (1200, 1201), (1201, 2000)):
+        resampler.append(part(data, start, stop))
+        resampler.update_last(data['open'][stop - 1], data['high'][stop - 1] + 2.0, data['low'][stop - 1] - 2.0,
+                              data['close'][stop - 1] + 0.5, data['volume'][stop - 1] * 2)
+        data['high'][stop - 1] += 2.0
+        data['low'][stop - 1] -= 2.0
+        data['close'][stop - 1] += 0.5
+        data['volume'][stop - 1] *= 2
+        assert_same_bars(resampler.get(timeframe), resample(part(data, 0, stop), TIMEFRAMES[timeframe]))
+    assert_same_bars(resampler.base(), data)
+
+
+def test_store_base_is_not_copied_until_written(tmp_path):
+    data = candles()
+    store = CandleStore.create(str(tmp_path / "store"), data)
+    columns = store.slice()
+    resampler = Resampler(columns)
+    assert np.shares_memory(resampler.base()['close'], columns['close'])
+    assert_same_bars(resampler.get('5m'), resample(data, 300))
+
+    resampler.update_last(1.0, 2.0, 0.5, 1.5, 10.0)
+    assert not np.shares_memory(resampler.base()['close'], columns['close'])
+    assert resampler.base()['close'][-1] == 1.5
+    assert store.slice()['close'][-1] == data['close'][-1]
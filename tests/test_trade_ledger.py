@@ -0,0 +1,83 @@
+import statistics
+import numpy as np
+import pytest
+import trade_ledger
+from backtest_engine import TRADE_DTYPE, simulate
+from trade_ledger import LEDGER_CHUNK, TradeLedger, ledger_metrics
+
+
+@pytest.fixture
+def ledger():
+    """Four trades from 1000: +100, -50, +200, -100 (equity 1100, 1050, 1250, 1150)."""
+    ledger = TradeLedger(initial_cash=1000.0)
+    ledger.append(0, 5, 100.0, 110.0, 10.0)
+    ledger.append(10, 12, 110.0, 105.0, 10.0)
+    ledger.append(20, 30, 105.0, 125.0, 10.0)
+    ledger.append(40, 41, 125.0, 115.0, 10.0)
+    return ledger
+
+
+def test_trade_level_metrics(ledger):
+    returns = [100 / 1000, -50 / 1100, 200 / 1050, -100 / 1250]
+    downside = (sum(min(r, 0.0) ** 2 for r in returns) / 4) ** 0.5
+    metrics = ledger.metrics()
+    assert metrics['total_return'] == pytest.approx(0.15)
+    assert metrics['max_drawdown'] == pytest.approx(1150 / 1250 - 1)
+    assert metrics['sharpe'] == pytest.approx(statistics.mean(returns) / statistics.stdev(returns))
+    assert metrics['sortino'] == pytest.approx(statistics.mean(returns) / downside)
+    assert metrics['profit_factor'] == pytest.approx(300 / 150)
+    assert metrics['win_rate'] == 0.5 and metrics['average_trade'] == pytest.approx(37.5)
+    # 5 + 2 + 10 + 1 bars held between the first entry (0) and the last exit (41)
+    assert metrics['exposure'] == pytest.approx(18 / 42)
+
+
+def test_bar_level_metrics_are_annualized():
+    equity = np.array([1000.0, 1100.0, 990.0, 1089.0])
+    position = np.array([0, 1, 1, 0], dtype=np.int8)
+    metrics = ledger_metrics(np.zeros(0, dtype=TRADE_DTYPE), equity, position, 1000.0, periods_per_year=252)
+    returns = [0.0, 0.1, -0.1, 0.1]
+    assert metrics['max_drawdown'] == pytest.approx(-0.1)
+    assert metrics['exposure'] == 0.5
+    assert metrics['sharpe'] == pytest.approx(statistics.mean(returns) / statistics.stdev(returns) * 252 ** 0.5)
+    assert metrics['sortino'] == pytest.approx(statistics.mean(returns) / (0.01 / 4) ** 0.5 * 252 ** 0.5)
+    assert metrics['profit_factor'] == 0.0 and metrics['trades'] == 0
+
+
+def test_profit_factor_without_losses(ledger):
+    winners = ledger.trades[ledger.trades['pnl'] > 0]
+    assert ledger_metrics(winners, initial_cash=1000.0)['profit_factor'] == float('inf')
+
+
+def test_ledger_grows_by_whole_chunks(ledger):
+    first = ledger.trades.copy()
+    assert len(ledger.rows) == LEDGER_CHUNK
+    ledger.extend(np.zeros(LEDGER_CHUNK - 4, dtype=TRADE_DTYPE))
+    assert len(ledger) == LEDGER_CHUNK and len(ledger.rows) == LEDGER_CHUNK
+    ledger.append(50, 60, 1.0, 2.0, 1.0)
+    assert len(ledger.rows) == 2 * LEDGER_CHUNK
+    ledger.extend(np.zeros(2 * LEDGER_CHUNK, dtype=TRADE_DTYPE))
+    assert len(ledger) == 3 * LEDGER_CHUNK + 1 and len(ledger.rows) == 4 * LEDGER_CHUNK
+    np.testing.assert_array_equal(ledger.trades[:4], first)
+    assert ledger.trades[LEDGER_CHUNK]['pnl'] == 1.0
+
+
+def test_append_matches_the_engine():
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 2000)))
+    candles = {'open': close * np.exp(rng.normal(0.0, 0.002, 2000)), 'close': close}
+    signal = np.repeat(rng.integers(0, 2, 2000).astype(bool), 5)[:2000]
+    trades, equity, position = simulate(candles, signal, fee_rate=0.001, slippage=0.0005)
+    ledger = TradeLedger()
+    for trade in trades:
+        ledger.append(trade['entry_index'], trade['exit_index'], trade['entry_price'], trade['exit_price'],
+                      trade['quantity'], trade['fees'])
+    np.testing.assert_allclose(ledger.trades['pnl'], trades['pnl'], rtol=1e-9)
+    np.testing.assert_allclose(ledger.trades['return'], trades['return'], rtol=1e-9, atol=1e-15)
+
+
+def test_monte_carlo_is_independent_of_the_worker_count(ledger):
+    paths = 3 * trade_ledger.MC_BATCH_PATHS + 10
+    serial = trade_ledger.monte_carlo(ledger.trades, 1000.0, paths=paths, seed=7, workers=1)
+    parallel = trade_ledger.monte_carlo(ledger.trades, 1000.0, paths=paths, seed=7, workers=3)
+    assert serial == parallel and serial['paths'] == paths
+    assert trade_ledger.monte_carlo(ledger.trades, 1000.0, paths=paths, seed=8, workers=1) != serial
@@ -1,4 +1,39 @@
 import json
+import tkinter as tk
+from tkinter import ttk
+
+
+def compile_styles(theme):
+    """Turn one theme from themes.json into named ttk styles: [(style name, configure options, map options)].
+
+    Every themed widget uses one of these names, so switching themes only
+    reconfigures this fixed list, however many widgets exist.
+    """
+    return [
+        ("TLabel", {'foreground': theme['fg_color'], 'background': theme['frame_bg']}, None),
+        ("TFrame", {'background': theme['frame_bg']}, None),
+
+        # Indicator cards and their dropdown rows
+        ("Card.TFrame", {'background': theme['card_bg'], 'relief': "groove", 'borderwidth': 2}, None),
+        ("Card.TLabel", {'foreground': theme['fg_color'], 'background': theme['card_bg']}, None),
+        ("CardDropdown.TFrame", {'background': theme['dropdown_bg']}, None),
+        ("CardDropdown.TLabel", {'foreground': theme['fg_color'], 'background': theme['dropdown_bg']}, None),
+        ("Custom.TEntry", {'fieldbackground': theme['entry_bg'], 'foreground': theme['entry_fg']}, None),
+        ("CardButton.TButton", {'background': theme['button_bg'], 'foreground': theme['button_fg']}, None),
+
+        # Theme switch button, with hover and pressed colors
+        ("Switch.TButton",
+         {'background': theme['button_bg'], 'foreground': theme['button_fg'], 'relief': "flat", 'padding': 10},
+         {'background': [("active", theme['button_active_bg']), ("!disabled", theme['button_hover_bg'])],
+          'foreground': [("active", "#ffffff"), ("!disabled", "#ffffff")]}),
+
+        # Config section collapse button
+        ("Collapse.TButton",
+         {'background': theme['arrow_button_bg'], 'foreground': theme['arrow_button_fg'], 'relief': "flat", 'padding': 5},
+         {'background': [("active", theme['collapse_active_bg']), ("!disabled", theme['collapse_hover_bg'])],
+          'foreground': [("active", "#ffffff"), ("!disabled", "#ffffff")]}),
+    ]
+
 
 class ThemeManager:
     def __init__(self, theme_file='themes.json'):
@@ -6,6 +41,12 @@ class ThemeManager:
         self.themes = self.load_themes()
         self.current_theme = "light"  # Default to light theme
 
+        # Styles are compiled once per theme up front
+        self.compiled = {name: compile_styles(theme) for name, theme in self.themes.items()}
+
+        # Classic Tk widgets that ttk styles cannot reach: [(widget, {option: theme key})]
+        self.classic_widgets = []
+
     def load_themes(self):
         """Load theme configuration from JSON file."""
         with open(self.theme_file, 'r') as file:
@@ -22,3 +63,30 @@ class ThemeManager:
         else:
             print(f"Theme '{theme_name}' not found, using default.")
         return self.get_theme()
+
+    def register(self, widget, **options):
+        """Keep a classic Tk widget themed, e.g. register(text, bg='log_bg', fg='log_fg').
+
+        Only a handful of app-level widgets should need this; everything else uses a named ttk style.
+        """
+        self.classic_widgets.append((widget, options))
+        theme = self.get_theme()
+        widget.config(**{option: theme[key] for option, key in options.items()})
+
+    def apply(self, style=None):
+        """Apply the current theme: reconfigure the compiled styles and the registered classic widgets."""
+        style = style or ttk.Style()
+        for name, configure, mapping in self.compiled[self.current_theme]:
+            style.configure(name, **configure)
+            if mapping:
+                style.map(name, **mapping)
+
+        theme = self.get_theme()
+        alive = []
+        for widget, options in self.classic_widgets:
+            try:
+                widget.config(**{option: theme[key] for option, key in options.items()})
+            except tk.TclError:
+                continue  # destroyed (e.g. a closed pop-up window)
+            alive.append((widget, options))
+        self.classic_widgets = alive
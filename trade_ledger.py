@@ -0,0 +1,283 @@
+"""Trade ledger: fills in a chunk-grown structured array, vectorized metrics and a bootstrap Monte Carlo.
+
+One trade costs 64 bytes (backtest_engine.TRADE_DTYPE), so ten million
+fills fit in 640 MB. Python objects per fill would need several times that.
+Every metric is a handful of whole-array NumPy operations, with no
+per-trade or per-bar Python loop.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backtest_engine import TRADE_DTYPE
+
+# The ledger grows by whole chunks of this many trades
+LEDGER_CHUNK = 65_536
+# Bootstrap paths per parallel batch; batches (and so results) depend only on the seed, not on the worker count
+MC_BATCH_PATHS = 256
+# Within a batch, paths are simulated a block at a time so that paths * trades stays below this (~32 MB of float64)
+MC_BLOCK_ELEMENTS = 4_000_000
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+class TradeLedger:
+    """Trades of one run in a TRADE_DTYPE array that grows by LEDGER_CHUNK rows.
+
+    `trades` is a view of the filled rows. It is only valid until the next
+    append or extend, which may move the buffer. The per-bar `equity` and
+    `position` arrays of a backtest can be attached for bar-level metrics.
+    """
+
+    def __init__(self, initial_cash=10_000.0, capacity=LEDGER_CHUNK):
+        self.initial_cash = float(initial_cash)
+        self.rows = np.empty(capacity, dtype=TRADE_DTYPE)
+        self.count = 0
+        self.equity = None
+        self.position = None
+
+    @classmethod
+    def from_backtest(cls, result, initial_cash=10_000.0):
+        """Wrap a backtest_engine.run_backtest() result without copying its trades."""
+        ledger = cls(initial_cash, capacity=0)
+        ledger.rows = result['trades']
+        ledger.count = len(result['trades'])
+        ledger.equity = result['equity']
+        ledger.position = result['position']
+        return ledger
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def trades(self):
+        return self.rows[:self.count]
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes
+
+    def _reserve(self, added):
+        needed = self.count + added
+        if needed > len(self.rows):
+            capacity = -(-needed // LEDGER_CHUNK) * LEDGER_CHUNK
+            grown = np.empty(capacity, dtype=TRADE_DTYPE)
+            grown[:self.count] = self.rows[:self.count]
+            self.rows = grown
+
+    def extend(self, trades):
+        """Append a TRADE_DTYPE array of trades."""
+        self._reserve(len(trades))
+        self.rows[self.count:self.count + len(trades)] = trades
+        self.count += len(trades)
+
+    def append(self, entry_index, exit_index, entry_price, exit_price, quantity, fees=0.0):
+        """Append one round trip; pnl and return are derived from the prices, quantity and fees.
+
+        As in backtest_engine, the fees are charged on both fills in proportion
+        to their notional, so 'return' is sell_value / buy_cost - 1.
+        """
+        self._reserve(1)
+        notional = quantity * (entry_price + exit_price)
+        fee_rate = fees / notional if notional else 0.0
+        buy_cost = entry_price * (1.0 + fee_rate)
+        sell_value = exit_price * (1.0 - fee_rate)
+        self.rows[self.count] = (entry_index, exit_index, entry_price, exit_price, quantity, fees,
+                                 quantity * (sell_value - buy_cost), sell_value / buy_cost - 1.0 if buy_cost else 0.0)
+        self.count += 1
+
+    def equity_curve(self):
+        """Equity after every trade, starting with the initial cash."""
+        return trade_equity(self.trades, self.initial_cash)
+
+    def metrics(self, periods_per_year=None):
+        """ledger_metrics() of this ledger, bar-level when a backtest's equity is attached."""
+        return ledger_metrics(self.trades, self.equity, self.position, self.initial_cash, periods_per_year)
+
+    def monte_carlo(self, paths=1000, seed=None, workers=None):
+        """Bootstrap this ledger's trade sequence; see monte_carlo()."""
+        return monte_carlo(self.trades, self.initial_cash, paths=paths, seed=seed, workers=workers)
+
+
+def trade_equity(trades, initial_cash):
+    """Equity after every trade (length len(trades) + 1, starting with `initial_cash`)."""
+    return initial_cash + np.concatenate([[0.0], np.cumsum(trades['pnl'])])
+
+
+def drawdown(equity):
+    """Fractional distance below the running peak at every point (0 at a new high, negative below)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity / np.maximum.accumulate(equity) - 1.0
+
+
+def period_returns(equity, initial_cash):
+    """Simple return of every period of an equity series, the first one measured from `initial_cash`."""
+    equity = np.asarray(equity, dtype=np.float64)
+    previous = np.concatenate([[initial_cash], equity[:-1]])
+    return equity / previous - 1.0
+
+
+def periods_per_year(times):
+    """Bars per year implied by the median spacing of bar times (epoch seconds)."""
+    times = np.asarray(times)
+    if len(times) < 2:
+        return 1.0
+    return SECONDS_PER_YEAR / float(np.median(np.diff(times)))
+
+
+def sharpe_ratio(returns, periods=1.0):
+    """Mean over standard deviation of period returns, annualized by sqrt(`periods` per year)."""
+    if len(returns) < 2:
+        return 0.0
+    deviation = returns.std(ddof=1)
+    return float(returns.mean() / deviation * np.sqrt(periods)) if deviation > 0 else 0.0
+
+
+def sortino_ratio(returns, periods=1.0):
+    """Like sharpe_ratio() but only losses count as risk (downside deviation around zero)."""
+    if len(returns) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    return float(returns.mean() / downside * np.sqrt(periods)) if downside > 0 else 0.0
+
+
+def ledger_metrics(trades, equity=None, position=None, initial_cash=10_000.0, periods_per_year=None):
+    """Headline numbers of a ledger; a superset of backtest_engine.summarize().
+
+    With a per-bar `equity` (and `position`), drawdown, Sharpe, Sortino and
+    exposure are bar-level and annualized by `periods_per_year`. With trades
+    alone they are per trade, unannualized, and exposure is the share of
+    bars from the first entry to the last exit that were held.
+    """
+    if equity is None:
+        equity = trade_equity(trades, initial_cash)[1:]
+        periods = 1.0
+    else:
+        periods = periods_per_year or 1.0
+    returns = period_returns(equity, initial_cash)
+    pnl = trades['pnl']
+    gains, losses = pnl[pnl > 0].sum(), -pnl[pnl < 0].sum()
+
+    if position is not None:
+        exposure = float(position.mean()) if len(position) else 0.0
+    elif len(trades):
+        span = trades['exit_index'].max() - trades['entry_index'].min() + 1
+        exposure = float((trades['exit_index'] - trades['entry_index']).sum() / span)
+    else:
+        exposure = 0.0
+
+    return {
+        'total_return': float(equity[-1] / initial_cash - 1.0) if len(equity) else 0.0,
+        'max_drawdown': float(drawdown(np.concatenate([[initial_cash], equity])).min()),
+        'sharpe': sharpe_ratio(returns, periods),
+        'sortino': sortino_ratio(returns, periods),
+        'trades': int(len(trades)),
+        'win_rate': float(np.mean(pnl > 0)) if len(trades) else 0.0,
+        'profit_factor': float(gains / losses) if losses > 0 else float('inf') if gains > 0 else 0.0,
+        'average_trade': float(pnl.mean()) if len(trades) else 0.0,
+        'exposure': exposure,
+        'fees': float(trades['fees'].sum()),
+    }
+
+
+def trade_growth(trades, initial_cash):
+    """Factor by which every trade multiplied the equity it started from.
+
+    Resampling these keeps compounding intact for fraction-of-equity sizing.
+    For fixed-quantity sizing it treats each trade's P&L as a fraction of the
+    equity it happened to start with.
+    """
+    before = trade_equity(trades, initial_cash)[:-1]
+    return 1.0 + trades['pnl'] / before
+
+
+def bootstrap(growth, paths, seed=None):
+    """Return (final returns, max drawdowns) of `paths` trade sequences resampled with replacement.
+
+    Paths are simulated a block at a time (see MC_BLOCK_ELEMENTS), so memory
+    stays bounded however many trades and paths there are.
+    """
+    growth = np.asarray(growth, dtype=np.float64)
+    finals = np.zeros(paths)
+    drawdowns = np.zeros(paths)
+    n = len(growth)
+    if n == 0:
+        return finals, drawdowns
+    rng = np.random.default_rng(seed)
+    block = max(1, MC_BLOCK_ELEMENTS // n)
+    for first in range(0, paths, block):
+        stop = min(paths, first + block)
+        curve = growth[rng.integers(0, n, size=(stop - first, n))]
+        np.cumprod(curve, axis=1, out=curve)
+        peak = np.maximum.accumulate(curve, axis=1)
+        np.maximum(peak, 1.0, out=peak)  # the starting equity counts as a peak
+        finals[first:stop] = curve[:, -1] - 1.0
+        drawdowns[first:stop] = (curve / peak).min(axis=1) - 1.0
+    return finals, drawdowns
+
+
+def bootstrap_batches(paths, seed=None):
+    """Split a bootstrap into independent (paths, seed) batches of at most MC_BATCH_PATHS paths."""
+    count = max(1, -(-paths // MC_BATCH_PATHS))
+    seeds = np.random.SeedSequence(seed).spawn(count)
+    return [(min(MC_BATCH_PATHS, paths - i * MC_BATCH_PATHS), seeds[i]) for i in range(count)]
+
+
+def summarize_bootstrap(finals, drawdowns):
+    """Percentiles of the bootstrapped final returns and max drawdowns."""
+    if not len(finals):
+        return {'paths': 0}
+    final_p5, final_p50, final_p95 = np.percentile(finals, [5, 50, 95])
+    drawdown_p5, drawdown_p50, drawdown_p95 = np.percentile(drawdowns, [5, 50, 95])
+    return {
+        'paths': int(len(finals)),
+        'return_p5': float(final_p5),
+        'return_p50': float(final_p50),
+        'return_p95': float(final_p95),
+        'drawdown_p5': float(drawdown_p5),
+        'drawdown_p50': float(drawdown_p50),
+        'drawdown_p95': float(drawdown_p95),
+        'loss_probability': float(np.mean(finals < 0.0)),
+    }
+
+
+def monte_carlo(trades, initial_cash=10_000.0, paths=1000, seed=None, workers=None):
+    """Bootstrap the trade sequence `paths` times, one batch per task across `workers` processes.
+
+    The same seed gives the same numbers whatever the worker count.
+    """
+    growth = trade_growth(trades, initial_cash)
+    batches = bootstrap_batches(paths, seed)
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+    if workers == 1:
+        results = [bootstrap(growth, size, batch_seed) for size, batch_seed in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(bootstrap, [growth] * len(batches), *zip(*batches)))
+    finals = np.concatenate([finals for finals, _ in results])
+    drawdowns = np.concatenate([drawdowns for _, drawdowns in results])
+    return summarize_bootstrap(finals, drawdowns)
+
+
+class LedgerPlot:
+    """Equity curve and entry/exit markers of a ledger on an existing price axes.
+
+    The equity curve goes on a twin y-axis. The curve and both marker sets
+    are decimated to the visible pixel width and follow pan and zoom (see
+    chart_lod). `times` maps bar indexes to the price chart's x values.
+    """
+
+    def __init__(self, ax, times, trades, equity, equity_color="#3f51b5"):
+        from chart_lod import LODLine, LODMarkers
+        times = np.asarray(times)
+        self.equity_ax = ax.twinx()
+        self.equity_line = LODLine(self.equity_ax, times[:len(equity)], equity, color=equity_color, linewidth=1)
+        self.equity_ax.set_ylabel("Equity")
+        self.entries = LODMarkers(ax, times[trades['entry_index']], trades['entry_price'],
+                                  marker="^", color="#2e7d32", markersize=6)
+        self.exits = LODMarkers(ax, times[trades['exit_index']], trades['exit_price'],
+                                marker="v", color="#c62828", markersize=6)
+
+    def remove(self):
+        self.entries.remove()
+        self.exits.remove()
+        self.equity_line.remove()
+        self.equity_ax.remove()